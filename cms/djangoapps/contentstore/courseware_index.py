@@ -1,9 +1,11 @@
 """ Code to allow module store to interface with courseware index """
 from __future__ import absolute_import
 
+import hashlib
 import logging
 import re
 from abc import ABCMeta, abstractmethod
+from collections import namedtuple
 from datetime import timedelta
 
 from django.conf import settings
@@ -14,12 +16,14 @@ from search.search_engine_base import SearchEngine
 from six import add_metaclass
 
 from contentstore.course_group_config import GroupConfiguration
+from contentstore.models import IndexedStructureVersion
 from course_modes.models import CourseMode
 from eventtracking import tracker
 from openedx.core.lib.courses import course_image_url
 from xmodule.annotator_mixin import html_to_text
 from xmodule.library_tools import normalize_key_for_search
 from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo import BlockKey
 
 # REINDEX_AGE is the default amount of time that we look back for changes
 # that might have happened. If we are provided with a time at which the
@@ -28,11 +32,36 @@ from xmodule.modulestore import ModuleStoreEnum
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# Maximum number of items sent to the search engine in a single bulk request
+INDEX_BATCH_SIZE = 500
+
+# Maximum number of extracted html texts remembered by strip_html_content_to_text
+HTML_TEXT_CACHE_SIZE = 1000
+
 log = logging.getLogger('edx.modulestore')
 
+# Extracted texts keyed by the digest of the html content they were extracted from
+_HTML_TEXT_CACHE = {}
+
+# Blocks (as BlockKeys) whose index entries must be updated or removed after a structure change
+StructureChanges = namedtuple('StructureChanges', 'changed deleted')
+
 
 def strip_html_content_to_text(html_content):
     """ Gets only the textual part for html content - useful for building text to be searched """
+    encoded_content = html_content.encode('utf-8') if isinstance(html_content, unicode) else html_content
+    content_digest = hashlib.sha1(encoded_content).hexdigest()
+    text_content = _HTML_TEXT_CACHE.get(content_digest)
+    if text_content is None:
+        text_content = _strip_html_content_to_text(html_content)
+        if len(_HTML_TEXT_CACHE) >= HTML_TEXT_CACHE_SIZE:
+            _HTML_TEXT_CACHE.clear()
+        _HTML_TEXT_CACHE[content_digest] = text_content
+    return text_content
+
+
+def _strip_html_content_to_text(html_content):
+    """ Extracts the text of html content, see strip_html_content_to_text """
     # Removing HTML-encoded non-breaking space characters
     text_content = re.sub(r"(\s|&nbsp;|//)+", " ", html_to_text(html_content))
     # Removing HTML CDATA
@@ -43,6 +72,61 @@ def strip_html_content_to_text(html_content):
     return text_content
 
 
+def _reachable_blocks(structure):
+    """
+    Returns the BlockKeys of the blocks of a split structure that can be reached from its root,
+    mapped to the BlockKeys of their children.
+    """
+    blocks = structure['blocks']
+    reachable = {}
+    stack = [BlockKey(*structure['root'])]
+    while stack:
+        block_key = stack.pop()
+        if block_key in reachable or block_key not in blocks:
+            continue
+        children = [BlockKey(*child) for child in blocks[block_key].fields.get('children', [])]
+        reachable[block_key] = children
+        stack.extend(children)
+    return reachable
+
+
+def diff_structures(old_structure, new_structure):
+    """
+    Compares two versions of a split structure.
+
+    A block is changed if it was added or if its definition or settings differ
+    between the versions; since names, start dates and group access are used
+    when indexing descendants, all descendants of a changed block are changed
+    as well.  A block is deleted if it is no longer reachable from the root.
+
+    Returns a StructureChanges tuple of BlockKey sets.
+    """
+    def block_content(block_data):
+        """ The parts of a block that influence its index entry """
+        return block_data.definition, block_data.fields, block_data.defaults
+
+    old_blocks = old_structure['blocks']
+    new_blocks = new_structure['blocks']
+    old_reachable = _reachable_blocks(old_structure)
+    new_reachable = _reachable_blocks(new_structure)
+
+    changed = set()
+    for block_key in new_reachable:
+        if block_key in changed:
+            continue
+        if block_key in old_reachable and block_content(old_blocks[block_key]) == block_content(new_blocks[block_key]):
+            continue
+        stack = [block_key]
+        while stack:
+            descendant = stack.pop()
+            if descendant not in changed:
+                changed.add(descendant)
+                stack.extend(new_reachable[descendant])
+
+    deleted = set(old_reachable) - set(new_reachable)
+    return StructureChanges(changed, deleted)
+
+
 def indexing_is_enabled():
     """
     Checks to see if the indexing feature is enabled
@@ -68,6 +152,8 @@ class SearchIndexerBase(object):
     INDEX_NAME = None
     DOCUMENT_TYPE = None
     ENABLE_INDEXING_KEY = None
+    # Split modulestore branch whose structure versions are indexed
+    INDEXED_BRANCH = None
 
     INDEX_EVENT = {
         'name': None,
@@ -116,7 +202,7 @@ class SearchIndexerBase(object):
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
     @classmethod
-    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE, changes=None):
         """
         Process course for indexing
 
@@ -132,6 +218,10 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        changes (StructureChanges) - blocks known to have changed or been deleted
+            since the structure was last indexed; only the changed blocks have their
+            index updated and only the deleted blocks are removed from the index
+
         Returns:
         Number of items that have been added to the index
         """
@@ -181,9 +271,16 @@ class SearchIndexerBase(object):
             item_content_groups - content groups assigned to indexed item
             """
             is_indexable = hasattr(item, "index_dictionary")
-            item_index_dictionary = item.index_dictionary() if is_indexable else None
+            skip_item_index = skip_index or (
+                changes is not None and BlockKey.from_usage_key(item.location) not in changes.changed
+            )
+            # only build the index dictionary of items whose index will be updated
+            item_index_dictionary = None
+            if is_indexable and not skip_item_index:
+                item_index_dictionary = item.index_dictionary()
+                is_indexable = bool(item_index_dictionary)
             # if it's not indexable and it does not have children, then ignore
-            if not item_index_dictionary and not item.has_children:
+            if not is_indexable and not item.has_children:
                 return
 
             item_content_groups = None
@@ -227,7 +324,7 @@ class SearchIndexerBase(object):
                 if None in children_groups_usage:
                     item_content_groups = None
 
-            if skip_index or not item_index_dictionary:
+            if skip_item_index or not item_index_dictionary:
                 return
 
             item_index = {}
@@ -259,8 +356,16 @@ class SearchIndexerBase(object):
                 # Now index the content
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                for batch_start in range(0, len(items_index), INDEX_BATCH_SIZE):
+                    searcher.index(cls.DOCUMENT_TYPE, items_index[batch_start:batch_start + INDEX_BATCH_SIZE])
+                if changes is None:
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                elif changes.deleted:
+                    course_key = structure.scope_ids.usage_id.course_key
+                    searcher.remove(cls.DOCUMENT_TYPE, [
+                        unicode(cls._id_modifier(course_key.make_usage_key(block_key.type, block_key.id)))
+                        for block_key in changes.deleted
+                    ])
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -275,6 +380,49 @@ class SearchIndexerBase(object):
 
         return indexed_count["count"]
 
+    @classmethod
+    def index_changes(cls, modulestore, structure_key, triggered_at=None):
+        """
+        Process course or library for indexing, updating only what changed since it was last indexed
+
+        When the structure is stored in the split modulestore, the structure version
+        that was last indexed is compared to the current one, and only the blocks that
+        were added, changed or deleted in between are updated in the index.  Otherwise,
+        or when the last indexed version is not known, falls back to `index`.
+
+        Arguments: see `index`
+
+        Returns:
+        Number of items that have been added to the index
+        """
+        normalized_key = cls.normalize_structure_key(structure_key)
+        if modulestore.get_modulestore_type(normalized_key) != ModuleStoreEnum.Type.split:
+            return cls.index(modulestore, structure_key, triggered_at=triggered_at)
+
+        store = modulestore._get_modulestore_for_courselike(normalized_key)  # pylint: disable=protected-access
+        index_entry = store.get_course_index(normalized_key)
+        version = index_entry['versions'].get(cls.INDEXED_BRANCH) if index_entry else None
+        if version is None:
+            return cls.index(modulestore, structure_key, triggered_at=triggered_at)
+
+        indexed_version = IndexedStructureVersion.get_version(cls.INDEX_NAME, normalized_key)
+        if indexed_version == unicode(version):
+            return 0
+
+        changes = None
+        if indexed_version is not None:
+            old_structure = store.get_structure(normalized_key, normalized_key.as_object_id(indexed_version))
+            new_structure = store.get_structure(normalized_key, version)
+            if old_structure is not None and new_structure is not None:
+                changes = diff_structures(old_structure, new_structure)
+
+        if changes is None:
+            indexed_count = cls.index(modulestore, structure_key, triggered_at=triggered_at)
+        else:
+            indexed_count = cls.index(modulestore, structure_key, changes=changes)
+        IndexedStructureVersion.set_version(cls.INDEX_NAME, normalized_key, version)
+        return indexed_count
+
     @classmethod
     def _do_reindex(cls, modulestore, structure_key):
         """
@@ -346,6 +494,7 @@ class CoursewareSearchIndexer(SearchIndexerBase):
     INDEX_NAME = "courseware_index"
     DOCUMENT_TYPE = "courseware_content"
     ENABLE_INDEXING_KEY = 'ENABLE_COURSEWARE_INDEX'
+    INDEXED_BRANCH = ModuleStoreEnum.BranchName.published
 
     INDEX_EVENT = {
         'name': 'edx.course.index.reindexed',
@@ -436,6 +585,7 @@ class LibrarySearchIndexer(SearchIndexerBase):
     INDEX_NAME = "library_index"
     DOCUMENT_TYPE = "library_content"
     ENABLE_INDEXING_KEY = 'ENABLE_LIBRARY_INDEX'
+    INDEXED_BRANCH = ModuleStoreEnum.BranchName.library
 
     INDEX_EVENT = {
         'name': 'edx.library.index.reindexed',
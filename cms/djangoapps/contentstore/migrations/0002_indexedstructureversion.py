@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contentstore', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexedStructureVersion',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('index_name', models.CharField(max_length=255)),
+                ('structure_key', models.CharField(max_length=255)),
+                ('version', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='indexedstructureversion',
+            unique_together=set([('index_name', 'structure_key')]),
+        ),
+    ]
@@ -3,6 +3,7 @@ Models for contentstore
 """
 
 from config_models.models import ConfigurationModel
+from django.db import models
 from django.db.models.fields import TextField
 
 
@@ -21,3 +22,39 @@ class VideoUploadConfig(ConfigurationModel):
 
 class PushNotificationConfig(ConfigurationModel):
     """Configuration for mobile push notifications."""
+
+
+class IndexedStructureVersion(models.Model):
+    """
+    The version of a course or library structure that was last indexed
+    in a search index.
+    """
+    index_name = models.CharField(max_length=255)
+    structure_key = models.CharField(max_length=255)
+    version = models.CharField(max_length=255)
+
+    class Meta(object):
+        unique_together = ('index_name', 'structure_key')
+
+    @classmethod
+    def get_version(cls, index_name, structure_key):
+        """
+        Returns the version of the given structure last indexed in the
+        given index, or None if it is not known.
+        """
+        try:
+            return cls.objects.get(index_name=index_name, structure_key=unicode(structure_key)).version
+        except cls.DoesNotExist:
+            return None
+
+    @classmethod
+    def set_version(cls, index_name, structure_key, version):
+        """
+        Records the version of the given structure last indexed in the
+        given index.
+        """
+        cls.objects.update_or_create(
+            index_name=index_name,
+            structure_key=unicode(structure_key),
+            defaults={'version': unicode(version)},
+        )
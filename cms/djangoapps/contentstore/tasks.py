@@ -164,7 +164,9 @@ def update_search_index(course_id, triggered_time_isoformat):
     """ Updates course search index. """
     try:
         course_key = CourseKey.from_string(course_id)
-        CoursewareSearchIndexer.index(modulestore(), course_key, triggered_at=(_parse_time(triggered_time_isoformat)))
+        CoursewareSearchIndexer.index_changes(
+            modulestore(), course_key, triggered_at=(_parse_time(triggered_time_isoformat))
+        )
 
     except SearchIndexingError as exc:
         LOGGER.error(u'Search indexing error for complete course %s - %s', course_id, text_type(exc))
@@ -177,7 +179,9 @@ def update_library_index(library_id, triggered_time_isoformat):
     """ Updates course search index. """
     try:
         library_key = CourseKey.from_string(library_id)
-        LibrarySearchIndexer.index(modulestore(), library_key, triggered_at=(_parse_time(triggered_time_isoformat)))
+        LibrarySearchIndexer.index_changes(
+            modulestore(), library_key, triggered_at=(_parse_time(triggered_time_isoformat))
+        )
 
     except SearchIndexingError as exc:
         LOGGER.error(u'Search indexing error for library %s - %s', library_id, text_type(exc))
@@ -21,6 +21,7 @@ from contentstore.courseware_index import (
     LibrarySearchIndexer,
     SearchIndexingError
 )
+from contentstore.models import IndexedStructureVersion
 from contentstore.signals.handlers import listen_for_course_publish, listen_for_library_update
 from contentstore.tests.utils import CourseTestCase
 from contentstore.utils import reverse_course_url, reverse_usage_url
@@ -535,6 +536,39 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         self.assertEqual(result["course_name"], "Search Index Test Course")
         self.assertEqual(result["location"], ["Week 1", CoursewareSearchIndexer.UNNAMED_MODULE_NAME, "Subsection 2"])
 
+    def _test_index_changes(self, store):
+        """ Make sure that indexing changes only updates the blocks that changed since the last index """
+        self.publish_item(store, self.vertical.location)
+        # nothing is known about the course yet, so everything gets indexed
+        indexed_count = CoursewareSearchIndexer.index_changes(store, self.course.id)
+        self.assertEqual(indexed_count, 4)
+        self.assertEqual(self.search()["total"], 4)
+        self.assertIsNotNone(
+            IndexedStructureVersion.get_version(CoursewareSearchIndexer.INDEX_NAME, self.course.id)
+        )
+
+        # nothing has been published since
+        self.assertEqual(CoursewareSearchIndexer.index_changes(store, self.course.id), 0)
+
+        # a changed leaf is the only block to be indexed again
+        self.html_unit.display_name = "Changed Html Content"
+        self.update_item(store, self.html_unit)
+        self.publish_item(store, self.html_unit.location)
+        self.assertEqual(CoursewareSearchIndexer.index_changes(store, self.course.id), 1)
+        self.assertEqual(self.search(query_string="Changed")["total"], 1)
+
+        # a changed container also updates the index of its descendants
+        self.vertical.display_name = "Changed Subsection"
+        self.update_item(store, self.vertical)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(CoursewareSearchIndexer.index_changes(store, self.course.id), 2)
+
+        # deleted blocks are removed from the index
+        self.delete_item(store, self.html_unit.location)
+        self.publish_item(store, self.vertical.location)
+        CoursewareSearchIndexer.index_changes(store, self.course.id)
+        self.assertEqual(self.search()["total"], 3)
+
     @patch('django.conf.settings.SEARCH_ENGINE', 'search.tests.utils.ErroringIndexEngine')
     def _test_exception(self, store):
         """ Test that exception within indexing yields a SearchIndexingError """
@@ -574,6 +608,9 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
 
+    def test_index_changes(self):
+        self._perform_test_using_store(ModuleStoreEnum.Type.split, self._test_index_changes)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_course_about_property_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_course_about_property_index)
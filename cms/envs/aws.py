@@ -546,5 +546,9 @@ COURSEGRAPH_JOB_QUEUE = ENV_TOKENS.get('COURSEGRAPH_JOB_QUEUE', LOW_PRIORITY_QUE
 
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_POOL_MAXSIZE = ENV_TOKENS.get('COMMENTS_SERVICE_POOL_MAXSIZE', COMMENTS_SERVICE_POOL_MAXSIZE)
+COMMENTS_SERVICE_RESPONSE_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'COMMENTS_SERVICE_RESPONSE_CACHE_TIMEOUT', COMMENTS_SERVICE_RESPONSE_CACHE_TIMEOUT
+)
 
 DEFAULT_GRADING_TYPE = ENV_TOKENS.get("DEFAULT_GRADING_TYPE", EDX_GRADING_TYPE)
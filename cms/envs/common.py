@@ -345,6 +345,13 @@ LMS_BASE = None
 LMS_ROOT_URL = "http://localhost:8000"
 ENTERPRISE_API_URL = LMS_ROOT_URL + '/enterprise/api/v1/'
 
+# Number of keep-alive connections kept open to each comments service host.
+COMMENTS_SERVICE_POOL_MAXSIZE = 10
+
+# Number of seconds responses of read-only comments service endpoints (user
+# info, thread lists) are cached for. Set to 0 to disable.
+COMMENTS_SERVICE_RESPONSE_CACHE_TIMEOUT = 0
+
 # These are standard regexes for pulling out info like course_ids, usage_ids, etc.
 # They are used so that URLs with deprecated-format strings still work.
 from lms.envs.common import (
@@ -377,6 +384,7 @@ simplefilter('ignore')
 MIDDLEWARE_CLASSES = (
     'crum.CurrentRequestUserMiddleware',
     'request_cache.middleware.RequestCache',
+    'util.db.AfterCommitMiddleware',
 
     'openedx.core.djangoapps.monitoring_utils.middleware.MonitoringMemoryMiddleware',
 
@@ -50,9 +50,12 @@ from course_modes.models import CourseMode
 from enrollment.api import _default_course_mode
 from eventtracking import tracker
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.djangoapps.credit.models import CreditEligibility, CreditRequest, CreditRequirementStatus
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
+from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED
 from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, NoneToEmptyManager
 from track import contexts
+from util.db import run_after_commit
 from util.milestones_helpers import is_entrance_exams_enabled
 from util.model_utils import emit_field_changed_events, get_changed_fields_dict
 from util.query import use_read_replica_if_available
@@ -63,6 +66,9 @@ log = logging.getLogger(__name__)
 AUDIT_LOG = logging.getLogger("audit")
 SessionStore = import_module(settings.SESSION_ENGINE).SessionStore  # pylint: disable=invalid-name
 
+# Cache key of the per-user generation that dashboard snapshot cache keys are built from.
+DASHBOARD_SNAPSHOT_GENERATION_KEY = u'student.dashboard_snapshot.generation.{user_id}'
+
 # enroll status changed events - signaled to email_marketing.  See email_marketing.tasks for more info
 
 
@@ -1018,6 +1024,10 @@ class CourseEnrollment(models.Model):
         # Private variable for storing course_overview to minimize calls to the database.
         # When the property .course_overview is accessed for the first time, this variable will be set.
         self._course_overview = None
+        # Set by enrollments_for_user_with_overviews_preload, whose callers
+        # skip enrollments without a CourseOverview instead of loading it
+        # from the module store.
+        self._course_overview_preloaded = False
 
     def __unicode__(self):
         return (
@@ -1454,23 +1464,25 @@ class CourseEnrollment(models.Model):
         """
         List of user's CourseEnrollments, CourseOverviews preloaded if possible.
 
-        We try to preload all CourseOverviews, which are usually lazily loaded
-        as the .course_overview property. This is to avoid making an extra
-        query for every enrollment when displaying something like the student
-        dashboard. If some of the CourseOverviews are not found, we make no
-        attempt to initialize them -- we just fall back to existing lazy-load
-        behavior. The goal is to optimize the most common case as simply as
-        possible, without changing any of the existing contracts.
+        We try to preload all CourseOverviews, along with their tabs and image
+        sets, which are usually lazily loaded as the .course_overview property.
+        This is to avoid making extra queries for every enrollment when
+        displaying something like the student dashboard. CourseOverviews that
+        are not found are queued for regeneration by CourseOverview.get_from_ids,
+        and in the meantime the .course_overview property of their enrollments
+        is None rather than loading the course from the module store within the
+        request. Outdated CourseOverviews are served until they are regenerated.
 
         The name of this method is long, but was the end result of hashing out a
         number of alternatives, so pylint can stuff it (disable=invalid-name)
         """
         enrollments = list(cls.enrollments_for_user(user))
-        overviews = CourseOverview.get_from_ids_if_exists(
+        overviews = CourseOverview.get_from_ids(
             enrollment.course_id for enrollment in enrollments
         )
         for enrollment in enrollments:
             enrollment._course_overview = overviews.get(enrollment.course_id)  # pylint: disable=protected-access
+            enrollment._course_overview_preloaded = True  # pylint: disable=protected-access
 
         return enrollments
 
@@ -1632,14 +1644,15 @@ class CourseEnrollment(models.Model):
     def course_overview(self):
         """
         Returns a CourseOverview of the course to which this enrollment refers.
-        Returns None if an error occurred while trying to load the course.
+        Returns None if an error occurred while trying to load the course, or
+        if the CourseOverview was not found when preloading it.
 
         Note:
             If the course is re-published within the lifetime of this
             CourseEnrollment object, then the value of this property will
             become stale.
        """
-        if not self._course_overview:
+        if not self._course_overview and not self._course_overview_preloaded:
             try:
                 self._course_overview = CourseOverview.get_from_id(self.course_id)
             except (CourseOverview.DoesNotExist, IOError):
@@ -1765,6 +1778,70 @@ def invalidate_enrollment_mode_cache(sender, instance, **kwargs):  # pylint: dis
     cache.delete(cache_key)
 
 
+def dashboard_snapshot_cache_key(user, course_enrollments):
+    """
+    Returns the cache key of the dashboard snapshot for the given user and enrollments.
+
+    The key includes a per-user generation, which invalidate_dashboard_snapshot
+    resets, and a hash of the enrollments, since sites may filter which
+    enrollments appear on the dashboard.
+
+    Args:
+        user (User): User whose dashboard is being rendered.
+        course_enrollments (list[CourseEnrollment]): Enrollments shown on the dashboard.
+
+    Returns:
+        str: Cache key.
+    """
+    generation_key = DASHBOARD_SNAPSHOT_GENERATION_KEY.format(user_id=user.id)
+    cache.add(generation_key, uuid.uuid4().hex, None)
+    generation = cache.get(generation_key)
+    enrollments = sorted(
+        u'{}={}'.format(enrollment.course_id, enrollment.mode) for enrollment in course_enrollments
+    )
+    enrollments_hash = hashlib.md5(u'&'.join(enrollments).encode('utf-8')).hexdigest()
+    return u'student.dashboard_snapshot.{}.{}.{}'.format(user.id, generation, enrollments_hash)
+
+
+def invalidate_dashboard_snapshot(user_id):
+    """
+    Discards every cached dashboard snapshot of the given user.
+
+    Changes are usually made inside the request's transaction, so a
+    concurrent dashboard load could cache a snapshot of the data before it
+    is committed. The snapshot is therefore discarded again after commit.
+    """
+    generation_key = DASHBOARD_SNAPSHOT_GENERATION_KEY.format(user_id=user_id)
+    cache.delete(generation_key)
+    run_after_commit(lambda: cache.delete(generation_key))
+
+
+@receiver(models.signals.post_save, sender=CourseEnrollment)
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+@receiver(models.signals.post_save, sender=GeneratedCertificate)
+def invalidate_dashboard_snapshot_for_instance(sender, instance, **kwargs):  # pylint: disable=unused-argument, invalid-name
+    """Invalidate the dashboard snapshot of the user whose enrollment or certificate changed. """
+    invalidate_dashboard_snapshot(instance.user_id)
+
+
+@receiver(COURSE_GRADE_CHANGED)
+def invalidate_dashboard_snapshot_for_grade(sender, user, **kwargs):  # pylint: disable=unused-argument, invalid-name
+    """Invalidate the dashboard snapshot of a user whose course grade changed. """
+    invalidate_dashboard_snapshot(user.id)
+
+
+@receiver(models.signals.post_save, sender=CreditEligibility)
+@receiver(models.signals.post_delete, sender=CreditEligibility)
+@receiver(models.signals.post_save, sender=CreditRequirementStatus)
+@receiver(models.signals.post_delete, sender=CreditRequirementStatus)
+@receiver(models.signals.post_save, sender=CreditRequest)
+@receiver(models.signals.post_delete, sender=CreditRequest)
+def invalidate_dashboard_snapshot_for_credit(sender, instance, **kwargs):  # pylint: disable=unused-argument, invalid-name
+    """Invalidate the dashboard snapshot of a user whose credit eligibility, requirements or requests changed. """
+    for user_id in User.objects.filter(username=instance.username).values_list('id', flat=True):
+        invalidate_dashboard_snapshot(user_id)
+
+
 class ManualEnrollmentAudit(models.Model):
     """
     Table for tracking which enrollments were performed through manual enrollment.
@@ -11,15 +11,27 @@ import pytz
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
 from edx_oauth2_provider.constants import AUTHORIZED_CLIENTS_SESSION_KEY
 from edx_oauth2_provider.tests.factories import ClientFactory, TrustedClientFactory
 from mock import patch
 from pyquery import PyQuery as pq
 
+from certificates.models import CertificateStatuses  # pylint: disable=import-error
+from certificates.tests.factories import GeneratedCertificateFactory  # pylint: disable=import-error
+from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification  # pylint: disable=import-error
+from openedx.core.djangoapps.credit.models import CreditCourse, CreditEligibility
 from student.cookies import get_user_info_cookie_data
 from student.helpers import DISABLE_UNENROLL_CERT_STATES
-from student.models import CourseEnrollment, LogoutViewConfiguration, UserProfile
+from student.models import (
+    CourseEnrollment,
+    LogoutViewConfiguration,
+    UserProfile,
+    invalidate_dashboard_snapshot,
+    invalidate_dashboard_snapshot_for_grade
+)
 from student.tests.factories import CourseEnrollmentFactory, UserFactory
+from util.db import run_after_commit_callbacks
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -304,3 +316,79 @@ class StudentDashboardTests(SharedModuleStoreTestCase):
         response = self.client.get(reverse('dashboard'))
         self.assertEqual('Share on Twitter' in response.content, set_marketing or set_social_sharing)
         self.assertEqual('Share on Facebook' in response.content, set_marketing or set_social_sharing)
+
+
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class StudentDashboardSnapshotTests(SharedModuleStoreTestCase):
+    """
+    Tests for the cached per-user dashboard snapshot.
+    """
+    ENABLED_CACHES = ['default']
+
+    @classmethod
+    def setUpClass(cls):
+        super(StudentDashboardSnapshotTests, cls).setUpClass()
+        cls.course = CourseFactory.create()
+
+    def setUp(self):
+        super(StudentDashboardSnapshotTests, self).setUp()
+        self.user = UserFactory()
+        CourseEnrollmentFactory(course_id=self.course.id, user=self.user)
+        self.client.login(username=self.user.username, password=PASSWORD)
+        self.path = reverse('dashboard')
+        # Run the invalidations of the setup, as its transaction would be over.
+        run_after_commit_callbacks()
+
+    def _assert_snapshot_computed(self, computed):
+        """
+        Renders the dashboard, and asserts whether its snapshot had to be computed.
+        """
+        with patch('student.views.cert_info', return_value={}) as mock_cert_info:
+            response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_cert_info.called, computed)
+
+    def test_snapshot_is_cached(self):
+        self._assert_snapshot_computed(True)
+        self._assert_snapshot_computed(False)
+
+    @override_settings(DASHBOARD_SNAPSHOT_CACHE_TIMEOUT=0)
+    def test_snapshot_disabled(self):
+        self._assert_snapshot_computed(True)
+        self._assert_snapshot_computed(True)
+
+    def test_snapshot_invalidated_by_enrollment(self):
+        self._assert_snapshot_computed(True)
+        CourseEnrollment.unenroll(self.user, self.course.id)
+        CourseEnrollment.enroll(self.user, self.course.id)
+        self._assert_snapshot_computed(True)
+
+    def test_snapshot_invalidated_by_certificate(self):
+        self._assert_snapshot_computed(True)
+        GeneratedCertificateFactory(user=self.user, course_id=self.course.id, status=CertificateStatuses.downloadable)
+        self._assert_snapshot_computed(True)
+
+    def test_snapshot_invalidated_by_verification(self):
+        self._assert_snapshot_computed(True)
+        SoftwareSecurePhotoVerification.objects.create(user=self.user, status='approved')
+        self._assert_snapshot_computed(True)
+
+    def test_snapshot_invalidated_by_grade(self):
+        self._assert_snapshot_computed(True)
+        invalidate_dashboard_snapshot_for_grade(sender=None, user=self.user, course_key=self.course.id)
+        self._assert_snapshot_computed(True)
+
+    def test_snapshot_invalidated_by_credit_eligibility(self):
+        self._assert_snapshot_computed(True)
+        credit_course = CreditCourse.objects.create(course_key=self.course.id, enabled=True)
+        CreditEligibility.objects.create(username=self.user.username, course=credit_course)
+        self._assert_snapshot_computed(True)
+
+    def test_snapshot_invalidated_after_commit(self):
+        self._assert_snapshot_computed(True)
+        # The change is made inside the test's transaction, so the snapshot
+        # computed by the next load is discarded once that load is over.
+        invalidate_dashboard_snapshot(self.user.id)
+        self._assert_snapshot_computed(True)
+        self._assert_snapshot_computed(True)
+        self._assert_snapshot_computed(False)
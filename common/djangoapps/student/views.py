@@ -19,6 +19,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import AnonymousUser, User
 from django.contrib.auth.views import password_reset_confirm
 from django.core import mail
+from django.core.cache import cache
 from django.core.context_processors import csrf
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.core.urlresolvers import NoReverseMatch, reverse, reverse_lazy
@@ -119,6 +120,7 @@ from student.models import (
     UserStanding,
     anonymous_id_for_user,
     create_comments_service_user,
+    dashboard_snapshot_cache_key,
     unique_id_for_user
 )
 from student.tasks import send_activation_email
@@ -762,11 +764,9 @@ def dashboard(request):
     #
     # If a course is not included in this dictionary,
     # there is no verification messaging to display.
-    verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
-    cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
-        for enrollment in course_enrollments
-    }
+    snapshot = _get_dashboard_snapshot(user, course_enrollments)
+    verify_status_by_course = snapshot['verification_status_by_course']
+    cert_statuses = snapshot['cert_statuses']
 
     # only show email settings for Mongo course and when bulk email is turned on
     show_email_settings_for = frozenset(
@@ -777,8 +777,8 @@ def dashboard(request):
 
     # Verification Attempts
     # Used to generate the "you must reverify for course x" banner
-    verification_status, verification_error_codes = SoftwareSecurePhotoVerification.user_status(user)
-    verification_errors = get_verification_error_reasons_for_display(verification_error_codes)
+    verification_status = snapshot['verification_status']
+    verification_errors = get_verification_error_reasons_for_display(snapshot['verification_error_codes'])
 
     # Gets data for midcourse reverifications, if any are necessary or have failed
     statuses = ["approved", "denied", "pending", "must_reverify"]
@@ -851,7 +851,7 @@ def dashboard(request):
         'show_courseware_links_for': show_courseware_links_for,
         'all_course_modes': course_mode_info,
         'cert_statuses': cert_statuses,
-        'credit_statuses': _credit_statuses(user, course_enrollments),
+        'credit_statuses': snapshot['credit_statuses'],
         'show_email_settings_for': show_email_settings_for,
         'reverifications': reverifications,
         'verification_status': verification_status,
@@ -888,6 +888,42 @@ def dashboard(request):
     return response
 
 
+def _get_dashboard_snapshot(user, course_enrollments):
+    """
+    Returns the user's certificate, credit and verification statuses shown on the dashboard.
+
+    Computing these takes several queries per enrollment, so they are cached
+    as a single snapshot for DASHBOARD_SNAPSHOT_CACHE_TIMEOUT seconds. Signal
+    receivers in student.models and verify_student.signals invalidate the
+    snapshot when the user's enrollments, certificates, verifications or
+    grades change.
+
+    Arguments:
+        user (User): The currently logged-in user.
+        course_enrollments (list[CourseEnrollment]): Enrollments shown on the dashboard.
+
+    Returns: dict
+    """
+    timeout = settings.DASHBOARD_SNAPSHOT_CACHE_TIMEOUT
+    cache_key = dashboard_snapshot_cache_key(user, course_enrollments) if timeout else None
+    snapshot = cache.get(cache_key) if cache_key else None
+    if snapshot is None:
+        verification_status, verification_error_codes = SoftwareSecurePhotoVerification.user_status(user)
+        snapshot = {
+            'cert_statuses': {
+                enrollment.course_id: cert_info(user, enrollment.course_overview, enrollment.mode)
+                for enrollment in course_enrollments
+            },
+            'credit_statuses': _credit_statuses(user, course_enrollments),
+            'verification_status': verification_status,
+            'verification_error_codes': verification_error_codes,
+            'verification_status_by_course': check_verify_status_by_course(user, course_enrollments),
+        }
+        if cache_key:
+            cache.set(cache_key, snapshot, timeout)
+    return snapshot
+
+
 def get_verification_error_reasons_for_display(verification_error_codes):
     verification_errors = []
     verification_error_map = {
@@ -1,16 +1,21 @@
 """
 Utility functions related to databases.
 """
+import logging
 import random
+import threading
 # TransactionManagementError used below actually *does* derive from the standard "Exception" class.
 # pylint: disable=nonstandard-exception
 from contextlib import contextmanager
 from functools import wraps
 
+from celery.signals import task_postrun
 from django.db import DEFAULT_DB_ALIAS, DatabaseError, Error, transaction
 
 import request_cache
 
+log = logging.getLogger(__name__)
+
 OUTER_ATOMIC_CACHE_NAME = 'db.outer_atomic'
 
 MYSQL_MAX_INT = (2 ** 31) - 1
@@ -264,6 +269,67 @@ def outer_atomic(using=None, savepoint=True, read_committed=False, name=None):
         return OuterAtomic(using, savepoint, read_committed, name)
 
 
+class _AfterCommitCallbacks(threading.local):
+    """
+    A thread-local list of the callbacks to run once the current transaction
+    is committed.
+    """
+    def __init__(self):
+        super(_AfterCommitCallbacks, self).__init__()
+        self.callbacks = []
+
+
+AFTER_COMMIT_CALLBACKS = _AfterCommitCallbacks()
+
+
+def run_after_commit(func, using=None):
+    """
+    Calls func once the current transaction is committed, or right away if
+    there is no transaction in progress.
+
+    Django 1.8 has no commit hooks, so callbacks registered inside an atomic
+    block are run by AfterCommitMiddleware once the view, and so the request's
+    transaction (see ATOMIC_REQUESTS), has returned, or at the end of the
+    current celery task. Callbacks are run whether the transaction was
+    committed or rolled back, so they should be safe to run in both cases,
+    like cache invalidations.
+
+    Arguments:
+        func (callable): called with no arguments.
+        using (str): the name of the database.
+    """
+    if transaction.get_connection(using).in_atomic_block:
+        AFTER_COMMIT_CALLBACKS.callbacks.append(func)
+    else:
+        func()
+
+
+@task_postrun.connect
+def run_after_commit_callbacks(**kwargs):  # pylint: disable=unused-argument
+    """
+    Runs, and forgets, the callbacks registered with run_after_commit.
+    """
+    callbacks, AFTER_COMMIT_CALLBACKS.callbacks = AFTER_COMMIT_CALLBACKS.callbacks, []
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception:  # pylint: disable=broad-except
+            log.exception(u'Error in callback run after commit: %r', callback)
+
+
+class AfterCommitMiddleware(object):
+    """
+    Runs the callbacks registered with run_after_commit during a request,
+    once its transaction is over.
+    """
+    def process_response(self, request, response):  # pylint: disable=unused-argument
+        run_after_commit_callbacks()
+        return response
+
+    def process_exception(self, request, exception):  # pylint: disable=unused-argument
+        run_after_commit_callbacks()
+
+
 def generate_int_id(minimum=0, maximum=MYSQL_MAX_INT, used_ids=None):
     """
     Return a unique integer in the range [minimum, maximum], inclusive.
@@ -128,7 +128,7 @@ def get_pre_requisite_courses_not_completed(user, enrolled_courses):  # pylint:
 
     for course_key in enrolled_courses:
         required_courses = []
-        fulfillment_paths = milestones_api.get_course_milestones_fulfillment_paths(course_key, {'id': user.id})
+        fulfillment_paths = get_milestones_snapshot(course_key, user.id).get_fulfillment_paths()
         for __, milestone_value in fulfillment_paths.items():
             for key, value in milestone_value.items():
                 if key == 'courses' and value:
@@ -193,6 +193,7 @@ def fulfill_course_milestone(course_key, user):
         course_milestones = milestones_api.get_course_milestones(course_key=course_key, relationship="fulfills")
     for milestone in course_milestones:
         milestones_api.add_user_milestone({'id': user.id}, milestone)
+    clear_milestones_snapshots()
 
 
 def remove_course_milestones(course_key, user, relationship):
@@ -204,6 +205,7 @@ def remove_course_milestones(course_key, user, relationship):
     course_milestones = milestones_api.get_course_milestones(course_key=course_key, relationship=relationship)
     for milestone in course_milestones:
         milestones_api.remove_user_milestone({'id': user.id}, milestone)
+    clear_milestones_snapshots()
 
 
 def get_required_content(course_key, user):
@@ -215,10 +217,7 @@ def get_required_content(course_key, user):
     if settings.FEATURES.get('MILESTONES_APP'):
         # Get all of the outstanding milestones for this course, for this user
         try:
-            milestone_paths = get_course_milestones_fulfillment_paths(
-                unicode(course_key),
-                serialize_user(user)
-            )
+            milestone_paths = get_milestones_snapshot(unicode(course_key), user.id).get_fulfillment_paths()
         except InvalidMilestoneRelationshipTypeException:
             return required_content
 
@@ -330,14 +329,15 @@ def add_course_content_milestone(course_id, content_id, relationship, milestone)
     """
     if not settings.FEATURES.get('MILESTONES_APP'):
         return None
-    return milestones_api.add_course_content_milestone(course_id, content_id, relationship, milestone)
+    result = milestones_api.add_course_content_milestone(course_id, content_id, relationship, milestone)
+    clear_milestones_snapshots()
+    return result
 
 
 def get_course_content_milestones(course_id, content_id, relationship, user_id=None):
     """
     Client API operation adapter/wrapper
-    Uses the request cache to store all of a user's
-    milestones
+    Reads a user's milestones from their milestones snapshot
     """
     if not settings.FEATURES.get('MILESTONES_APP'):
         return []
@@ -345,18 +345,94 @@ def get_course_content_milestones(course_id, content_id, relationship, user_id=N
     if user_id is None:
         return milestones_api.get_course_content_milestones(course_id, content_id, relationship)
 
+    content_id = unicode(content_id)
+    return [
+        m for m in get_milestones_snapshot(course_id, user_id).get_content_milestones(relationship)
+        if m['content_id'] == content_id
+    ]
+
+
+def get_course_content_ids_with_milestones(course_id, relationship, user_id):
+    """
+    Returns the set of ids of the course content with milestones of the given
+    relationship for the user, e.g. to check many blocks of a course at once.
+    """
+    if not settings.FEATURES.get('MILESTONES_APP'):
+        return set()
+
+    return get_milestones_snapshot(course_id, user_id).get_content_ids(relationship)
+
+
+class MilestonesSnapshot(object):
+    """
+    The milestones state of a user in a course, loaded from the milestones
+    app at most once per request and shared by everything checking it, e.g.
+    the gating of each subsection of the course outline:
+        the course content milestones the user hasn't fulfilled, by relationship.
+        the paths to fulfilling the course milestones the user hasn't fulfilled.
+    """
+    def __init__(self, course_id, user_id):
+        self.course_id = course_id
+        self.user_id = user_id
+        self._content_milestones = {}
+        self._content_ids = {}
+        self._fulfillment_paths = None
+
+    def get_content_milestones(self, relationship):
+        """
+        Returns the course content milestones of the given relationship the
+        user hasn't fulfilled.
+        """
+        if relationship not in self._content_milestones:
+            self._content_milestones[relationship] = milestones_api.get_course_content_milestones(
+                course_key=self.course_id,
+                relationship=relationship,
+                user={"id": self.user_id}
+            )
+        return self._content_milestones[relationship]
+
+    def get_content_ids(self, relationship):
+        """
+        Returns the set of ids of the course content with milestones of the
+        given relationship the user hasn't fulfilled.
+        """
+        if relationship not in self._content_ids:
+            self._content_ids[relationship] = {
+                m['content_id'] for m in self.get_content_milestones(relationship)
+            }
+        return self._content_ids[relationship]
+
+    def get_fulfillment_paths(self):
+        """
+        Returns the paths to fulfilling the course milestones the user hasn't
+        fulfilled, as returned by the milestones app.
+        """
+        if self._fulfillment_paths is None:
+            self._fulfillment_paths = milestones_api.get_course_milestones_fulfillment_paths(
+                self.course_id,
+                {"id": self.user_id}
+            )
+        return self._fulfillment_paths
+
+
+def get_milestones_snapshot(course_id, user_id):
+    """
+    Returns the milestones snapshot of the given user in the given course,
+    from the request cache.
+    """
     request_cache_dict = request_cache.get_cache(REQUEST_CACHE_NAME)
-    if user_id not in request_cache_dict:
-        request_cache_dict[user_id] = {}
+    cache_key = (unicode(course_id), unicode(user_id))
+    if cache_key not in request_cache_dict:
+        request_cache_dict[cache_key] = MilestonesSnapshot(course_id, user_id)
+    return request_cache_dict[cache_key]
 
-    if relationship not in request_cache_dict[user_id]:
-        request_cache_dict[user_id][relationship] = milestones_api.get_course_content_milestones(
-            course_key=course_id,
-            relationship=relationship,
-            user={"id": user_id}
-        )
 
-    return [m for m in request_cache_dict[user_id][relationship] if m['content_id'] == unicode(content_id)]
+def clear_milestones_snapshots():
+    """
+    Discards the milestones snapshots of the request, once the milestones of
+    a user or of course content change.
+    """
+    request_cache.get_cache(REQUEST_CACHE_NAME).clear()
 
 
 def remove_course_content_user_milestones(course_key, content_key, user, relationship):
@@ -369,6 +445,7 @@ def remove_course_content_user_milestones(course_key, content_key, user, relatio
     course_content_milestones = milestones_api.get_course_content_milestones(course_key, content_key, relationship)
     for milestone in course_content_milestones:
         milestones_api.remove_user_milestone({'id': user.id}, milestone)
+    clear_milestones_snapshots()
 
 
 def remove_content_references(content_id):
@@ -377,16 +454,16 @@ def remove_content_references(content_id):
     """
     if not settings.FEATURES.get('MILESTONES_APP'):
         return None
-    return milestones_api.remove_content_references(content_id)
+    result = milestones_api.remove_content_references(content_id)
+    clear_milestones_snapshots()
+    return result
 
 
 def any_unfulfilled_milestones(course_id, user_id):
     """ Returns a boolean if user has any unfulfilled milestones """
     if not settings.FEATURES.get('MILESTONES_APP'):
         return False
-    return bool(
-        get_course_milestones_fulfillment_paths(course_id, {"id": user_id})
-    )
+    return bool(get_milestones_snapshot(course_id, user_id).get_fulfillment_paths())
 
 
 def get_course_milestones_fulfillment_paths(course_id, user_id):
@@ -407,7 +484,9 @@ def add_user_milestone(user, milestone):
     """
     if not settings.FEATURES.get('MILESTONES_APP'):
         return None
-    return milestones_api.add_user_milestone(user, milestone)
+    result = milestones_api.add_user_milestone(user, milestone)
+    clear_milestones_snapshots()
+    return result
 
 
 def remove_user_milestone(user, milestone):
@@ -416,7 +495,9 @@ def remove_user_milestone(user, milestone):
     """
     if not settings.FEATURES.get('MILESTONES_APP'):
         return None
-    return milestones_api.remove_user_milestone(user, milestone)
+    result = milestones_api.remove_user_milestone(user, milestone)
+    clear_milestones_snapshots()
+    return result
 
 
 def get_service():
@@ -12,7 +12,15 @@ from django.db.transaction import TransactionManagementError, atomic
 from django.test import TestCase, TransactionTestCase
 from django.test.utils import override_settings
 
-from util.db import NoOpMigrationModules, commit_on_success, enable_named_outer_atomic, generate_int_id, outer_atomic
+from util.db import (
+    NoOpMigrationModules,
+    commit_on_success,
+    enable_named_outer_atomic,
+    generate_int_id,
+    outer_atomic,
+    run_after_commit,
+    run_after_commit_callbacks
+)
 
 
 def do_nothing():
@@ -208,6 +216,29 @@ class GenerateIntIdTestCase(TestCase):
             self.assertIn(int_id, list(set(range(minimum, maximum + 1)) - used_ids))
 
 
+class RunAfterCommitTestCase(TransactionTestCase):
+    """Tests for `run_after_commit`"""
+    def setUp(self):
+        super(RunAfterCommitTestCase, self).setUp()
+        self.calls = []
+        self.addCleanup(run_after_commit_callbacks)
+
+    def test_outside_transaction(self):
+        run_after_commit(lambda: self.calls.append(1))
+        self.assertEqual(self.calls, [1])
+
+    def test_inside_transaction(self):
+        with atomic():
+            run_after_commit(lambda: self.calls.append(1))
+            self.assertEqual(self.calls, [])
+        run_after_commit_callbacks()
+        self.assertEqual(self.calls, [1])
+
+        # callbacks are only run once
+        run_after_commit_callbacks()
+        self.assertEqual(self.calls, [1])
+
+
 class MigrationTests(TestCase):
     """
     Tests for migrations.
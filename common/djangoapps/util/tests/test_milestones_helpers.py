@@ -125,3 +125,32 @@ class MilestonesHelpersTestCase(ModuleStoreTestCase):
             milestones_helpers.any_unfulfilled_milestones(None, self.user)
         with self.assertRaises(InvalidUserException):
             milestones_helpers.any_unfulfilled_milestones(self.course.id, None)
+
+    @patch.dict('django.conf.settings.FEATURES', {'MILESTONES_APP': True})
+    def test_milestones_snapshot(self):
+        """
+        Tests that a user's milestones are loaded once per request, until
+        they fulfill a milestone
+        """
+        milestones_helpers.seed_milestone_relationship_types()
+        milestone = milestones_helpers.add_milestone(self.milestone)
+        content_id = unicode(self.course.location.replace(category='sequential', name='gated'))
+        milestones_helpers.add_course_content_milestone(self.course.id, content_id, 'requires', milestone)
+
+        self.assertEqual(
+            len(milestones_helpers.get_course_content_milestones(self.course.id, content_id, 'requires', 123)), 1
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                milestones_helpers.get_course_content_ids_with_milestones(self.course.id, 'requires', 123),
+                {content_id},
+            )
+            self.assertEqual(
+                milestones_helpers.get_course_content_milestones(self.course.id, content_id, 'requires', 123),
+                milestones_helpers.get_milestones_snapshot(self.course.id, 123).get_content_milestones('requires'),
+            )
+
+        milestones_helpers.add_user_milestone({'id': 123}, milestone)
+        self.assertEqual(
+            milestones_helpers.get_course_content_milestones(self.course.id, content_id, 'requires', 123), []
+        )
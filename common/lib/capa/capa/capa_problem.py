@@ -71,6 +71,15 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+
+def _convert_outtext(problem_text):
+    """
+    Convert startouttext and endouttext to proper <text></text>
+    """
+    problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
+    return re.sub(r"endouttext\s*/", "/text", problem_text)
+
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -171,9 +180,7 @@ class LoncapaProblem(object):
         self.done = state.get('done', False)
         self.input_state = state.get('input_state', {})
 
-        # Convert startouttext and endouttext to proper <text></text>
-        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
-        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
+        problem_text = _convert_outtext(problem_text)
         self.problem_text = problem_text
 
         # parse problem XML file into an element tree
@@ -303,6 +310,44 @@ class LoncapaProblem(object):
             maxscore += responder.get_max_score()
         return maxscore
 
+    @staticmethod
+    def get_static_max_score(problem_text):
+        """
+        Return the maximum score of the problem defined by the given xml, as
+        get_max_score would for a minimally initialized problem, but without
+        creating a LoncapaProblem: each input field of a response is worth its
+        points, 1 by default.
+
+        Returns None if the problem includes other files, or if creating it
+        would fail, in which case the problem must be created to get its
+        maximum score.
+        """
+        try:
+            tree = etree.XML(_convert_outtext(problem_text))
+        except etree.XMLSyntaxError:
+            return None
+        if tree.find('.//include') is not None:
+            return None
+
+        max_score = 0
+        input_fields_xpath = "|".join(['.//' + tag for tag in inputtypes.registry.registered_tags()])
+        for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
+            responsetype_cls = responsetypes.registry.get_class_for_tag(response.tag)
+            inputfields = response.xpath(input_fields_xpath)
+            # Mirrors the validation of LoncapaResponse, for problems that
+            # cannot be created to fail as they would otherwise.
+            if any(inputfield.tag not in responsetype_cls.allowed_inputfields for inputfield in inputfields):
+                return None
+            if responsetype_cls.max_inputfields and len(inputfields) > responsetype_cls.max_inputfields:
+                return None
+            if not all(response.get(prop) for prop in responsetype_cls.required_attributes):
+                return None
+            try:
+                max_score += sum(int(inputfield.get('points', '1')) for inputfield in inputfields)
+            except ValueError:
+                return None
+        return max_score
+
     def calculate_score(self, correct_map=None):
         """
         Compute score for this problem.  The score is the number of points awarded.
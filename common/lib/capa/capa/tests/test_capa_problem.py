@@ -6,7 +6,8 @@ import textwrap
 from lxml import etree
 import unittest
 
-from capa.tests.helpers import new_loncapa_problem
+from capa.capa_problem import LoncapaProblem
+from capa.tests.helpers import mock_capa_module, new_loncapa_problem, test_capa_system
 
 
 @ddt.ddt
@@ -590,3 +591,57 @@ class CAPAMultiInputProblemTest(unittest.TestCase):
             description_element = multi_inputs_group.xpath('//p[@id="{}"]'.format(description_id))
             self.assertEqual(len(description_element), 1)
             self.assertEqual(description_element[0].text, descriptions[index])
+
+
+@ddt.ddt
+class CAPAProblemStaticMaxScoreTest(unittest.TestCase):
+    """ TestCase for the max score of CAPA problems computed from their xml alone """
+
+    @ddt.data(
+        """
+        <problem>
+            <multiplechoiceresponse>
+                <choicegroup type="MultipleChoice">
+                    <choice correct="false">choice1</choice>
+                    <choice correct="true">choice2</choice>
+                </choicegroup>
+            </multiplechoiceresponse>
+        </problem>
+        """,
+        """
+        <problem>
+            <script type="loncapa/python">answer = 2</script>
+            <stringresponse answer="a">
+                <textline points="3"/>
+            </stringresponse>
+            <customresponse cfn="check">
+                <textline/>
+                <textline points="2"/>
+            </customresponse>
+            <startouttext />No response here.<endouttext />
+        </problem>
+        """,
+        """
+        <problem>
+            <p>No responses.</p>
+        </problem>
+        """,
+    )
+    def test_same_as_created_problem(self, xml):
+        problem = LoncapaProblem(
+            textwrap.dedent(xml), id='1', capa_system=test_capa_system(), capa_module=mock_capa_module(),
+            seed=1, minimal_init=True,
+        )
+        self.assertEqual(LoncapaProblem.get_static_max_score(textwrap.dedent(xml)), problem.get_max_score())
+
+    @ddt.data(
+        # Included files are not read.
+        '<problem><include file="other.xml"/></problem>',
+        # Problems which would fail to be created.
+        '<problem><stringresponse answer="a"><textline points="one"/></stringresponse></problem>',
+        '<problem><stringresponse><textline/></stringresponse></problem>',
+        '<problem><stringresponse answer="a"><choicegroup/></stringresponse></problem>',
+        '<problem><stringresponse answer="a"><textline/></problem>',
+    )
+    def test_not_static(self, xml):
+        self.assertIsNone(LoncapaProblem.get_static_max_score(xml))
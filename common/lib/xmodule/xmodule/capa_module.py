@@ -272,10 +272,23 @@ class CapaDescriptor(CapaFields, RawDescriptor):
             )
         return False
 
+    def static_max_score(self):
+        """
+        Return the problem's max score as computed from its xml alone, or None
+        if the problem must be created to compute it. See
+        LoncapaProblem.get_static_max_score.
+        """
+        from capa.capa_problem import LoncapaProblem
+        return LoncapaProblem.get_static_max_score(self.data)
+
     def max_score(self):
         """
         Return the problem's max score
         """
+        max_score = self.static_max_score()
+        if max_score is not None:
+            return max_score
+
         from capa.capa_problem import LoncapaProblem, LoncapaSystem
         capa_system = LoncapaSystem(
             ajax_url=None,
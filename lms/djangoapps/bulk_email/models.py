@@ -2,6 +2,8 @@
 Models for bulk email
 """
 import logging
+import re
+from string import Formatter
 
 import markupsafe
 from config_models.models import ConfigurationModel
@@ -413,6 +415,117 @@ class CourseEmailTemplate(models.Model):
                 context[key] = markupsafe.escape(value)
         return CourseEmailTemplate._render(self.html_template, htmltext, context)
 
+    def compile(self, plaintext, htmltext, global_context):
+        """
+        Pre-render this template for a single CourseEmail.
+
+        Everything that does not depend on the recipient (`global_context`) is
+        formatted once here, so that rendering for each recipient only has to
+        fill in the RECIPIENT_CONTEXT_KEYS and perform keyword substitution.
+        Returns a CompiledCourseEmailTemplate.
+        """
+        return CompiledCourseEmailTemplate(self, plaintext, htmltext, global_context)
+
+
+# Context keys whose values change from one recipient of an email to the next.
+RECIPIENT_CONTEXT_KEYS = frozenset(['name', 'email', 'user_id'])
+
+
+def _escape_context(context):
+    """
+    Return a copy of `context` with its string values HTML-escaped.
+    """
+    return {
+        key: markupsafe.escape(value) if isinstance(value, basestring) else value
+        for key, value in context.iteritems()
+    }
+
+
+class _CompiledFormatString(object):
+    """
+    A format string with all non-recipient fields already substituted.
+
+    The format string is split into literal segments and the fields that
+    refer to RECIPIENT_CONTEXT_KEYS; only the latter are formatted per recipient.
+    """
+    def __init__(self, format_string, context):
+        self._formatter = Formatter()
+        self._segments = []
+        literal = []
+        for literal_text, field_name, format_spec, conversion in self._formatter.parse(format_string):
+            literal.append(literal_text)
+            if field_name is None:
+                continue
+            if re.split(r'[.\[]', field_name, 1)[0] in RECIPIENT_CONTEXT_KEYS:
+                self._segments.append(u''.join(literal))
+                self._segments.append((field_name, format_spec, conversion))
+                literal = []
+            else:
+                literal.append(self._format_field(field_name, format_spec, conversion, context))
+        self._segments.append(u''.join(literal))
+
+    def _format_field(self, field_name, format_spec, conversion, context):
+        """
+        Format a single replacement field the way str.format would.
+        """
+        value, __ = self._formatter.get_field(field_name, (), context)
+        return self._formatter.format_field(self._formatter.convert_field(value, conversion), format_spec)
+
+    def format(self, context):
+        """
+        Return the fully formatted string for the recipient described by `context`.
+        """
+        return u''.join(
+            segment if isinstance(segment, basestring) else self._format_field(*segment, context=context)
+            for segment in self._segments
+        )
+
+
+class CompiledCourseEmailTemplate(object):
+    """
+    A CourseEmailTemplate pre-rendered with the message bodies and the
+    recipient-independent context of one CourseEmail.
+
+    Produces the same output as CourseEmailTemplate.render_plaintext and
+    CourseEmailTemplate.render_htmltext, without re-parsing the templates and
+    re-formatting the shared context for every recipient.
+    """
+    def __init__(self, template, plaintext, htmltext, global_context):
+        global_context = {
+            key: value for key, value in global_context.iteritems() if key not in RECIPIENT_CONTEXT_KEYS
+        }
+        self._global_context = global_context
+        self._escaped_global_context = _escape_context(global_context)
+        self._plaintext = plaintext
+        self._htmltext = htmltext
+        self._plain_template = _CompiledFormatString(template.plain_template, global_context)
+        self._html_template = _CompiledFormatString(template.html_template, self._escaped_global_context)
+
+    @staticmethod
+    def _render(compiled_template, message_body, context):
+        """
+        Mirror of CourseEmailTemplate._render for a compiled template.
+        """
+        if 'user_id' in context and 'course_id' in context and '%%' in message_body:
+            message_body = substitute_keywords_with_data(message_body, context)
+        result = compiled_template.format(context)
+        result = result.replace(COURSE_EMAIL_MESSAGE_BODY_TAG.format(), message_body, 1)
+        return wrap_message(result)
+
+    def render_plaintext(self, recipient_context):
+        """
+        Create the plain text message for one recipient.
+        """
+        context = dict(self._global_context, **recipient_context)
+        return self._render(self._plain_template, self._plaintext, context)
+
+    def render_htmltext(self, recipient_context):
+        """
+        Create the HTML text message for one recipient.
+        """
+        context = dict(self._escaped_global_context, **_escape_context(recipient_context))
+        return self._render(self._html_template, self._htmltext, context)
+
 
 class CourseAuthorization(models.Model):
     """
@@ -0,0 +1,121 @@
+"""
+Helpers for delivering bulk email messages from within a send_course_email subtask.
+
+A subtask holds a small pool of persistent email backend connections and sends
+one message per connection concurrently, while all workers share a global
+per-second sending limit stored in the Django cache.
+"""
+import logging
+import time
+from multiprocessing.pool import ThreadPool
+
+from django.core.cache import cache
+
+log = logging.getLogger(__name__)
+
+
+class SendRateLimiter(object):
+    """
+    Limits the number of messages sent per second across all bulk email workers.
+
+    The count of messages sent in the current second is kept in the shared
+    cache, so that every worker process (and every thread within a worker)
+    draws from the same allowance.  A falsy `max_per_second` disables limiting.
+    """
+    CACHE_KEY_PREFIX = 'bulk_email.send_rate'
+
+    def __init__(self, max_per_second):
+        self.max_per_second = max_per_second
+
+    def _cache_key(self, second):
+        """
+        Returns the cache key counting sends within the given epoch `second`.
+        """
+        return u'{}.{}'.format(self.CACHE_KEY_PREFIX, second)
+
+    def wait(self):
+        """
+        Blocks until sending one more message stays within the rate limit.
+        """
+        if not self.max_per_second:
+            return
+        while True:
+            now = time.time()
+            key = self._cache_key(int(now))
+            cache.add(key, 0, timeout=2)
+            try:
+                sent = cache.incr(key)
+            except ValueError:
+                # The key expired between add() and incr(); count this as the first send.
+                cache.add(key, 1, timeout=2)
+                sent = 1
+            if sent <= self.max_per_second:
+                return
+            time.sleep(1 - (now % 1))
+
+
+class EmailConnectionPool(object):
+    """
+    A fixed-size pool of open email backend connections.
+
+    `send_messages` sends up to `size` messages at once, each over its own
+    connection, and reports the outcome of each send without raising, so
+    that the caller can account for every recipient of a batch.
+    """
+    def __init__(self, connection_factory, size=1, rate_limiter=None):
+        self.size = max(1, size)
+        self.rate_limiter = rate_limiter or SendRateLimiter(None)
+        self._connections = []
+        self._threads = None
+        try:
+            for __ in range(self.size):
+                connection = connection_factory()
+                connection.open()
+                self._connections.append(connection)
+        except Exception:
+            self.close()
+            raise
+        if self.size > 1:
+            self._threads = ThreadPool(self.size)
+
+    def _send(self, args):
+        """
+        Sends a single message over the connection with the given index.
+
+        Returns a tuple of the exception raised (or None) and the time spent sending.
+        """
+        index, message = args
+        self.rate_limiter.wait()
+        start = time.time()
+        try:
+            self._connections[index].send_messages([message])
+        except Exception as exc:  # pylint: disable=broad-except
+            return exc, time.time() - start
+        return None, time.time() - start
+
+    def send_messages(self, messages):
+        """
+        Sends each of `messages` (at most `size` of them) over a separate connection.
+
+        Returns a list of (exception or None, send time in seconds), in the order of `messages`.
+        """
+        if len(messages) > self.size:
+            raise ValueError(u"Cannot send {} messages over {} connections".format(len(messages), self.size))
+        if self._threads is None or len(messages) == 1:
+            return [self._send(args) for args in enumerate(messages)]
+        return self._threads.map(self._send, list(enumerate(messages)))
+
+    def close(self):
+        """
+        Closes all connections in the pool, and the threads used to send over them.
+        """
+        if self._threads is not None:
+            self._threads.close()
+            self._threads.join()
+            self._threads = None
+        for connection in self._connections:
+            try:
+                connection.close()
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Failed to close bulk email connection")
+        self._connections = []
@@ -38,6 +38,7 @@ from markupsafe import escape
 
 import dogstats_wrapper as dog_stats_api
 from bulk_email.models import CourseEmail, Optout
+from bulk_email.sending import EmailConnectionPool, SendRateLimiter
 from courseware.courses import get_course
 from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.subtasks import (
@@ -48,7 +49,12 @@ from lms.djangoapps.instructor_task.subtasks import (
 )
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from openedx.core.lib.courses import course_image_url
-from openedx.eduscaled.lms.email.util import eduscaled_email, eduscaled_format_address
+from openedx.eduscaled.lms.email.util import (
+    eduscaled_append_course_footer,
+    eduscaled_course_footer,
+    eduscaled_format_address,
+    eduscaled_unsubscribe
+)
 from util.date_utils import get_default_time_display
 
 log = logging.getLogger('edx.celery.task')
@@ -123,6 +129,21 @@ def _get_course_email_context(course):
     return email_context
 
 
+def _get_recipient_queryset(targets, course_id, user_id):
+    """
+    Returns a single queryset of the users to send an email with the given `targets` to.
+
+    The users of all targets are combined into one query, from which inactive
+    users and users who have opted out of email for the course are excluded.
+    Duplicates are removed by the database.
+    """
+    combined_set = User.objects.none()
+    for target in targets:
+        combined_set |= target.get_users(course_id, user_id)
+    optout_user_ids = Optout.objects.filter(course_id=course_id, user__isnull=False).values('user_id')
+    return combined_set.filter(is_active=True).exclude(id__in=optout_user_ids).distinct()
+
+
 def perform_delegate_email_batches(entry_id, course_id, task_input, action_name):
     """
     Delegates emails by querying for the list of recipients who should
@@ -179,15 +200,8 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
     targets = email_obj.targets.all()
     global_email_context = _get_course_email_context(course)
 
-    recipient_qsets = [
-        target.get_users(course_id, user_id)
-        for target in targets
-    ]
-    combined_set = User.objects.none()
-    for qset in recipient_qsets:
-        combined_set |= qset
-    combined_set = combined_set.distinct()
-    recipient_fields = ['profile__name', 'email']
+    combined_set = _get_recipient_queryset(targets, course_id, user_id)
+    recipient_fields = ['profile__name', 'email', 'username']
 
     log.info(u"Task %s: Preparing to queue subtasks for sending emails for course %s, email %s",
              task_id, course_id, email_id)
@@ -231,6 +245,7 @@ def perform_delegate_email_batches(entry_id, course_id, task_input, action_name)
         recipient_fields,
         settings.BULK_EMAIL_EMAILS_PER_TASK,
         total_recipients,
+        items_per_query=settings.BULK_EMAIL_EMAILS_PER_QUERY,
     )
 
     # We want to return progress here, as this is what will be stored in the
@@ -253,6 +268,7 @@ def send_course_email(entry_id, email_id, to_list, global_email_context, subtask
         - 'profile__name': full name of User.
         - 'email': email address of User.
         - 'pk': primary key of User model.
+        - 'username': username of User.
       * `global_email_context`: dict containing values that are unique for this email but the same
         for all recipients of this email.  This dict is to be used to fill in slots in email
         template.  It does not include 'name' and 'email', which will be provided by the to_list.
@@ -341,6 +357,9 @@ def _filter_optouts_from_recipients(to_list, course_id):
     """
     Filters a recipient list based on student opt-outs for a given course.
 
+    Opt-outs are already excluded when the recipient lists are generated, so this
+    only removes users who opted out after this subtask was queued.
+
     Returns the filtered recipient list, as well as the number of optouts
     removed from the list.
     """
@@ -427,6 +446,46 @@ def _get_source_address(course_id, course_title, course_language, truncate=True)
     return from_addr
 
 
+def _render_course_email(recipient, compiled_template, course_footer, course_email, from_addr, course_title):
+    """
+    Builds the EmailMultiAlternatives message of `course_email` for a single recipient.
+
+    `recipient` is a dict as found in the `to_list` of a subtask, `compiled_template` the
+    CompiledCourseEmailTemplate of the email, and `course_footer` the eduscaled course footer.
+    The time spent rendering is reported to DataDog.
+    """
+    with dog_stats_api.timer('course_email.single_render.time.overall', tags=[_statsd_tag(course_title)]):
+        email = recipient['email']
+        recipient_context = {
+            'email': email,
+            'name': recipient['profile__name'],
+            'user_id': recipient['pk'],
+        }
+        # Construct message content using templates and context:
+        plaintext_msg = compiled_template.render_plaintext(recipient_context)
+        html_msg = compiled_template.render_htmltext(recipient_context)
+        # Reconstruct message content for eduscaled template
+        html_msg, plaintext_msg = eduscaled_append_course_footer(html_msg, plaintext_msg, course_footer)
+        username = recipient.get('username')
+        if username is None:
+            # Recipient lists queued before usernames were included in them.
+            username = User.objects.filter(email=email)[0].username
+        html_msg, plaintext_msg, unsubscribe_headers = eduscaled_unsubscribe(
+            html_msg, plaintext_msg, username, course_email
+        )
+
+        # Create email:
+        email_msg = EmailMultiAlternatives(
+            course_email.subject,
+            plaintext_msg,
+            from_addr,
+            [email],
+            headers=unsubscribe_headers,
+        )
+        email_msg.attach_alternative(html_msg, 'text/html')
+    return email_msg
+
+
 def _send_course_email(entry_id, email_id, to_list, global_email_context, subtask_status):
     """
     Performs the email sending task.
@@ -440,13 +499,16 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         - 'profile__name': full name of User.
         - 'email': email address of User.
         - 'pk': primary key of User model.
+        - 'username': username of User.
       * `global_email_context`: dict containing values that are unique for this email but the same
         for all recipients of this email.  This dict is to be used to fill in slots in email
         template.  It does not include 'name' and 'email', which will be provided by the to_list.
       * `subtask_status` : object of class SubtaskStatus representing current status.
 
     Sends to all addresses contained in to_list that are not also in the Optout table.
-    Emails are sent multi-part, in both plain text and html.
+    Emails are sent multi-part, in both plain text and html.  Up to
+    settings.BULK_EMAIL_CONNECTIONS_PER_TASK emails are sent concurrently, each over its
+    own persistent connection, subject to settings.BULK_EMAIL_MAX_SENDS_PER_SECOND.
 
     Returns a tuple of two values:
       * First value is a SubtaskStatus object which represents current progress at the end of this call.
@@ -504,51 +566,35 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         activate_language(course_language)
     # use the CourseEmailTemplate that was associated with the CourseEmail
     course_email_template = course_email.get_template()
+    connection_pool = None
     try:
-        connection = get_connection()
-        connection.open()
+        connection_pool = EmailConnectionPool(
+            get_connection,
+            size=settings.BULK_EMAIL_CONNECTIONS_PER_TASK,
+            rate_limiter=SendRateLimiter(settings.BULK_EMAIL_MAX_SENDS_PER_SECOND),
+        )
 
-        # Define context values to use in all course emails:
-        email_context = {'name': '', 'email': ''}
+        # Render everything that is the same for all recipients only once:
+        email_context = {'course_id': course_email.course_id}
         email_context.update(global_email_context)
+        compiled_template = course_email_template.compile(
+            course_email.text_message, course_email.html_message, email_context
+        )
+        course_footer = eduscaled_course_footer(course_title, global_email_context['course_url'])
 
         while to_list:
-            # Update context with user-specific values from the user at the end of the list.
-            # At the end of processing this user, they will be popped off of the to_list.
+            # Send to a batch of users taken from the end of the list, one per connection.
+            # At the end of processing a user, they will be popped off of the to_list.
             # That way, the to_list will always contain the recipients remaining to be emailed.
             # This is convenient for retries, which will need to send to those who haven't
             # yet been emailed, but not send to those who have already been sent to.
-            recipient_num += 1
-            current_recipient = to_list[-1]
-            email = current_recipient['email']
-            email_context['email'] = email
-            email_context['name'] = current_recipient['profile__name']
-            email_context['user_id'] = current_recipient['pk']
-            email_context['course_id'] = course_email.course_id
-
-            # Construct message content using templates and context:
-            plaintext_msg = course_email_template.render_plaintext(course_email.text_message, email_context)
-            html_msg = course_email_template.render_htmltext(course_email.html_message, email_context)
-            # Reconstruct message content for eduscaled template
-            html_msg, plaintext_msg, unsubscribe_headers = eduscaled_email(
-                html_msg,
-                plaintext_msg,
-                email,
-                course_email,
-                course_title,
-                global_email_context['course_url']
-            )
-
-            # Create email:
-            email_msg = EmailMultiAlternatives(
-                course_email.subject,
-                plaintext_msg,
-                from_addr,
-                [email],
-                headers=unsubscribe_headers,
-                connection=connection
-            )
-            email_msg.attach_alternative(html_msg, 'text/html')
+            batch = to_list[:-connection_pool.size - 1:-1]
+            email_msgs = [
+                _render_course_email(
+                    recipient, compiled_template, course_footer, course_email, from_addr, course_title
+                )
+                for recipient in batch
+            ]
 
             # Throttle if we have gotten the rate limiter.  This is not very high-tech,
             # but if a task has been retried for rate-limiting reasons, then we sleep
@@ -558,94 +604,113 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
             if subtask_status.retried_nomax > 0:
                 sleep(settings.BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS)
 
-            try:
+            for batch_num, current_recipient in enumerate(batch, start=recipient_num + 1):
                 log.info(
                     "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
                     Recipient name: %s, Email address: %s",
                     parent_task_id,
                     task_id,
                     email_id,
-                    recipient_num,
+                    batch_num,
                     total_recipients,
                     current_recipient['profile__name'],
-                    email
+                    current_recipient['email']
                 )
-                with dog_stats_api.timer('course_email.single_send.time.overall', tags=[_statsd_tag(course_title)]):
-                    connection.send_messages([email_msg])
-
-            except SMTPDataError as exc:
-                # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
+            send_results = connection_pool.send_messages(email_msgs)
+
+            # Recipients whose send must be retried with the whole task stay on the to_list.
+            unsent = []
+            send_exception = None
+            for current_recipient, (exc, send_time) in zip(batch, send_results):
+                recipient_num += 1
+                email = current_recipient['email']
+                dog_stats_api.histogram(
+                    'course_email.single_send.time.overall', send_time, tags=[_statsd_tag(course_title)]
                 )
-                if exc.smtp_code >= 400 and exc.smtp_code < 500:
-                    # This will cause the outer handler to catch the exception and retry the entire task.
-                    raise exc
-                else:
+                if exc is None:
+                    total_recipients_successful += 1
+                    log.info(
+                        "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s,",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
+                    if settings.BULK_EMAIL_LOG_SENT_EMAILS:
+                        log.info('Email with id %s sent to %s', email_id, email)
+                    else:
+                        log.debug('Email with id %s sent to %s', email_id, email)
+                    subtask_status.increment(succeeded=1)
+
+                elif isinstance(exc, SMTPDataError):
+                    # According to SMTP spec, we'll retry error codes in the 4xx range.  5xx range indicates hard failure.
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SMTPDataError), Task: %s, SubTask: %s, EmailId: %s, \
+                        Recipient num: %s/%s, Email address: %s",
+                        parent_task_id,
+                        task_id,
+                        email_id,
+                        recipient_num,
+                        total_recipients,
+                        email
+                    )
+                    if exc.smtp_code >= 400 and exc.smtp_code < 500:
+                        # This will cause the outer handler to catch the exception and retry the entire task.
+                        send_exception = send_exception or exc
+                        unsent.append(current_recipient)
+                        continue
+                    else:
+                        # This will fall through and not retry the message.
+                        log.warning(
+                            'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
+                            Email not delivered to %s due to error %s',
+                            parent_task_id,
+                            task_id,
+                            email_id,
+                            recipient_num,
+                            total_recipients,
+                            email,
+                            exc.smtp_error
+                        )
+                        dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
+                        subtask_status.increment(failed=1)
+
+                elif isinstance(exc, SINGLE_EMAIL_FAILURE_ERRORS):
                     # This will fall through and not retry the message.
-                    log.warning(
-                        'BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Recipient num: %s/%s, \
-                        Email not delivered to %s due to error %s',
+                    total_recipients_failed += 1
+                    log.error(
+                        "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
+                        EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
                         parent_task_id,
                         task_id,
                         email_id,
                         recipient_num,
                         total_recipients,
                         email,
-                        exc.smtp_error
+                        exc
                     )
                     dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
                     subtask_status.increment(failed=1)
 
-            except SINGLE_EMAIL_FAILURE_ERRORS as exc:
-                # This will fall through and not retry the message.
-                total_recipients_failed += 1
-                log.error(
-                    "BulkEmail ==> Status: Failed(SINGLE_EMAIL_FAILURE_ERRORS), Task: %s, SubTask: %s, \
-                    EmailId: %s, Recipient num: %s/%s, Email address: %s, Exception: %s",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email,
-                    exc
-                )
-                dog_stats_api.increment('course_email.error', tags=[_statsd_tag(course_title)])
-                subtask_status.increment(failed=1)
-
-            else:
-                total_recipients_successful += 1
-                log.info(
-                    "BulkEmail ==> Status: Success, Task: %s, SubTask: %s, EmailId: %s, \
-                    Recipient num: %s/%s, Email address: %s,",
-                    parent_task_id,
-                    task_id,
-                    email_id,
-                    recipient_num,
-                    total_recipients,
-                    email
-                )
-                dog_stats_api.increment('course_email.sent', tags=[_statsd_tag(course_title)])
-                if settings.BULK_EMAIL_LOG_SENT_EMAILS:
-                    log.info('Email with id %s sent to %s', email_id, email)
                 else:
-                    log.debug('Email with id %s sent to %s', email_id, email)
-                subtask_status.increment(succeeded=1)
+                    # Any other error is handled by the outer handlers for the entire task.
+                    send_exception = send_exception or exc
+                    unsent.append(current_recipient)
+                    continue
+
+                recipients_info[email] += 1
 
-            # Pop the user that was emailed off the end of the list only once they have
-            # successfully been processed.  (That way, if there were a failure that
-            # needed to be retried, the user is still on the list.)
-            recipients_info[email] += 1
-            to_list.pop()
+            # Remove the users that were processed from the end of the list only once they have
+            # been handled.  (That way, if there were a failure that needed to be retried,
+            # those users are still on the list.)
+            to_list[len(to_list) - len(batch):] = unsent[::-1]
+            if send_exception is not None:
+                raise send_exception  # pylint: disable=raising-bad-type
 
         log.info(
             "BulkEmail ==> Task: %s, SubTask: %s, EmailId: %s, Total Successful Recipients: %s/%s, \
@@ -726,7 +791,8 @@ def _send_course_email(entry_id, email_id, to_list, global_email_context, subtas
         return subtask_status, None
     finally:
         # Clean up at the end.
-        connection.close()
+        if connection_pool is not None:
+            connection_pool.close()
 
 
 def _get_current_task():
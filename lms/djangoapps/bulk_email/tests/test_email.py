@@ -422,6 +422,13 @@ class TestEmailSendFromDashboardMockedHtmlToText(EmailSendFromDashboardTestCase)
         """
         self.test_send_to_all()
 
+    @override_settings(BULK_EMAIL_CONNECTIONS_PER_TASK=4)
+    def test_send_to_all_connection_pool(self):
+        """
+        Test that email is sent to everyone exactly once when sending concurrently
+        """
+        self.test_send_to_all()
+
     def test_no_duplicate_emails_staff_instructor(self):
         """
         Test that no duplicate emails are sent to a course instructor that is
@@ -223,6 +223,33 @@ class CourseEmailTemplateTest(TestCase):
         self.assertIn(context['course_title'], message)
         self.assertIn(context['name'], message)
 
+    def test_compiled_template_matches_render(self):
+        template = CourseEmailTemplate.get_template()
+        context = self._add_xss_fields(self._get_sample_html_context())
+        plaintext = "Dear %%USER_FULLNAME%%, thanks for enrolling in %%COURSE_DISPLAY_NAME%%."
+        htmltext = "<p>Dear %%USER_FULLNAME%%, thanks for enrolling in %%COURSE_DISPLAY_NAME%%.</p>"
+        compiled = template.compile(plaintext, htmltext, context)
+        recipient_context = {key: context[key] for key in ('name', 'email', 'user_id')}
+        self.assertEqual(
+            compiled.render_plaintext(recipient_context),
+            template.render_plaintext(plaintext, dict(context))
+        )
+        self.assertEqual(
+            compiled.render_htmltext(recipient_context),
+            template.render_htmltext(htmltext, dict(context))
+        )
+
+    def test_compiled_template_without_context(self):
+        template = CourseEmailTemplate.get_template()
+        base_context = self._get_sample_html_context()
+        for keyname in base_context:
+            context = dict(base_context)
+            del context[keyname]
+            with self.assertRaises(KeyError):
+                template.compile("My new plain text.", "My new html text.", context).render_htmltext(
+                    {key: context[key] for key in ('email',) if key in context}
+                )
+
 
 @attr(shard=1)
 class CourseAuthorizationTest(TestCase):
@@ -0,0 +1,81 @@
+"""
+Unit tests for the bulk email sending helpers.
+"""
+from smtplib import SMTPDataError
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.test import TestCase
+from mock import Mock, patch
+from nose.plugins.attrib import attr
+
+from bulk_email.sending import EmailConnectionPool, SendRateLimiter
+
+
+@attr(shard=1)
+class EmailConnectionPoolTest(TestCase):
+    """
+    Test sending through a pool of email backend connections.
+    """
+    def _messages(self, count):
+        """ Returns `count` distinct test messages. """
+        return [
+            EmailMessage('subject', 'body', 'from@example.com', ['user{}@example.com'.format(index)])
+            for index in range(count)
+        ]
+
+    def test_concurrent_send(self):
+        pool = EmailConnectionPool(get_connection, size=4)
+        try:
+            results = pool.send_messages(self._messages(4))
+        finally:
+            pool.close()
+        self.assertEqual([exc for exc, __ in results], [None] * 4)
+        self.assertItemsEqual(
+            [message.to[0] for message in mail.outbox],
+            ['user{}@example.com'.format(index) for index in range(4)]
+        )
+
+    def test_errors_are_reported_per_message(self):
+        connection = Mock()
+        error = SMTPDataError(554, "Email address is blacklisted")
+        connection.send_messages.side_effect = [None, error]
+        pool = EmailConnectionPool(lambda: connection, size=1)
+        results = [pool.send_messages([message])[0] for message in self._messages(2)]
+        pool.close()
+        self.assertEqual([exc for exc, __ in results], [None, error])
+        self.assertTrue(connection.close.called)
+
+    def test_too_many_messages(self):
+        pool = EmailConnectionPool(get_connection, size=2)
+        with self.assertRaises(ValueError):
+            pool.send_messages(self._messages(3))
+        pool.close()
+
+
+@attr(shard=1)
+class SendRateLimiterTest(TestCase):
+    """
+    Test the global bulk email sending rate limit.
+    """
+    def setUp(self):
+        super(SendRateLimiterTest, self).setUp()
+        cache.clear()
+
+    @patch('bulk_email.sending.time')
+    def test_waits_for_next_second(self, mock_time):
+        mock_time.time.side_effect = [100.25, 100.5, 100.75, 101.0]
+        limiter = SendRateLimiter(2)
+        limiter.wait()
+        limiter.wait()
+        self.assertFalse(mock_time.sleep.called)
+        limiter.wait()
+        mock_time.sleep.assert_called_once_with(0.25)
+
+    @patch('bulk_email.sending.time')
+    def test_no_limit(self, mock_time):
+        limiter = SendRateLimiter(None)
+        for __ in range(10):
+            limiter.wait()
+        self.assertFalse(mock_time.time.called)
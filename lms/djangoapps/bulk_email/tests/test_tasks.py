@@ -31,7 +31,7 @@ from nose.plugins.attrib import attr
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 from bulk_email.models import SEND_TO_LEARNERS, SEND_TO_MYSELF, SEND_TO_STAFF, CourseEmail, Optout
-from bulk_email.tasks import _get_course_email_context
+from bulk_email.tasks import _filter_optouts_from_recipients, _get_course_email_context
 from lms.djangoapps.instructor_task.models import InstructorTask
 from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, update_subtask_status
 from lms.djangoapps.instructor_task.tasks import send_bulk_course_email
@@ -237,12 +237,34 @@ class TestBulkEmailInstructorTask(InstructorTaskCourseTestCase):
         expected_succeeds = num_emails - expected_skipped
         for index in range(0, num_emails, 4):
             Optout.objects.create(user=students[index], course_id=self.course.id)
-        # mark some students as opting out
+        # students who opted out are not included in the recipients at all
         with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
             get_conn.return_value.send_messages.side_effect = cycle([None])
-            self._test_run_with_task(
-                send_bulk_course_email, 'emailed', num_emails, expected_succeeds, skipped=expected_skipped
-            )
+            self._test_run_with_task(send_bulk_course_email, 'emailed', expected_succeeds, expected_succeeds)
+
+    def test_skipped_after_queueing(self):
+        # Select number of emails to fit into a single subtask.
+        num_emails = settings.BULK_EMAIL_EMAILS_PER_TASK
+        # We also send email to the instructor:
+        students = self._create_students(num_emails - 1)
+        optout_students = students[::4]
+
+        def _filter_optouts_late(to_list, course_id):
+            """Opt some students out after the recipient lists have been generated."""
+            for student in optout_students:
+                Optout.objects.create(user=student, course_id=course_id)
+            return _filter_optouts_from_recipients(to_list, course_id)
+
+        with patch('bulk_email.tasks.get_connection', autospec=True) as get_conn:
+            get_conn.return_value.send_messages.side_effect = cycle([None])
+            with patch('bulk_email.tasks._filter_optouts_from_recipients', side_effect=_filter_optouts_late):
+                self._test_run_with_task(
+                    send_bulk_course_email,
+                    'emailed',
+                    num_emails,
+                    num_emails - len(optout_students),
+                    skipped=len(optout_students)
+                )
 
     def _test_email_address_failures(self, exception):
         """Test that celery handles bad address errors by failing and not retrying."""
@@ -4,17 +4,24 @@ by the individual custom courses feature.
 """
 import json
 import logging
+import time
 
 from ccx_keys.locator import CCXBlockUsageLocator, CCXLocator
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
 import request_cache
-from courseware.field_overrides import FieldOverrideProvider
+from courseware.field_overrides import FieldOverrideProvider, clear_override_index
 from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
+from util.db import run_after_commit
 
 log = logging.getLogger(__name__)
 
+CCX_OVERRIDES_VERSION_KEY = u'ccx.overrides.version.{ccx_id}'
+CCX_OVERRIDES_CACHE_KEY = u'ccx.overrides.{ccx_id}.{version}'
+
 
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
@@ -115,24 +122,75 @@ def _clean_ccx_key(block_location):
     return clean_key.version_agnostic().for_branch(None)
 
 
+def _ccx_overrides_cache_key(ccx):
+    """
+    Returns the key under which the current version of the overrides of
+    `ccx` is cached across requests.
+    """
+    version_key = CCX_OVERRIDES_VERSION_KEY.format(ccx_id=ccx.id)
+    version = cache.get(version_key)
+    if version is None:
+        # Start from the current time in milliseconds, rather than 0, so that
+        # overrides cached before the version was evicted are never reused.
+        cache.add(version_key, int(time.time() * 1000), None)
+        version = cache.get(version_key)
+    return CCX_OVERRIDES_CACHE_KEY.format(ccx_id=ccx.id, version=version)
+
+
+def _bump_ccx_overrides_version(ccx):
+    """
+    Invalidates the overrides of `ccx` cached across requests.
+
+    The version is bumped again once the current transaction is over, since
+    a concurrent request may cache the overrides read before the commit
+    under the bumped version.
+    """
+    version_key = CCX_OVERRIDES_VERSION_KEY.format(ccx_id=ccx.id)
+
+    def bump_version():
+        """
+        Bumps the version, if any.
+        """
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # There is no version yet, so no overrides have been cached either.
+            pass
+
+    bump_version()
+    run_after_commit(bump_version)
+
+
 def _get_overrides_for_ccx(ccx):
     """
     Returns a dictionary mapping field name to overriden value for any
     overrides set on this block for this CCX.
+
+    The overrides are cached, already decoded, for the request and across
+    requests.  Only the overrides loaded from the database within this
+    request include their `CcxFieldOverride` instances.
     """
     overrides_cache = request_cache.get_cache('ccx-overrides')
 
     if ccx not in overrides_cache:
-        overrides = {}
-        query = CcxFieldOverride.objects.filter(
-            ccx=ccx,
-        )
+        cache_key = _ccx_overrides_cache_key(ccx)
+        overrides = cache.get(cache_key)
+
+        if overrides is None:
+            overrides = {}
+            query = CcxFieldOverride.objects.filter(
+                ccx=ccx,
+            )
+
+            for override in query:
+                block_overrides = overrides.setdefault(override.location, {})
+                block_overrides[override.field] = json.loads(override.value)
+                block_overrides[override.field + "_id"] = override.id
+
+            cache.set(cache_key, overrides, settings.CCX_OVERRIDES_CACHE_TIMEOUT)
 
-        for override in query:
-            block_overrides = overrides.setdefault(override.location, {})
-            block_overrides[override.field] = json.loads(override.value)
-            block_overrides[override.field + "_id"] = override.id
-            block_overrides[override.field + "_instance"] = override
+            for override in query:
+                overrides[override.location][override.field + "_instance"] = override
 
         overrides_cache[ccx] = overrides
 
@@ -174,6 +232,8 @@ def override_field_for_ccx(ccx, block, name, value):
 
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name] = value_json
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_instance"] = override
+    _bump_ccx_overrides_version(ccx)
+    clear_override_index()
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -190,6 +250,7 @@ def clear_override_for_ccx(ccx, block, name):
             field=name).delete()
 
         clear_ccx_field_info_from_ccx_map(ccx, block, name)
+        _bump_ccx_overrides_version(ccx)
 
     except CcxFieldOverride.DoesNotExist:
         pass
@@ -207,6 +268,7 @@ def clear_ccx_field_info_from_ccx_map(ccx, block, name):  # pylint: disable=inva
         ccx_override_map.pop(name + "_instance")
     except KeyError:
         pass
+    clear_override_index()
 
 
 def bulk_delete_ccx_override_fields(ccx, ids):
@@ -217,3 +279,5 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+        _bump_ccx_overrides_version(ccx)
+        clear_override_index()
@@ -7,6 +7,7 @@ import datetime
 import mock
 import pytz
 from ccx_keys.locator import CCXLocator
+from django.core.cache import cache
 from django.test.utils import override_settings
 from nose.plugins.attrib import attr
 
@@ -14,11 +15,18 @@ from courseware.courses import get_course_by_id
 from courseware.field_overrides import OverrideFieldData
 from courseware.testutils import FieldOverrideTestMixin
 from lms.djangoapps.ccx.models import CustomCourseForEdX
-from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx.overrides import (
+    _ccx_overrides_cache_key,
+    bulk_delete_ccx_override_fields,
+    clear_override_for_ccx,
+    get_override_for_ccx,
+    override_field_for_ccx
+)
 from lms.djangoapps.ccx.tests.utils import flatten, iter_blocks
 from lms.djangoapps.courseware.tests.test_field_overrides import inject_field_overrides
 from request_cache.middleware import RequestCache
 from student.tests.factories import AdminFactory
+from util.db import run_after_commit_callbacks
 from xmodule.modulestore.tests.django_utils import TEST_DATA_SPLIT_MODULESTORE, SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
@@ -170,3 +178,73 @@ class TestFieldOverrides(FieldOverrideTestMixin, SharedModuleStoreTestCase):
         override_field_for_ccx(self.ccx, chapter, 'due', ccx_due)
         vertical = chapter.get_children()[0].get_children()[0]
         self.assertEqual(vertical.due, ccx_due)
+
+
+@attr(shard=1)
+class TestOverridesCache(SharedModuleStoreTestCase):
+    """
+    Make sure the overrides of a CCX are cached across requests, and
+    invalidated when they change.
+    """
+    ENABLED_CACHES = ['default']
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestOverridesCache, cls).setUpClass()
+        cls.course = CourseFactory.create(enable_ccx=True)
+        cls.chapter = ItemFactory.create(parent=cls.course, category='chapter')
+
+    def setUp(self):
+        super(TestOverridesCache, self).setUp()
+        self.ccx = CustomCourseForEdX.objects.create(
+            course_id=self.course.id,
+            display_name='Test CCX',
+            coach=AdminFactory.create(),
+        )
+        self.due = datetime.datetime(2015, 1, 1, 00, 00, tzinfo=pytz.UTC)
+        override_field_for_ccx(self.ccx, self.chapter, 'due', self.due)
+        run_after_commit_callbacks()
+        RequestCache.clear_request_cache()
+
+    def get_due(self):
+        """
+        Returns the due date override of the chapter in a new request.
+        """
+        RequestCache.clear_request_cache()
+        return get_override_for_ccx(self.ccx, self.chapter, 'due')
+
+    def test_overrides_cached_across_requests(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_due(), self.due)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_due(), self.due)
+
+    def test_override_invalidates_cache(self):
+        self.assertEqual(self.get_due(), self.due)
+        new_due = datetime.datetime(2015, 2, 1, 00, 00, tzinfo=pytz.UTC)
+        override_field_for_ccx(self.ccx, self.chapter, 'due', new_due)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_due(), new_due)
+
+    def test_override_invalidates_cache_after_commit(self):
+        new_due = datetime.datetime(2015, 2, 1, 00, 00, tzinfo=pytz.UTC)
+        override_field_for_ccx(self.ccx, self.chapter, 'due', new_due)
+
+        # A concurrent request caches the overrides read before the commit.
+        cache.set(_ccx_overrides_cache_key(self.ccx), {}, None)
+        self.assertIsNone(self.get_due())
+
+        run_after_commit_callbacks()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_due(), new_due)
+
+    def test_clear_override_invalidates_cache(self):
+        self.assertEqual(self.get_due(), self.due)
+        clear_override_for_ccx(self.ccx, self.chapter, 'due')
+        self.assertIsNone(self.get_due())
+
+    def test_bulk_delete_invalidates_cache(self):
+        self.assertEqual(self.get_due(), self.due)
+        override_id = get_override_for_ccx(self.ccx, self.chapter, 'due_id')
+        bulk_delete_ccx_override_fields(self.ccx, [override_id])
+        self.assertIsNone(self.get_due())
@@ -3,11 +3,12 @@ Computes the data to display on the Instructor Dashboard
 """
 import json
 
-from django.db.models import Count
+from django.db.models import Count, Sum
 from django.utils.translation import ugettext as _
 from opaque_keys.edx.locations import Location
 
 from courseware import models
+from courseware.score_snapshot import get_course_score_snapshot
 from instructor_analytics.csvs import create_csv_response
 from util.json_request import JsonResponse
 from xmodule.modulestore.django import modulestore
@@ -17,6 +18,33 @@ from xmodule.modulestore.inheritance import own_metadata
 MAX_SCREEN_LIST_LENGTH = 250
 
 
+def _problem_grade_counts(course_id, problem_set=None):
+    """
+    Returns the number of students with each grade on the problems of the
+    course (or on those in `problem_set` only), as a list of
+    (`usage_key`, `grade`, `max_grade`, `count`) ordered by grade within each problem.
+
+    Reads the precomputed distributions if they are materialized, otherwise
+    the course's score snapshot.
+    """
+    if models.materialize_distributions_enabled():
+        db_query = models.ProblemGradeCount.objects.filter(course_id=course_id, count__gt=0)
+        if problem_set is not None:
+            db_query = db_query.filter(module_state_key__in=problem_set)
+        db_query = db_query.values_list('module_state_key', 'grade', 'max_grade').annotate(count_grade=Sum('count'))
+        return [
+            (course_id.make_usage_key_from_deprecated_string(module_state_key), grade, max_grade, count)
+            for module_state_key, grade, max_grade, count in db_query.order_by('module_state_key', 'grade')
+        ]
+
+    distributions = get_course_score_snapshot(course_id).grade_distributions(problem_set)
+    return [
+        (usage_key, grade, max_grade, count)
+        for usage_key, distribution in distributions.iteritems()
+        for grade, max_grade, count in distribution
+    ]
+
+
 def get_problem_grade_distribution(course_id):
     """
     Returns the grade distribution per problem for the course
@@ -31,36 +59,28 @@ def get_problem_grade_distribution(course_id):
         attempting the problem
     """
 
-    # Aggregate query on studentmodule table for grade data for all problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
-
     prob_grade_distrib = {}
     total_student_count = {}
 
-    # Loop through resultset building data for each problem
-    for row in db_query:
-        curr_problem = course_id.make_usage_key_from_deprecated_string(row['module_state_key'])
+    # Loop through grade data for all problems in course, building data for each problem
+    for curr_problem, grade, max_grade, count_grade in _problem_grade_counts(course_id):
 
         # Build set of grade distributions for each problem that has student responses
         if curr_problem in prob_grade_distrib:
-            prob_grade_distrib[curr_problem]['grade_distrib'].append((row['grade'], row['count_grade']))
+            prob_grade_distrib[curr_problem]['grade_distrib'].append((grade, count_grade))
 
-            if (prob_grade_distrib[curr_problem]['max_grade'] != row['max_grade']) and \
-                    (prob_grade_distrib[curr_problem]['max_grade'] < row['max_grade']):
-                prob_grade_distrib[curr_problem]['max_grade'] = row['max_grade']
+            if (prob_grade_distrib[curr_problem]['max_grade'] != max_grade) and \
+                    (prob_grade_distrib[curr_problem]['max_grade'] < max_grade):
+                prob_grade_distrib[curr_problem]['max_grade'] = max_grade
 
         else:
             prob_grade_distrib[curr_problem] = {
-                'max_grade': row['max_grade'],
-                'grade_distrib': [(row['grade'], row['count_grade'])]
+                'max_grade': max_grade,
+                'grade_distrib': [(grade, count_grade)]
             }
 
         # Build set of total students attempting each problem
-        total_student_count[curr_problem] = total_student_count.get(curr_problem, 0) + row['count_grade']
+        total_student_count[curr_problem] = total_student_count.get(curr_problem, 0) + count_grade
 
     return prob_grade_distrib, total_student_count
 
@@ -74,11 +94,17 @@ def get_sequential_open_distrib(course_id):
     Outputs a dict mapping the 'module_id' to the number of students that have opened that subsection/sequential.
     """
 
-    # Aggregate query on studentmodule table for "opening a subsection" data
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        module_type__exact="sequential",
-    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+    # Aggregate query for "opening a subsection" data
+    if models.materialize_distributions_enabled():
+        db_query = models.SequentialOpenCount.objects.filter(
+            course_id=course_id,
+            count__gt=0,
+        ).values('module_state_key').annotate(count_sequential=Sum('count'))
+    else:
+        db_query = models.StudentModule.objects.filter(
+            course_id__exact=course_id,
+            module_type__exact="sequential",
+        ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
 
     # Build set of "opened" data for each subsection that has "opened" data
     sequential_open_distrib = {}
@@ -104,23 +130,10 @@ def get_problem_set_grade_distrib(course_id, problem_set):
       'grade_distrib' - array of tuples (`grade`,`count`) ordered by `grade`
     """
 
-    # Aggregate query on studentmodule table for grade data for set of problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-        module_state_key__in=problem_set,
-    ).values(
-        'module_state_key',
-        'grade',
-        'max_grade',
-    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
-
     prob_grade_distrib = {}
 
-    # Loop through resultset building data for each problem
-    for row in db_query:
-        row_loc = course_id.make_usage_key_from_deprecated_string(row['module_state_key'])
+    # Loop through grade data for set of problems in course, building data for each problem
+    for row_loc, grade, max_grade, count_grade in _problem_grade_counts(course_id, problem_set):
         if row_loc not in prob_grade_distrib:
             prob_grade_distrib[row_loc] = {
                 'max_grade': 0,
@@ -128,10 +141,10 @@ def get_problem_set_grade_distrib(course_id, problem_set):
             }
 
         curr_grade_distrib = prob_grade_distrib[row_loc]
-        curr_grade_distrib['grade_distrib'].append((row['grade'], row['count_grade']))
+        curr_grade_distrib['grade_distrib'].append((grade, count_grade))
 
-        if curr_grade_distrib['max_grade'] < row['max_grade']:
-            curr_grade_distrib['max_grade'] = row['max_grade']
+        if curr_grade_distrib['max_grade'] < max_grade:
+            curr_grade_distrib['max_grade'] = max_grade
 
     return prob_grade_distrib
 
@@ -4,7 +4,10 @@ Tests for class dashboard (Metrics tab in instructor dashboard)
 
 import json
 
+from django.conf import settings
+from django.core.management import call_command
 from django.core.urlresolvers import reverse
+from django.db import DatabaseError, transaction
 from django.test.client import RequestFactory
 from mock import patch
 from nose.plugins.attrib import attr
@@ -23,8 +26,11 @@ from class_dashboard.dashboard_data import (
     get_students_problem_grades
 )
 from class_dashboard.views import has_instructor_access_for_class
+from courseware.models import DistributionCountDelta, ProblemGradeCount, StudentModule
+from courseware.tasks import update_class_dashboard_distributions
 from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import AdminFactory, CourseEnrollmentFactory, UserFactory
+from util.db import run_after_commit_callbacks
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
@@ -327,3 +333,102 @@ class TestGetProblemGradeDistribution(SharedModuleStoreTestCase):
         """
         ret_val = bool(has_instructor_access_for_class(self.instructor, self.course.id))
         self.assertEquals(ret_val, True)
+
+
+@attr(shard=1)
+class TestGetMaterializedProblemGradeDistribution(TestGetProblemGradeDistribution):
+    """
+    Runs the class dashboard tests against materialized distributions, and
+    tests their maintenance.
+    """
+    def setUp(self):
+        patcher = patch.dict(settings.FEATURES, {'MATERIALIZE_CLASS_DASHBOARD_DISTRIBUTIONS': True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super(TestGetMaterializedProblemGradeDistribution, self).setUp()
+        # Apply the changes recorded by the creation of the StudentModules.
+        run_after_commit_callbacks()
+
+    def _grade_distrib(self):
+        """
+        Returns the grade distribution of self.item, as a dict of grade to count.
+        """
+        prob_grade_distrib, __ = get_problem_grade_distribution(self.course.id)
+        return dict(prob_grade_distrib[self.item.location]['grade_distrib'])
+
+    def test_grade_change(self):
+        self.assertEqual(self._grade_distrib(), {0: 10, 1: 1})
+        module = StudentModule.objects.get(student=self.users[0], module_state_key=self.item.location)
+        module.grade = 1
+        module.max_grade = 1
+        module.save()
+
+        # The distributions are updated once the change is committed.
+        self.assertEqual(self._grade_distrib(), {0: 10, 1: 1})
+        run_after_commit_callbacks()
+        self.assertEqual(self._grade_distrib(), {0: 9, 1: 2})
+
+    def test_delete(self):
+        StudentModule.objects.get(student=self.users[0], module_state_key=self.item.location).delete()
+        StudentModule.objects.filter(module_type='sequential', module_state_key=self.item.location)[0].delete()
+        run_after_commit_callbacks()
+        self.assertEqual(self._grade_distrib(), {0: 9, 1: 1})
+        self.assertEqual(get_sequential_open_distrib(self.course.id)[self.item.location], USER_COUNT - 1)
+
+    def test_update_scheduled_once(self):
+        modules = StudentModule.objects.filter(course_id=self.course.id, module_type='problem')
+        with patch('courseware.tasks.update_class_dashboard_distributions.apply_async') as mock_apply_async:
+            for module in modules:
+                module.grade = 1
+                module.max_grade = 1
+                module.save()
+            run_after_commit_callbacks()
+        mock_apply_async.assert_called_once_with(
+            args=[unicode(self.course.id)], countdown=settings.CLASS_DASHBOARD_DISTRIBUTIONS_UPDATE_DELAY,
+        )
+
+        # Until the update runs, only the deltas are recorded.
+        self.assertEqual(self._grade_distrib(), {0: 10, 1: 1})
+        update_class_dashboard_distributions(unicode(self.course.id))
+        self.assertEqual(self._grade_distrib(), {1: 11})
+        self.assertFalse(DistributionCountDelta.objects.filter(course_id=self.course.id).exists())
+
+    def test_rollback_not_counted(self):
+        module = StudentModule.objects.get(student=self.users[0], module_state_key=self.item.location)
+        try:
+            with transaction.atomic():
+                module.grade = 1
+                module.max_grade = 1
+                module.save()
+                raise DatabaseError
+        except DatabaseError:
+            pass
+        run_after_commit_callbacks()
+        self.assertEqual(self._grade_distrib(), {0: 10, 1: 1})
+
+    def test_reads_materialized_distribution(self):
+        # Updates bypassing save() aren't seen until the distributions are rebuilt.
+        StudentModule.objects.filter(course_id=self.course.id, module_type='problem').update(grade=1, max_grade=1)
+        self.assertEqual(self._grade_distrib(), {0: 10, 1: 1})
+
+        # Which discards the deltas of the changes it counted.
+        module = StudentModule.objects.get(student=self.users[0], module_state_key=self.item.location)
+        module.grade = 0
+        module.save()
+        module.grade = 1
+        module.save()
+        self.assertTrue(DistributionCountDelta.objects.filter(course_id=self.course.id).exists())
+
+        call_command('rebuild_class_dashboard_distributions', unicode(self.course.id))
+        self.assertEqual(self._grade_distrib(), {1: 11})
+        self.assertEqual(ProblemGradeCount.objects.filter(course_id=self.course.id).count(), len(self.items))
+        self.assertFalse(DistributionCountDelta.objects.filter(course_id=self.course.id).exists())
+
+    def test_rebuild_without_max_grade(self):
+        StudentModule.objects.filter(course_id=self.course.id, module_type='problem').update(grade=1, max_grade=None)
+        call_command('rebuild_class_dashboard_distributions', unicode(self.course.id))
+        self.assertEqual(self._grade_distrib(), {1: 11})
+        self.assertEqual(
+            list(ProblemGradeCount.objects.filter(course_id=self.course.id).values_list('max_grade', flat=True)),
+            [0] * len(self.items),
+        )
@@ -6,7 +6,7 @@ from lms.djangoapps.course_blocks.api import COURSE_BLOCK_ACCESS_TRANSFORMERS, g
 from lms.djangoapps.course_blocks.transformers.hidden_content import HiddenContentTransformer
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 
-from .serializers import BlockDictSerializer, BlockSerializer
+from .serializers import BlockDictSerializer, BlockSerializer, iter_serialized_blocks
 from .transformers.blocks_api import BlocksAPITransformer
 from .transformers.milestones import MilestonesAndSpecialExamsTransformer
 
@@ -22,6 +22,7 @@ def get_blocks(
         student_view_data=None,
         return_type='dict',
         block_types_filter=None,
+        stream=False,
 ):
     """
     Return a serialized representation of the course blocks.
@@ -48,6 +49,9 @@ def get_blocks(
             the format for returning the blocks.
         block_types_filter (list): Optional list of block type names used to filter
             the final result of returned blocks.
+        stream (boolean): If True, returns an iterator over the JSON of the
+            serialized blocks instead of the serialized data, so the blocks
+            are only serialized as the iterator is consumed.
     """
     # create ordered list of transformers, adding BlocksAPITransformer at end.
     transformers = BlockStructureTransformers()
@@ -86,6 +90,9 @@ def get_blocks(
         'requested_fields': requested_fields or [],
     }
 
+    if stream:
+        return iter_serialized_blocks(blocks, serializer_context, return_type)
+
     if return_type == 'dict':
         serializer = BlockDictSerializer(blocks, context=serializer_context, many=False)
     else:
@@ -0,0 +1,19 @@
+"""
+This module contains various configuration settings via
+waffle switches for the Course Blocks API.
+"""
+from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
+
+
+# Namespace
+WAFFLE_NAMESPACE = u'course_api_blocks'
+
+# Switches
+STREAM_BLOCKS_RESPONSES = u'stream_blocks_responses'
+
+
+def waffle():
+    """
+    Returns the namespaced and cached Waffle class for the Course Blocks API.
+    """
+    return WaffleSwitchNamespace(name=WAFFLE_NAMESPACE, log_prefix=u'CourseBlocksAPI: ')
@@ -1,9 +1,12 @@
 """
 Serializers for Course Blocks related return objects.
 """
+import json
+
 from django.conf import settings
 from rest_framework import serializers
 from rest_framework.reverse import reverse
+from rest_framework.utils.encoders import JSONEncoder
 
 from .transformers import SUPPORTED_FIELDS
 
@@ -12,23 +15,23 @@ class BlockSerializer(serializers.Serializer):  # pylint: disable=abstract-metho
     """
     Serializer for single course block
     """
-    def _get_field(self, block_key, transformer, field_name, default):
+    def _get_requested_field_getters(self):
         """
-        Get the field value requested.  The field may be an XBlock field, a
-        transformer block field, or an entire tranformer block data dict.
+        Returns a list of (serializer_field_name, getter) tuples for the
+        requested fields that are supported by the various transformers.
+        The getters are computed once for the block structure of the
+        serializer's context and cached in the context.
         """
-        value = None
-        if transformer is None:
-            value = self.context['block_structure'].get_xblock_field(block_key, field_name)
-        elif field_name is None:
-            try:
-                value = self.context['block_structure'].get_transformer_block_data(block_key, transformer).fields
-            except KeyError:
-                pass
-        else:
-            value = self.context['block_structure'].get_transformer_block_field(block_key, transformer, field_name)
-
-        return value if (value is not None) else default
+        block_structure = self.context['block_structure']
+        cached = self.context.get('_requested_field_getters')
+        if cached is None or cached[0] is not block_structure:
+            field_getters = [
+                (supported_field.serializer_field_name, _get_field_getter(block_structure, supported_field))
+                for supported_field in SUPPORTED_FIELDS
+                if supported_field.requested_field_name in self.context['requested_fields']
+            ]
+            cached = self.context['_requested_field_getters'] = (block_structure, field_getters)
+        return cached[1]
 
     def to_representation(self, block_key):
         """
@@ -58,17 +61,11 @@ class BlockSerializer(serializers.Serializer):  # pylint: disable=abstract-metho
             )
 
         # add additional requested fields that are supported by the various transformers
-        for supported_field in SUPPORTED_FIELDS:
-            if supported_field.requested_field_name in self.context['requested_fields']:
-                field_value = self._get_field(
-                    block_key,
-                    supported_field.transformer,
-                    supported_field.block_field_name,
-                    supported_field.default_value,
-                )
-                if field_value is not None:
-                    # only return fields that have data
-                    data[supported_field.serializer_field_name] = field_value
+        for serializer_field_name, get_field in self._get_requested_field_getters():
+            field_value = get_field(block_key)
+            if field_value is not None:
+                # only return fields that have data
+                data[serializer_field_name] = field_value
 
         if 'children' in self.context['requested_fields']:
             children = self.context['block_structure'].get_children(block_key)
@@ -94,3 +91,68 @@ class BlockDictSerializer(serializers.Serializer):  # pylint: disable=abstract-m
             unicode(block_key): BlockSerializer(block_key, context=self.context).data
             for block_key in structure
         }
+
+
+def iter_serialized_blocks(block_structure, context, return_type='dict'):
+    """
+    Serializes the given block structure to JSON incrementally, yielding
+    the JSON of one block at a time, so that the serialized blocks of the
+    whole structure are never held in memory at once.
+
+    The JSON is the same as that of BlockDictSerializer, if return_type
+    is 'dict', or of a BlockSerializer with many=True otherwise.
+    """
+    block_serializer = BlockSerializer(context=context)
+    if return_type == 'dict':
+        yield '{{"root": {}, "blocks": {{'.format(_to_json(unicode(block_structure.root_block_usage_key)))
+    else:
+        yield '['
+
+    separator = ''
+    for block_key in block_structure:
+        block_json = _to_json(block_serializer.to_representation(block_key))
+        if return_type == 'dict':
+            yield '{}{}: {}'.format(separator, _to_json(unicode(block_key)), block_json)
+        else:
+            yield separator + block_json
+        separator = ', '
+
+    yield '}}' if return_type == 'dict' else ']'
+
+
+def _to_json(value):
+    """
+    Encodes the given value to JSON, as the JSON renderer would.
+    """
+    return json.dumps(value, cls=JSONEncoder)
+
+
+def _get_field_getter(block_structure, supported_field):
+    """
+    Returns a function that gets the value of the given supported field
+    for a block of the given block structure. The field may be an XBlock
+    field, a transformer block field, or an entire transformer block data
+    dict.
+    """
+    transformer = supported_field.transformer
+    field_name = supported_field.block_field_name
+    default = supported_field.default_value
+
+    if transformer is None:
+        def get_value(block_key):  # pylint: disable=missing-docstring
+            return block_structure.get_xblock_field(block_key, field_name)
+    elif field_name is None:
+        def get_value(block_key):  # pylint: disable=missing-docstring
+            try:
+                return block_structure.get_transformer_block_data(block_key, transformer).fields
+            except KeyError:
+                return None
+    else:
+        def get_value(block_key):  # pylint: disable=missing-docstring
+            return block_structure.get_transformer_block_field(block_key, transformer, field_name)
+
+    def get_field(block_key):  # pylint: disable=missing-docstring
+        value = get_value(block_key)
+        return value if (value is not None) else default
+
+    return get_field
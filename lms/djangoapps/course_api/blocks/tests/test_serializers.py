@@ -1,7 +1,10 @@
 """
 Tests for Course Blocks serializers
 """
+import json
+
 from mock import MagicMock
+from rest_framework.utils.encoders import JSONEncoder
 
 from lms.djangoapps.course_blocks.api import COURSE_BLOCK_ACCESS_TRANSFORMERS, get_course_blocks
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
@@ -11,7 +14,7 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
-from ..serializers import BlockDictSerializer, BlockSerializer
+from ..serializers import BlockDictSerializer, BlockSerializer, iter_serialized_blocks
 from ..transformers.blocks_api import BlocksAPITransformer
 from .helpers import deserialize_usage_key
 
@@ -231,3 +234,31 @@ class TestBlockDictSerializer(TestBlockSerializerBase):
             self.assert_extended_block(serialized_block)
             self.assert_staff_fields(serialized_block)
         self.assertEquals(len(serializer.data['blocks']), 29)
+
+
+class TestIterSerializedBlocks(TestBlockSerializerBase):
+    """
+    Tests iter_serialized_blocks, which streams the JSON of the serializers.
+    """
+    def assert_same_json(self, return_type, serializer):
+        """
+        Verifies that the streamed JSON of the given return_type is that of
+        the given serializer, and is yielded one block at a time.
+        """
+        self.add_additional_requested_fields()
+        chunks = list(iter_serialized_blocks(self.block_structure, self.serializer_context, return_type))
+        self.assertEquals(len(chunks), len(list(self.block_structure)) + 2)
+        self.assertEquals(
+            json.loads(''.join(chunks)),
+            json.loads(json.dumps(serializer.data, cls=JSONEncoder)),
+        )
+
+    def test_dict(self):
+        self.assert_same_json(
+            'dict', BlockDictSerializer(self.block_structure, many=False, context=self.serializer_context),
+        )
+
+    def test_list(self):
+        self.assert_same_json(
+            'list', BlockSerializer(self.block_structure, many=True, context=self.serializer_context),
+        )
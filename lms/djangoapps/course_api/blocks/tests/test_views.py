@@ -1,6 +1,7 @@
 """
 Tests for Blocks Views
 """
+import json
 from datetime import datetime
 from string import join
 from urllib import urlencode
@@ -14,6 +15,7 @@ from student.tests.factories import AdminFactory, CourseEnrollmentFactory, UserF
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
+from ..config import STREAM_BLOCKS_RESPONSES, waffle
 from .helpers import deserialize_usage_key
 
 
@@ -233,6 +235,14 @@ class TestBlocksView(SharedModuleStoreTestCase):
         )
         self.verify_response_with_requested_fields(response)
 
+    def test_streaming(self):
+        with waffle().override(STREAM_BLOCKS_RESPONSES, active=True):
+            response = self.verify_response(params={'requested_fields': self.requested_fields})
+            self.assertTrue(response.streaming)
+            response.data = json.loads(''.join(response.streaming_content))
+        self.assertEquals(response.data['root'], unicode(self.course_usage_key))
+        self.verify_response_with_requested_fields(response)
+
     def test_with_list_field_url(self):
         query = urlencode(self.query_params.items() + [
             ('requested_fields', self.requested_fields[0]),
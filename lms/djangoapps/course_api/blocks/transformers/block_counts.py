@@ -1,6 +1,8 @@
 """
 Block Counts Transformer
 """
+from collections import Counter
+
 from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
 
 
@@ -8,9 +10,10 @@ class BlockCountsTransformer(BlockStructureTransformer):
     """
     Keep a count of descendant blocks of the requested types
     """
-    WRITE_VERSION = 1
-    READ_VERSION = 1
+    WRITE_VERSION = 3
+    READ_VERSION = 3
     BLOCK_COUNTS = 'block_counts'
+    COLLECTED_BLOCK_COUNTS = 'collected_block_counts'
 
     def __init__(self, block_types_to_count):
         self.block_types_to_count = block_types_to_count
@@ -28,6 +31,21 @@ class BlockCountsTransformer(BlockStructureTransformer):
         # collect basic xblock fields
         block_structure.request_xblock_fields('category')
 
+        # Count the blocks of each type within the subtree of each block,
+        # along with the keys of its children, so that counts only need to
+        # be recomputed for blocks whose subtree is changed by transforms.
+        # The counts are stored as transformer data, rather than block
+        # fields, since all the block fields of this transformer are
+        # returned as the block counts.
+        collected_block_counts = {}
+        for block_key in block_structure.post_order_traversal():
+            children = block_structure.get_children(block_key)
+            block_counts = Counter({block_key.block_type: 1})
+            for child_key in children:
+                block_counts.update(collected_block_counts[child_key][1])
+            collected_block_counts[block_key] = (frozenset(children), dict(block_counts))
+        block_structure.set_transformer_data(cls, cls.COLLECTED_BLOCK_COUNTS, collected_block_counts)
+
     def transform(self, usage_info, block_structure):
         """
         Mutates block_structure based on the given usage_info.
@@ -35,11 +53,32 @@ class BlockCountsTransformer(BlockStructureTransformer):
         if not self.block_types_to_count:
             return
 
+        collected_block_counts = block_structure.get_transformer_data(self, self.COLLECTED_BLOCK_COUNTS, {})
+
+        # A block's subtree is unchanged if it has exactly its collected
+        # children, and their subtrees are unchanged. The keys of the
+        # children are compared, since transforms that remove blocks while
+        # keeping their descendants (e.g. split tests) can replace a child
+        # without changing the number of children.
+        unchanged_block_keys = set()
         for block_key in block_structure.post_order_traversal():
+            children = block_structure.get_children(block_key)
+            collected_children, block_counts = collected_block_counts.get(block_key, (None, None))
+            if (
+                    collected_children == frozenset(children) and
+                    all(child_key in unchanged_block_keys for child_key in children)
+            ):
+                unchanged_block_keys.add(block_key)
+                for block_type in self.block_types_to_count:
+                    block_structure.set_transformer_block_field(
+                        block_key, self, block_type, block_counts.get(block_type, 0),
+                    )
+                continue
+
             for block_type in self.block_types_to_count:
                 descendants_type_count = sum([
                     block_structure.get_transformer_block_field(child_key, self, block_type, 0)
-                    for child_key in block_structure.get_children(block_key)
+                    for child_key in children
                 ])
                 block_structure.set_transformer_block_field(
                     block_key,
@@ -23,8 +23,8 @@ class BlocksAPITransformer(BlockStructureTransformer):
     Note: BlockDepthTransformer must be executed before BlockNavigationTransformer.
     """
 
-    WRITE_VERSION = 1
-    READ_VERSION = 1
+    WRITE_VERSION = 4
+    READ_VERSION = 4
     STUDENT_VIEW_DATA = 'student_view_data'
     STUDENT_VIEW_MULTI_DEVICE = 'student_view_multi_device'
 
@@ -100,12 +100,11 @@ class MilestonesAndSpecialExamsTransformer(BlockStructureTransformer):
         Test whether the current user has any unfulfilled milestones preventing
         them from accessing this block.
         """
-        return bool(milestones_helpers.get_course_content_milestones(
+        return unicode(block_key) in milestones_helpers.get_course_content_ids_with_milestones(
             unicode(block_key.course_key),
-            unicode(block_key),
             'requires',
             usage_info.user.id
-        ))
+        )
 
     # TODO: As part of a cleanup effort, this transformer should be split into
     # MilestonesTransformer and SpecialExamsTransformer, which are completely independent.
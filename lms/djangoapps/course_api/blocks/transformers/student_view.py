@@ -1,16 +1,35 @@
 """
 Student View Transformer
 """
+import json
+from hashlib import sha1
+
+from django.core.cache import cache
+
+from openedx.core.djangoapps.content.block_structure import config
 from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.exceptions import ItemNotFoundError
+
+# The largest student_view_data, serialized to JSON, stored in the cache: a
+# bit under memcached's default item size limit of 1MB, leaving room for the
+# overhead of pickling it.
+STUDENT_VIEW_DATA_MAX_CACHED_SIZE = 900 * 1024
 
 
 class StudentViewTransformer(BlockStructureTransformer):
     """
     Only show information that is appropriate for a learner
+
+    The student_view_data of blocks is not stored in the collected block
+    structure, but in a separate cache, under a key that is addressed by
+    the block and the content of its student_view_data. Only the key is
+    collected, and the data is loaded for the block types requested.
     """
-    WRITE_VERSION = 1
-    READ_VERSION = 1
+    WRITE_VERSION = 2
+    READ_VERSION = 2
     STUDENT_VIEW_DATA = 'student_view_data'
+    STUDENT_VIEW_DATA_CACHE_KEY = 'student_view_data_cache_key'
     STUDENT_VIEW_MULTI_DEVICE = 'student_view_multi_device'
 
     def __init__(self, requested_student_view_data=None):
@@ -61,17 +80,97 @@ class StudentViewTransformer(BlockStructureTransformer):
             )
             if getattr(block, 'student_view_data', None):
                 student_view_data = block.student_view_data()
-                block_structure.set_transformer_block_field(
-                    block_key,
-                    cls,
-                    cls.STUDENT_VIEW_DATA,
-                    student_view_data,
-                )
+                cache_key = _student_view_data_cache_key(block_key, student_view_data)
+                if cache_key is not None:
+                    cache.set(cache_key, student_view_data, config.cache_timeout_in_seconds())
+                    block_structure.set_transformer_block_field(
+                        block_key,
+                        cls,
+                        cls.STUDENT_VIEW_DATA_CACHE_KEY,
+                        cache_key,
+                    )
+                else:
+                    # The data cannot be addressed by its content, or is too
+                    # large to be cached, so it is collected along with the
+                    # block structure.
+                    block_structure.set_transformer_block_field(
+                        block_key,
+                        cls,
+                        cls.STUDENT_VIEW_DATA,
+                        student_view_data,
+                    )
 
     def transform(self, usage_info, block_structure):
         """
         Mutates block_structure based on the given usage_info.
         """
+        cache_keys = {}
         for block_key in block_structure.post_order_traversal():
             if block_structure.get_xblock_field(block_key, 'category') not in self.requested_student_view_data:
                 block_structure.remove_transformer_block_field(block_key, self, self.STUDENT_VIEW_DATA)
+            else:
+                cache_key = block_structure.get_transformer_block_field(
+                    block_key, self, self.STUDENT_VIEW_DATA_CACHE_KEY,
+                )
+                if cache_key is not None:
+                    cache_keys[block_key] = cache_key
+            block_structure.remove_transformer_block_field(block_key, self, self.STUDENT_VIEW_DATA_CACHE_KEY)
+
+        if cache_keys:
+            self._load_student_view_data(block_structure, cache_keys)
+
+    def _load_student_view_data(self, block_structure, cache_keys):
+        """
+        Sets the student_view_data of the blocks with the given cache keys
+        from the cache, computing it again from the modulestore for the
+        blocks whose data is no longer cached.
+
+        Arguments:
+            block_structure (BlockStructureBlockData)
+            cache_keys (dict[UsageKey: string])
+        """
+        cached_student_view_data = cache.get_many(cache_keys.values())
+        for block_key, cache_key in cache_keys.iteritems():
+            if cache_key in cached_student_view_data:
+                block_structure.set_transformer_block_field(
+                    block_key, self, self.STUDENT_VIEW_DATA, cached_student_view_data[cache_key],
+                )
+
+        uncached_block_keys = [
+            block_key for block_key, cache_key in cache_keys.iteritems()
+            if cache_key not in cached_student_view_data
+        ]
+        if not uncached_block_keys:
+            return
+
+        store = modulestore()
+        with store.bulk_operations(block_structure.root_block_usage_key.course_key):
+            for block_key in uncached_block_keys:
+                try:
+                    student_view_data = store.get_item(block_key).student_view_data()
+                except ItemNotFoundError:
+                    continue
+                # The data may have changed since it was collected, so it
+                # is only cached again under the key of its own content.
+                cache_key = cache_keys[block_key]
+                if _student_view_data_cache_key(block_key, student_view_data) == cache_key:
+                    cache.set(cache_key, student_view_data, config.cache_timeout_in_seconds())
+                block_structure.set_transformer_block_field(
+                    block_key, self, self.STUDENT_VIEW_DATA, student_view_data,
+                )
+
+
+def _student_view_data_cache_key(block_key, student_view_data):
+    """
+    Returns the cache key of the given student_view_data of the given
+    block, which changes whenever the data does, or None if the data is
+    not serializable to JSON or too large to be cached.
+    """
+    try:
+        serialized_data = json.dumps(student_view_data, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    if len(serialized_data) > STUDENT_VIEW_DATA_MAX_CACHED_SIZE:
+        return None
+    content_hash = sha1(u'{}:{}'.format(unicode(block_key), serialized_data).encode('utf-8')).hexdigest()
+    return u'course_api.student_view_data.{}'.format(content_hash)
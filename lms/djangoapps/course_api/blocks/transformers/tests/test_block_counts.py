@@ -6,6 +6,7 @@ Tests for BlockCountsTransformer.
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import SampleCourseFactory
+from xmodule.modulestore.tests.sample_courses import BlockInfo
 
 from ..block_counts import BlockCountsTransformer
 
@@ -48,3 +49,82 @@ class TestBlockCountsTransformer(ModuleStoreTestCase):
         for block_type in ['course', 'html', 'video']:
             self.assertFalse(hasattr(block_counts_for_course, block_type))
             self.assertFalse(hasattr(block_counts_for_chapter_x, block_type))
+
+    def test_transform_with_removed_blocks(self):
+        # collect phase
+        BlockCountsTransformer.collect(self.block_structure)
+        self.block_structure._collect_requested_xblock_fields()
+
+        # remove a problem, as a filtering transformer would
+        self.block_structure.remove_block(
+            self.course_key.make_usage_key('problem', 'problem_x1a_1'), keep_descendants=False,
+        )
+
+        # transform phase
+        BlockCountsTransformer(['problem', 'chapter']).transform(usage_info=None, block_structure=self.block_structure)
+
+        # verify the counts of the removed problem's ancestors are corrected
+        chapter_x_key = self.course_key.make_usage_key('chapter', 'chapter_x')
+        chapter_y_key = self.course_key.make_usage_key('chapter', 'chapter_y')
+        for block_key, expected_problem_count in (
+                (self.course_usage_key, 5),
+                (chapter_x_key, 2),
+                (chapter_y_key, 3),
+        ):
+            self.assertEquals(
+                self.block_structure.get_transformer_block_field(block_key, BlockCountsTransformer, 'problem'),
+                expected_problem_count,
+            )
+        self.assertEquals(
+            self.block_structure.get_transformer_block_field(
+                self.course_usage_key, BlockCountsTransformer, 'chapter',
+            ),
+            2,
+        )
+
+    def test_transform_with_removed_split_test(self):
+        course_key = SampleCourseFactory.create(
+            block_info_tree=[
+                BlockInfo('chapter', 'chapter', {}, [
+                    BlockInfo('sequential', 'sequential', {}, [
+                        BlockInfo('vertical', 'vertical', {}, [
+                            BlockInfo('split_test', 'split_test', {}, [
+                                BlockInfo('group_0', 'vertical', {}, [
+                                    BlockInfo('problem_0_1', 'problem', {}, []),
+                                    BlockInfo('problem_0_2', 'problem', {}, []),
+                                ]),
+                                BlockInfo('group_1', 'vertical', {}, [
+                                    BlockInfo('problem_1_1', 'problem', {}, []),
+                                ]),
+                            ]),
+                        ]),
+                    ]),
+                ]),
+            ],
+        ).id
+        course_usage_key = self.store.make_course_usage_key(course_key)
+        block_structure = BlockStructureFactory.create_from_modulestore(course_usage_key, self.store)
+
+        # collect phase
+        BlockCountsTransformer.collect(block_structure)
+        block_structure._collect_requested_xblock_fields()
+
+        # remove the split test and the group the user is not in, as the
+        # split test transformer would, so that the vertical has as many
+        # children as collected, but not the same ones
+        block_structure.remove_block(course_key.make_usage_key('vertical', 'group_1'), keep_descendants=False)
+        block_structure.remove_block(course_key.make_usage_key('split_test', 'split_test'), keep_descendants=True)
+
+        # transform phase
+        BlockCountsTransformer(['problem']).transform(usage_info=None, block_structure=block_structure)
+
+        # verify only the problems of the user's group are counted
+        for block_key in (
+                course_usage_key,
+                course_key.make_usage_key('vertical', 'vertical'),
+                course_key.make_usage_key('vertical', 'group_0'),
+        ):
+            self.assertEquals(
+                block_structure.get_transformer_block_field(block_key, BlockCountsTransformer, 'problem'),
+                2,
+            )
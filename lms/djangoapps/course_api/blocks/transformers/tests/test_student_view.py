@@ -4,6 +4,9 @@ Tests for StudentViewTransformer.
 
 # pylint: disable=protected-access
 
+from django.core.cache import cache
+from mock import patch
+
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import ToyCourseFactory
@@ -54,3 +57,95 @@ class TestStudentViewTransformer(ModuleStoreTestCase):
                 html_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_MULTI_DEVICE,
             )
         )
+
+    def test_student_view_data_not_collected(self):
+        StudentViewTransformer.collect(self.block_structure)
+        self.block_structure._collect_requested_xblock_fields()
+
+        # only the cache key of the video data is collected
+        video_block_key = self.course_key.make_usage_key('video', 'sample_video')
+        self.assertIsNone(
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA,
+            )
+        )
+        cache_key = self.block_structure.get_transformer_block_field(
+            video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA_CACHE_KEY,
+        )
+        self.assertIsNotNone(cache.get(cache_key))
+
+        # the video data is computed again once evicted from the cache
+        cache.delete(cache_key)
+        StudentViewTransformer(['video']).transform(usage_info=None, block_structure=self.block_structure)
+        self.assertEquals(
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA,
+            ),
+            cache.get(cache_key),
+        )
+        self.assertIsNone(
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA_CACHE_KEY,
+            )
+        )
+
+    def test_student_view_data_not_requested(self):
+        StudentViewTransformer.collect(self.block_structure)
+        self.block_structure._collect_requested_xblock_fields()
+        video_block_key = self.course_key.make_usage_key('video', 'sample_video')
+        cache.delete(
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA_CACHE_KEY,
+            )
+        )
+
+        # the video data is not computed when it is not requested
+        with patch('lms.djangoapps.course_api.blocks.transformers.student_view.modulestore') as mock_modulestore:
+            StudentViewTransformer(['html']).transform(usage_info=None, block_structure=self.block_structure)
+        self.assertFalse(mock_modulestore.called)
+        self.assertIsNone(
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA,
+            )
+        )
+
+    @patch('lms.djangoapps.course_api.blocks.transformers.student_view.STUDENT_VIEW_DATA_MAX_CACHED_SIZE', 0)
+    def test_large_student_view_data_collected(self):
+        StudentViewTransformer.collect(self.block_structure)
+        self.block_structure._collect_requested_xblock_fields()
+
+        # data too large for the cache is collected along with the block structure
+        video_block_key = self.course_key.make_usage_key('video', 'sample_video')
+        self.assertIsNone(
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA_CACHE_KEY,
+            )
+        )
+        StudentViewTransformer(['video']).transform(usage_info=None, block_structure=self.block_structure)
+        self.assertIsNotNone(
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA,
+            )
+        )
+
+    def test_uncached_student_view_data_loaded_in_bulk(self):
+        StudentViewTransformer.collect(self.block_structure)
+        self.block_structure._collect_requested_xblock_fields()
+        video_block_key = self.course_key.make_usage_key('video', 'sample_video')
+        cache.delete(
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA_CACHE_KEY,
+            )
+        )
+
+        with patch.object(self.store, 'bulk_operations', wraps=self.store.bulk_operations) as mock_bulk_operations:
+            with patch(
+                'lms.djangoapps.course_api.blocks.transformers.student_view.modulestore', return_value=self.store
+            ):
+                StudentViewTransformer(['video']).transform(usage_info=None, block_structure=self.block_structure)
+        mock_bulk_operations.assert_called_once_with(self.course_key)
+        self.assertIsNotNone(
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA,
+            )
+        )
@@ -2,7 +2,7 @@
 CourseBlocks API views
 """
 from django.core.exceptions import ValidationError
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 from rest_framework.generics import ListAPIView
@@ -13,6 +13,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
 from .api import get_blocks
+from .config import STREAM_BLOCKS_RESPONSES, waffle
 from .forms import BlockListGetForm
 
 
@@ -194,24 +195,31 @@ class BlocksView(DeveloperErrorViewMixin, ListAPIView):
         if not params.is_valid():
             raise ValidationError(params.errors)
 
+        # Stream JSON responses, rather than rendering them at once, so
+        # the serialized blocks of large courses are not held in memory.
+        stream = waffle().is_enabled(STREAM_BLOCKS_RESPONSES) and request.accepted_renderer.format == 'json'
+
         try:
-            return Response(
-                get_blocks(
-                    request,
-                    params.cleaned_data['usage_key'],
-                    params.cleaned_data['user'],
-                    params.cleaned_data['depth'],
-                    params.cleaned_data.get('nav_depth'),
-                    params.cleaned_data['requested_fields'],
-                    params.cleaned_data.get('block_counts', []),
-                    params.cleaned_data.get('student_view_data', []),
-                    params.cleaned_data['return_type'],
-                    params.cleaned_data.get('block_types_filter', None),
-                )
+            blocks = get_blocks(
+                request,
+                params.cleaned_data['usage_key'],
+                params.cleaned_data['user'],
+                params.cleaned_data['depth'],
+                params.cleaned_data.get('nav_depth'),
+                params.cleaned_data['requested_fields'],
+                params.cleaned_data.get('block_counts', []),
+                params.cleaned_data.get('student_view_data', []),
+                params.cleaned_data['return_type'],
+                params.cleaned_data.get('block_types_filter', None),
+                stream=stream,
             )
         except ItemNotFoundError as exception:
             raise Http404("Block not found: {}".format(exception.message))
 
+        if stream:
+            return StreamingHttpResponse(blocks, content_type='application/json')
+        return Response(blocks)
+
 
 @view_auth_classes()
 class BlocksInCourseView(BlocksView):
@@ -2,9 +2,11 @@
 API entry point to the course_blocks app with top-level
 get_course_blocks function.
 """
+from openedx.core.djangoapps.content.block_structure import config
 from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 
+from .shared import get_shared_course_blocks
 from .transformers import library_content, start_date, user_partitions, visibility
 from .usage_info import CourseUsageInfo
 
@@ -52,9 +54,20 @@ def get_course_blocks(
             associated with the block structure.  If using the default
             transformers, the transformed block structure will be
             exactly equivalent to the blocks that the given user has
-            access.
+            access.  If using the default transformers while the
+            block_structure.share_transformed_structures switch is
+            enabled, the block structure may be shared with other users,
+            and must not be modified (see shared.py).
     """
     if not transformers:
+        if config.waffle().is_enabled(config.SHARE_TRANSFORMED_STRUCTURES):
+            if not collected_block_structure:
+                collected_block_structure = get_block_structure_manager(
+                    starting_block_usage_key.course_key
+                ).get_collected()
+            block_structure = get_shared_course_blocks(user, starting_block_usage_key, collected_block_structure)
+            if block_structure is not None:
+                return block_structure
         transformers = BlockStructureTransformers(COURSE_BLOCK_ACCESS_TRANSFORMERS)
     transformers.usage_info = CourseUsageInfo(starting_block_usage_key.course_key, user)
 
@@ -0,0 +1,215 @@
+"""
+Sharing of the course block structures transformed by the default access
+transformers (COURSE_BLOCK_ACCESS_TRANSFORMERS) across users.
+
+Most learners are in the same user partition groups, and have the same
+access to the blocks of a course, so their transformed structures are the
+same. A transformed structure is shared by all the users with the same
+signature:
+    - whether they have staff access to the course,
+    - the group they are in for each of the course's user partitions,
+    - unless they have staff access, which of the distinct start dates of
+      the course's blocks have passed.
+
+Users for whom start dates are adjusted or disabled (beta testers, preview
+mode, DISABLE_START_DATES) do not share structures. The selection of blocks
+of the ContentLibraryTransformer is personal, so it is applied to a copy of
+the shared structure, as an overlay.
+
+Shared structures are kept in a process-level cache, for each version of a
+course, and must not be modified.
+"""
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime
+
+import dogstats_wrapper as dog_stats_api
+from django.conf import settings
+from pytz import utc
+
+from lms.djangoapps.courseware.access_utils import in_preview_mode
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
+from student.roles import CourseBetaTesterRole
+
+from .transformers import library_content, start_date, user_partitions, visibility
+from .usage_info import CourseUsageInfo
+
+# Transformers whose results are shared by all users with the same signature.
+SHARED_TRANSFORMERS = [
+    start_date.StartDateTransformer(),
+    user_partitions.UserPartitionTransformer(),
+    visibility.VisibilityTransformer(),
+]
+
+# Maximum number of course versions kept in the process-level cache.
+SHARED_STRUCTURES_CACHE_SIZE = 8
+
+# Maximum number of shared structures kept per course version.
+SHARED_STRUCTURES_PER_COURSE = 32
+
+SHARED_STRUCTURES_PROCESS_CACHE = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_shared_course_blocks(user, starting_block_usage_key, collected_block_structure):
+    """
+    Returns the block structure transformed by COURSE_BLOCK_ACCESS_TRANSFORMERS
+    for the given user, starting at starting_block_usage_key, sharing the
+    structure transformed by SHARED_TRANSFORMERS with the other users with the
+    same signature. Returns None if the user's structure cannot be shared.
+    See get_course_blocks for the arguments.
+
+    Unless the course has content libraries, the returned structure is shared,
+    and must not be modified.
+    """
+    usage_info = CourseUsageInfo(starting_block_usage_key.course_key, user)
+    course_structures = _get_course_structures(collected_block_structure)
+    signature = course_structures and course_structures.signature(usage_info)
+    if signature is None:
+        _increment_shared_structure_metric('unshareable')
+        return None
+
+    key = (starting_block_usage_key, signature)
+    block_structure = course_structures.get(key)
+    if block_structure is None:
+        _increment_shared_structure_metric('miss')
+        block_structure = get_block_structure_manager(usage_info.course_key).get_transformed(
+            BlockStructureTransformers(SHARED_TRANSFORMERS, usage_info),
+            starting_block_usage_key,
+            collected_block_structure,
+        )
+        course_structures.add(key, block_structure)
+    else:
+        _increment_shared_structure_metric('hit')
+
+    if course_structures.has_library_content:
+        block_structure = _apply_library_content(usage_info, collected_block_structure, block_structure)
+    return block_structure
+
+
+def clear_shared_course_blocks():
+    """
+    Clears the process-level cache of shared structures.
+    """
+    with _cache_lock:
+        SHARED_STRUCTURES_PROCESS_CACHE.clear()
+
+
+class _SharedCourseStructures(object):
+    """
+    The shared structures of a version of a course, along with the data of
+    the course's collected structure needed to compute user signatures.
+    """
+    def __init__(self, collected_block_structure):
+        self.structures = OrderedDict()
+        self.user_partitions = collected_block_structure.get_transformer_data(
+            user_partitions.UserPartitionTransformer, 'user_partitions', [],
+        )
+
+        start_dates = set()
+        self.has_beta_start_dates = False
+        self.has_library_content = False
+        for block_key in collected_block_structure:
+            start = start_date.StartDateTransformer._get_merged_start_date(  # pylint: disable=protected-access
+                collected_block_structure, block_key,
+            )
+            if start:
+                start_dates.add(start)
+            if collected_block_structure.get_xblock_field(block_key, 'days_early_for_beta') is not None:
+                self.has_beta_start_dates = True
+            if block_key.block_type == 'library_content':
+                self.has_library_content = True
+        self.start_dates = sorted(start_dates)
+
+    def signature(self, usage_info):
+        """
+        Returns the signature of the user of the given usage_info, or None
+        if the user's transformed structure cannot be shared.
+        """
+        if in_preview_mode() or settings.FEATURES['DISABLE_START_DATES']:
+            return None
+
+        groups = tuple(sorted(
+            (partition_id, group.id)
+            for partition_id, group in user_partitions._get_user_partition_groups(  # pylint: disable=protected-access
+                usage_info.course_key, self.user_partitions, usage_info.user,
+            ).iteritems()
+        ))
+        if usage_info.has_staff_access:
+            return (True, groups)
+
+        if self.has_beta_start_dates and CourseBetaTesterRole(usage_info.course_key).has_user(usage_info.user):
+            return None
+        # Blocks are accessible once their start date has passed, so users
+        # have access to the same blocks if the same start dates have passed.
+        passed_start_dates = bisect_left(self.start_dates, datetime.now(utc))
+        return (False, groups, passed_start_dates)
+
+    def get(self, key):
+        """
+        Returns the shared structure with the given key, or None.
+        """
+        with _cache_lock:
+            return self.structures.get(key)
+
+    def add(self, key, block_structure):
+        """
+        Shares the given structure under the given key.
+        """
+        with _cache_lock:
+            self.structures[key] = block_structure
+            while len(self.structures) > SHARED_STRUCTURES_PER_COURSE:
+                self.structures.popitem(last=False)
+
+
+def _get_course_structures(collected_block_structure):
+    """
+    Returns the _SharedCourseStructures of the version of the course of the
+    given collected structure, or None if the version is unknown.
+    """
+    root_block_usage_key = collected_block_structure.root_block_usage_key
+    course_version = collected_block_structure.get_xblock_field(root_block_usage_key, 'course_version')
+    edited_on = collected_block_structure.get_xblock_field(root_block_usage_key, 'subtree_edited_on')
+    if course_version is None and edited_on is None:
+        return None
+
+    version_key = (root_block_usage_key, course_version, edited_on)
+    with _cache_lock:
+        course_structures = SHARED_STRUCTURES_PROCESS_CACHE.pop(version_key, None)
+        if course_structures is not None:
+            SHARED_STRUCTURES_PROCESS_CACHE[version_key] = course_structures
+            return course_structures
+
+    course_structures = _SharedCourseStructures(collected_block_structure)
+    with _cache_lock:
+        course_structures = SHARED_STRUCTURES_PROCESS_CACHE.setdefault(version_key, course_structures)
+        while len(SHARED_STRUCTURES_PROCESS_CACHE) > SHARED_STRUCTURES_CACHE_SIZE:
+            SHARED_STRUCTURES_PROCESS_CACHE.popitem(last=False)
+    return course_structures
+
+
+def _apply_library_content(usage_info, collected_block_structure, shared_block_structure):
+    """
+    Returns a copy of the given shared structure, without the blocks of
+    content libraries not selected for the user of the given usage_info.
+
+    The selection is made from the blocks of the collected structure, as
+    the ContentLibraryTransformer would when transforming it.
+    """
+    removal_condition = library_content.ContentLibraryTransformer().get_removal_condition(
+        usage_info, collected_block_structure,
+    )
+    block_structure = shared_block_structure.copy()
+    block_structure.remove_block_traversal(removal_condition)
+    block_structure._prune_unreachable()  # pylint: disable=protected-access
+    return block_structure
+
+
+def _increment_shared_structure_metric(outcome):
+    """
+    Increments the metric of the outcomes of getting shared structures, of
+    which the hit rate is the ratio of 'hit' to 'hit' and 'miss'.
+    """
+    dog_stats_api.increment(u'course_blocks.shared_structure', tags=[u'outcome:{}'.format(outcome)])
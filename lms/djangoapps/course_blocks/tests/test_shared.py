@@ -0,0 +1,85 @@
+"""
+Tests for sharing transformed course block structures across users.
+"""
+from datetime import timedelta
+
+from django.utils.timezone import now
+from mock import call, patch
+from nose.plugins.attrib import attr
+
+from courseware.tests.factories import BetaTesterFactory
+from lms.djangoapps.course_blocks.api import get_course_blocks
+from lms.djangoapps.course_blocks.shared import clear_shared_course_blocks
+from openedx.core.djangoapps.content.block_structure import config
+from student.tests.factories import UserFactory
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+
+@attr(shard=3)
+class SharedCourseBlocksTestCase(ModuleStoreTestCase):
+    """
+    Tests get_course_blocks with the shared structures switch enabled.
+    """
+    def setUp(self):
+        super(SharedCourseBlocksTestCase, self).setUp()
+        with self.store.default_store(ModuleStoreEnum.Type.split):
+            self.course = CourseFactory.create(days_early_for_beta=60)
+            self.released = ItemFactory.create(
+                parent=self.course, category='chapter', start=now() - timedelta(days=30),
+            )
+            self.future = ItemFactory.create(
+                parent=self.course, category='chapter', start=now() + timedelta(days=30),
+            )
+            self.staff_only = ItemFactory.create(
+                parent=self.course, category='chapter', visible_to_staff_only=True,
+            )
+        self.learners = [UserFactory.create() for __ in range(2)]
+        self.staff = UserFactory.create(is_staff=True)
+        self.addCleanup(clear_shared_course_blocks)
+
+    def _get_course_blocks(self, user, shared=True):
+        """
+        Returns the course blocks of the given user, with or without sharing.
+        """
+        with config.waffle().override(config.SHARE_TRANSFORMED_STRUCTURES, active=shared):
+            return get_course_blocks(user, self.course.location)
+
+    def test_shared_by_learners(self):
+        with patch('lms.djangoapps.course_blocks.shared.dog_stats_api') as mock_dog_stats_api:
+            blocks = [self._get_course_blocks(learner) for learner in self.learners]
+        self.assertIs(blocks[0], blocks[1])
+        self.assertEqual(
+            mock_dog_stats_api.increment.call_args_list,
+            [
+                call(u'course_blocks.shared_structure', tags=[u'outcome:miss']),
+                call(u'course_blocks.shared_structure', tags=[u'outcome:hit']),
+            ],
+        )
+        self.assertEqual(
+            set(blocks[0].get_block_keys()),
+            set(self._get_course_blocks(self.learners[0], shared=False).get_block_keys()),
+        )
+        self.assertIn(self.released.location, blocks[0])
+        self.assertNotIn(self.future.location, blocks[0])
+        self.assertNotIn(self.staff_only.location, blocks[0])
+
+    def test_not_shared_with_staff(self):
+        learner_blocks = self._get_course_blocks(self.learners[0])
+        staff_blocks = self._get_course_blocks(self.staff)
+        self.assertIsNot(staff_blocks, learner_blocks)
+        self.assertEqual(
+            set(staff_blocks.get_block_keys()),
+            set(self._get_course_blocks(self.staff, shared=False).get_block_keys()),
+        )
+        self.assertIn(self.future.location, staff_blocks)
+        self.assertIn(self.staff_only.location, staff_blocks)
+
+    def test_not_shared_with_beta_testers(self):
+        beta_tester = BetaTesterFactory(course_key=self.course.id)
+        learner_blocks = self._get_course_blocks(self.learners[0])
+        beta_tester_blocks = self._get_course_blocks(beta_tester)
+        self.assertIsNot(beta_tester_blocks, learner_blocks)
+        self.assertIsNot(self._get_course_blocks(beta_tester), beta_tester_blocks)
+        self.assertIn(self.future.location, beta_tester_blocks)
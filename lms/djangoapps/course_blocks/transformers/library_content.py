@@ -68,6 +68,15 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
                 block_structure.set_transformer_block_field(child_key, cls, 'block_analytics_summary', summary)
 
     def transform_block_filters(self, usage_info, block_structure):
+        return [block_structure.create_removal_filter(self.get_removal_condition(usage_info, block_structure))]
+
+    def get_removal_condition(self, usage_info, block_structure):
+        """
+        Returns a function of a block's usage key returning whether the
+        block should be removed, since it is part of a library_content
+        block of the given block structure, but was not selected for the
+        user. The user's selection is updated as needed.
+        """
         all_library_children = set()
         all_selected_children = set()
         for block_key in block_structure:
@@ -131,7 +140,7 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
                 return False
             return True
 
-        return [block_structure.create_removal_filter(check_child_removal)]
+        return check_child_removal
 
     def _publish_events(self, block_structure, location, previous_count, max_count, block_keys, user_id):
         """
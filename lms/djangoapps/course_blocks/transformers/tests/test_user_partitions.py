@@ -17,7 +17,12 @@ from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.partitions.partitions import Group, UserPartition
 
 from ...api import get_course_blocks
-from ..user_partitions import UserPartitionTransformer, _MergedGroupAccess
+from ..user_partitions import (
+    UserPartitionTransformer,
+    _MergedGroupAccess,
+    _check_group_access_masks,
+    _get_user_groups_mask
+)
 from .helpers import CourseStructureTestCase, update_block
 
 
@@ -446,6 +451,24 @@ class MergedGroupAccessTestData(UserPartitionTestMixin, CourseStructureTestCase)
             expected_access,
         )
 
+        # the bitmasks of the merged group access must grant the same access
+        group_bits = {}
+        group_access_masks = merged_group_access.get_group_access_masks(group_bits)
+        self.assertEquals(
+            _check_group_access_masks(_get_user_groups_mask(user_partition_groups, group_bits), group_access_masks),
+            expected_access,
+        )
+
+    def test_group_access_masks(self):
+        block = self.course
+        block.group_access = {1: [1, 2], 2: [3], 3: []}
+        update_block(self.course)
+
+        group_bits = {(2, 3): 0b1}
+        merged_group_access = _MergedGroupAccess(self.user_partitions, block, [])
+        self.assertEquals(merged_group_access.get_group_access_masks(group_bits), (0b110, 0b1))
+        self.assertEquals(group_bits, {(2, 3): 0b1, (1, 1): 0b10, (1, 2): 0b100})
+
     @ddt.data(
         ([None], None),
         ([{1}, None], {1}),
@@ -20,8 +20,8 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
 
     Staff users are *not* exempted from user partition pathways.
     """
-    WRITE_VERSION = 1
-    READ_VERSION = 1
+    WRITE_VERSION = 2
+    READ_VERSION = 2
 
     @classmethod
     def name(cls):
@@ -59,15 +59,22 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
         # topological sort, we know a block's parents are guaranteed to
         # already have merged group access computed before the block
         # itself.
+        #
+        # Only the bitmasks of the merged group access are stored, so
+        # the merged group access of each block is kept here until all
+        # of its children have been computed.
+        merged_group_accesses = {}
+        group_bits = {}
         for block_key in block_structure.topological_traversal():
             xblock = block_structure.get_xblock(block_key)
             parent_keys = block_structure.get_parents(block_key)
-            merged_parent_access_list = [
-                block_structure.get_transformer_block_field(parent_key, cls, 'merged_group_access')
-                for parent_key in parent_keys
-            ]
+            merged_parent_access_list = [merged_group_accesses[parent_key] for parent_key in parent_keys]
             merged_group_access = _MergedGroupAccess(user_partitions, xblock, merged_parent_access_list)
-            block_structure.set_transformer_block_field(block_key, cls, 'merged_group_access', merged_group_access)
+            merged_group_accesses[block_key] = merged_group_access
+            block_structure.set_transformer_block_field(
+                block_key, cls, 'group_access_masks', merged_group_access.get_group_access_masks(group_bits)
+            )
+        block_structure.set_transformer_data(cls, 'group_bits', group_bits)
 
     def transform_block_filters(self, usage_info, block_structure):
         result_list = SplitTestTransformer().transform_block_filters(usage_info, block_structure)
@@ -79,10 +86,14 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
         user_groups = _get_user_partition_groups(
             usage_info.course_key, user_partitions, usage_info.user
         )
+        user_groups_mask = _get_user_groups_mask(
+            user_groups, block_structure.get_transformer_data(self, 'group_bits', {})
+        )
         group_access_filter = block_structure.create_removal_filter(
-            lambda block_key: not block_structure.get_transformer_block_field(
-                block_key, self, 'merged_group_access'
-            ).check_group_access(user_groups)
+            lambda block_key: not _check_group_access_masks(
+                user_groups_mask,
+                block_structure.get_transformer_block_field(block_key, self, 'group_access_masks', ()),
+            )
         )
 
         result_list.append(group_access_filter)
@@ -124,6 +135,11 @@ class _MergedGroupAccess(object):
 
     Note that a user must have access to all partitions in group_access
     or _access in order to access a block.
+
+    For the block structure, the restrictions are stored as bitmasks
+    (see get_group_access_masks), with a bit for each (partition, group)
+    pair, so that checking a user's access does not require any set
+    operations.
     """
     def __init__(self, user_partitions, xblock, merged_parent_access_list):
         """
@@ -236,6 +252,64 @@ class _MergedGroupAccess(object):
         # The user has access for every partition, grant access.
         return True
 
+    def get_group_access_masks(self, group_bits):
+        """
+        Returns the bitmasks of the groups that can access each
+        partition restricted by this group access, assigning bits to the
+        groups that do not have one yet.
+
+        Arguments:
+            group_bits (dict[(int, int): int]): Mapping from (partition
+                ID, group ID) pairs to their bit, updated in place.
+
+        Returns:
+            tuple[int]: A bitmask for each restricted partition. A mask
+                of 0 means no group has access for that partition.
+        """
+        group_access_masks = []
+        for partition_id, allowed_group_ids in sorted(self._access.iteritems()):
+            mask = 0
+            for group_id in sorted(allowed_group_ids):
+                bit = group_bits.setdefault((partition_id, group_id), 1 << len(group_bits))
+                mask |= bit
+            group_access_masks.append(mask)
+        return tuple(group_access_masks)
+
+
+def _get_user_groups_mask(user_groups, group_bits):
+    """
+    Returns the bitmask of the groups to which a user belongs.
+
+    Arguments:
+        user_groups (dict[int: Group]): Mapping from user partition IDs
+            to the group to which the user belongs in each partition.
+        group_bits (dict[(int, int): int]): Mapping from (partition ID,
+            group ID) pairs to their bit. Groups without a bit do not
+            have access to any restricted block.
+
+    Returns:
+        int
+    """
+    user_groups_mask = 0
+    for partition_id, group in user_groups.iteritems():
+        user_groups_mask |= group_bits.get((partition_id, group.id), 0)
+    return user_groups_mask
+
+
+def _check_group_access_masks(user_groups_mask, group_access_masks):
+    """
+    Returns whether a user with the given bitmask of groups has access to
+    a block with the given bitmasks of group access.
+
+    Since the bits of each partition are distinct and a user is in at
+    most one group per partition, the user has access if they are in an
+    allowed group of every restricted partition.
+    """
+    for mask in group_access_masks:
+        if not user_groups_mask & mask:
+            return False
+    return True
+
 
 def _get_user_partition_groups(course_key, user_partitions, user):
     """
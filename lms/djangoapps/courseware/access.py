@@ -11,6 +11,8 @@ Note: The access control logic in this file does NOT check for enrollment in
   It is a wrapper around has_access that additionally checks for enrollment.
 """
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
 import pytz
@@ -61,6 +63,9 @@ from xmodule.x_module import XModule
 
 log = logging.getLogger(__name__)
 
+# The access context shared by the access checks of a batch, see batched_access_checks.
+_batch = threading.local()
+
 
 def has_ccx_coach_role(user, course_key):
     """
@@ -163,6 +168,118 @@ def has_access(user, action, obj, course_key=None):
                     .format(type(obj)))
 
 
+def has_access_many(user, action, descriptors, course_key):
+    """
+    Check whether a user has the access to do action on each of the given
+    descriptors of a course.
+
+    The user's roles, partition groups and milestones in the course are looked
+    up once for all the descriptors, rather than once per descriptor.
+
+    Returns a dict mapping the location of each descriptor to its AccessResponse.
+    """
+    if not user:
+        user = AnonymousUser()
+
+    with batched_access_checks(user, course_key):
+        return {
+            descriptor.location: has_access(user, action, descriptor, course_key)
+            for descriptor in descriptors
+        }
+
+
+@contextmanager
+def batched_access_checks(user, course_key):
+    """
+    Shares the lookups of the user's roles, partition groups and milestones in
+    the course between all checks of the user's access to descriptors of the
+    course made within, e.g. while binding the blocks of a page to the user.
+
+    The user's state in the course must not change within, since the checks
+    would not see the change.
+    """
+    previous = getattr(_batch, 'context', None)
+    if previous is not None and previous.user is user and previous.course_key == course_key:
+        yield
+        return
+
+    _batch.context = _AccessContext(user, course_key)
+    try:
+        yield
+    finally:
+        _batch.context = previous
+
+
+class _AccessContext(object):
+    """
+    The state of a user in a course that the checks of their access to the
+    course's descriptors depend on, with each part looked up at most once.
+    """
+    def __init__(self, user, course_key):
+        self.user = user
+        self.course_key = course_key
+        self._user_role = None
+        self._staff_access = None
+        self._content_ids_with_milestones = None
+        self._user_groups = {}
+
+    @classmethod
+    def get(cls, user, course_key):
+        """
+        Returns the context of the current batch of access checks if it is
+        for the given user and course, otherwise a new context.
+        """
+        context = getattr(_batch, 'context', None)
+        if context is not None and context.user is user and context.course_key == course_key:
+            return context
+        return cls(user, course_key)
+
+    def get_user_role(self):
+        """
+        Returns the user's role in the course, see get_user_role.
+        """
+        if self._user_role is None:
+            self._user_role = get_user_role(self.user, self.course_key)
+        return self._user_role
+
+    def has_staff_access(self, descriptor):
+        """
+        Returns whether the user has staff access to the course of the descriptor.
+        """
+        if self.course_key is None:
+            return _has_staff_access_to_descriptor(self.user, descriptor, self.course_key)
+        if self._staff_access is None:
+            self._staff_access = _has_staff_access_to_location(self.user, None, self.course_key)
+        return self._staff_access
+
+    def has_content_milestones(self, descriptor):
+        """
+        Returns whether the descriptor requires milestones the user hasn't fulfilled.
+        """
+        if self.user.id is None:
+            # Anonymous users haven't fulfilled any milestones.
+            return bool(milestones_helpers.get_course_content_milestones(
+                self.course_key, unicode(descriptor.location), 'requires'
+            ))
+        if self._content_ids_with_milestones is None:
+            self._content_ids_with_milestones = milestones_helpers.get_course_content_ids_with_milestones(
+                self.course_key, 'requires', self.user.id
+            )
+        return unicode(descriptor.location) in self._content_ids_with_milestones
+
+    def get_group_for_user(self, partition):
+        """
+        Returns the user's group in the given user partition.
+        """
+        if partition.id not in self._user_groups:
+            self._user_groups[partition.id] = partition.scheme.get_group_for_user(
+                self.course_key,
+                self.user,
+                partition,
+            )
+        return self._user_groups[partition.id]
+
+
 def has_staff_access_to_preview_mode(user, course_key):
     """
     Checks if given user can access course in preview mode.
@@ -413,13 +530,15 @@ def _has_access_error_desc(user, action, descriptor, course_key):
     return _dispatch(checkers, action, user, descriptor)
 
 
-def _has_group_access(descriptor, user, course_key):
+def _has_group_access(descriptor, user, course_key, context=None):
     """
     This function returns a boolean indicating whether or not `user` has
     sufficient group memberships to "load" a block (the `descriptor`)
     """
+    context = context or _AccessContext.get(user, course_key)
+
     # Allow staff and instructors roles group access, as they are not masquerading as a student.
-    if get_user_role(user, course_key) in ['staff', 'instructor']:
+    if context.get_user_role() in ['staff', 'instructor']:
         return ACCESS_GRANTED
 
     # use merged_group_access which takes group access on the block's
@@ -469,11 +588,7 @@ def _has_group_access(descriptor, user, course_key):
     # look up the user's group for each partition
     user_groups = {}
     for partition, groups in partition_groups:
-        user_groups[partition.id] = partition.scheme.get_group_for_user(
-            course_key,
-            user,
-            partition,
-        )
+        user_groups[partition.id] = context.get_group_for_user(partition)
 
     # finally: check that the user has a satisfactory group assignment
     # for each partition.
@@ -496,6 +611,8 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
     (e.g. courses).  If you call this method directly instead of going through
     has_access(), it will not do the right thing.
     """
+    context = _AccessContext.get(user, course_key)
+
     def can_load():
         """
         NOTE: This does not check that the student is enrolled in the course
@@ -507,16 +624,16 @@ def _has_access_descriptor(user, action, descriptor, course_key=None):
         # access to this content, then deny access. The problem with calling _has_staff_access_to_descriptor
         # before this method is that _has_staff_access_to_descriptor short-circuits and returns True
         # for staff users in preview mode.
-        if not _has_group_access(descriptor, user, course_key):
+        if not _has_group_access(descriptor, user, course_key, context):
             return ACCESS_DENIED
 
         # If the user has staff access, they can load the module and checks below are not needed.
-        if _has_staff_access_to_descriptor(user, descriptor, course_key):
+        if context.has_staff_access(descriptor):
             return ACCESS_GRANTED
 
         return (
             _visible_to_nonstaff_users(descriptor) and
-            _can_access_descriptor_with_milestones(user, descriptor, course_key) and
+            _can_access_descriptor_with_milestones(user, descriptor, course_key, context) and
             (
                 _has_detached_class_tag(descriptor) or
                 _can_access_descriptor_with_start_date(user, descriptor, course_key)
@@ -759,7 +876,7 @@ def _visible_to_nonstaff_users(descriptor):
     return VisibilityError() if descriptor.visible_to_staff_only else ACCESS_GRANTED
 
 
-def _can_access_descriptor_with_milestones(user, descriptor, course_key):
+def _can_access_descriptor_with_milestones(user, descriptor, course_key, context=None):
     """
     Returns if the object is blocked by an unfulfilled milestone.
 
@@ -767,8 +884,10 @@ def _can_access_descriptor_with_milestones(user, descriptor, course_key):
         user: the user trying to access this content
         descriptor: the object being accessed
         course_key: key for the course for this descriptor
+        context: the _AccessContext of the user in the course, if any
     """
-    if milestones_helpers.get_course_content_milestones(course_key, unicode(descriptor.location), 'requires', user.id):
+    context = context or _AccessContext.get(user, course_key)
+    if context.has_content_milestones(descriptor):
         debug("Deny: user has not completed all milestones for content")
         return ACCESS_DENIED
     else:
@@ -16,17 +16,24 @@ by `authored_data`, e.g. course content and settings stored in Mongo.
 """
 import threading
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
 from contextlib import contextmanager
 
 from django.conf import settings
 from xblock.field_data import FieldData
 
+from openedx.core.djangoapps import monitoring_utils
 from request_cache.middleware import RequestCache
 from xmodule.modulestore.inheritance import InheritanceMixin
 
 NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = u'courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = u'courseware.modulestore_field_overrides.enabled_providers.{course_id}'
+OVERRIDE_INDEX_CACHE_NAMESPACE = u'courseware.field_overrides.index'
+
+# Maximum number of override indexes kept for a request, so that celery tasks
+# going through many users don't keep the overrides of all of them.
+OVERRIDE_INDEX_CACHE_SIZE = 8
 
 
 def resolve_dotted(name):
@@ -48,15 +55,79 @@ def resolve_dotted(name):
     return target
 
 
-def _lineage(block):
+class _OverrideIndex(object):
+    """
+    The overrides found for one user, compiled over the course of a request.
+
+    `overrides` maps (block location, field name) to the value returned by
+    the first provider that overrides the field on that block, or NOTSET.
+    `inherited` maps (block location, field name) to the override of the
+    field on the nearest ancestor of the block, or NOTSET, so that resolving
+    inherited overrides doesn't have to walk the block's lineage again.
+
+    `lookups` counts the override lookups since the counts were last
+    reported, and `provider_lookups` those that had to ask the providers.
+    """
+    def __init__(self):
+        self.overrides = {}
+        self.inherited = {}
+        self.lookups = 0
+        self.provider_lookups = 0
+
+    def report_metrics(self):
+        """
+        Reports, and resets, the counts of override lookups.
+        """
+        if self.lookups:
+            monitoring_utils.accumulate('field_overrides.lookups', self.lookups)
+            monitoring_utils.accumulate('field_overrides.provider_lookups', self.provider_lookups)
+        self.lookups = self.provider_lookups = 0
+
+
+def _get_override_index(user, providers):
+    """
+    Returns the `_OverrideIndex` shared, for the rest of the request, by
+    every `OverrideFieldData` of the given user and override providers.
+
+    Only the OVERRIDE_INDEX_CACHE_SIZE most recently used indexes are kept.
+    """
+    indexes = RequestCache.get_request_cache(OVERRIDE_INDEX_CACHE_NAMESPACE).setdefault('indexes', OrderedDict())
+    cache_key = (getattr(user, 'id', user), tuple(type(provider) for provider in providers))
+    index = indexes.pop(cache_key, None)
+    if index is None:
+        monitoring_utils.increment('field_overrides.indexes')
+        index = _OverrideIndex()
+        while len(indexes) >= OVERRIDE_INDEX_CACHE_SIZE:
+            __, evicted_index = indexes.popitem(last=False)
+            evicted_index.report_metrics()
+    indexes[cache_key] = index
+    return index
+
+
+def clear_override_index():
+    """
+    Discards the overrides compiled during the current request. Must be
+    called whenever an override is set or cleared.
+    """
+    report_override_index_metrics()
+    RequestCache.clear_request_cache(OVERRIDE_INDEX_CACHE_NAMESPACE)
+
+
+def report_override_index_metrics():
     """
-    Returns an iterator over all ancestors of the given block, starting with
-    its immediate parent and ending at the root of the block tree.
+    Reports the counts of override lookups of the indexes of the current
+    request. See `courseware.middleware.OverrideIndexMetricsMiddleware`.
     """
-    parent = block.get_parent()
-    while parent:
-        yield parent
-        parent = parent.get_parent()
+    indexes = RequestCache.get_request_cache(OVERRIDE_INDEX_CACHE_NAMESPACE).get('indexes', {})
+    for index in indexes.itervalues():
+        index.report_metrics()
+
+
+def _block_key(block):
+    """
+    Returns the key identifying `block` in an `_OverrideIndex`.
+    """
+    return getattr(block, 'location', block)
 
 
 class _OverridesDisabled(threading.local):
@@ -142,6 +213,11 @@ class OverrideFieldData(FieldData):
     is important for this setting.  Override providers will tried in the order
     configured in the setting.  The first provider to find an override 'wins'
     for a particular field lookup.
+
+    The overrides found are compiled into an index shared by all of a user's
+    `OverrideFieldData` for the rest of the request, so that each provider is
+    asked about a given field of a given block at most once, and inherited
+    overrides are resolved once per block rather than by walking its lineage.
     """
     provider_classes = None
 
@@ -197,18 +273,50 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
+        self._index = _get_override_index(user, self.providers)
+
+    def _provider_override(self, block, name):
+        """
+        Asks each provider, in order, for an override of the field identified
+        by `name` in `block`. Returns the first override found or `NOTSET`.
+        """
+        for provider in self.providers:
+            value = provider.get(block, name, NOTSET)
+            if value is not NOTSET:
+                return value
+        return NOTSET
 
     def get_override(self, block, name):
         """
         Checks for an override for the field identified by `name` in `block`.
         Returns the overridden value or `NOTSET` if no override is found.
         """
-        if not overrides_disabled():
-            for provider in self.providers:
-                value = provider.get(block, name, NOTSET)
-                if value is not NOTSET:
-                    return value
-        return NOTSET
+        if overrides_disabled():
+            return NOTSET
+        key = (_block_key(block), name)
+        self._index.lookups += 1
+        value = self._index.overrides.get(key, NOTSET)
+        if value is NOTSET and key not in self._index.overrides:
+            self._index.provider_lookups += 1
+            value = self._index.overrides[key] = self._provider_override(block, name)
+        return value
+
+    def get_inherited_override(self, block, name):
+        """
+        Checks for an override for the field identified by `name` on the
+        nearest ancestor of `block` overriding it. Returns the overridden value
+        or `NOTSET` if no ancestor overrides the field.
+        """
+        key = (_block_key(block), name)
+        value = self._index.inherited.get(key, NOTSET)
+        if value is NOTSET and key not in self._index.inherited:
+            parent = block.get_parent()
+            if parent:
+                value = self.get_override(parent, name)
+                if value is NOTSET:
+                    value = self.get_inherited_override(parent, name)
+            self._index.inherited[key] = value
+        return value
 
     def get(self, block, name):
         value = self.get_override(block, name)
@@ -231,11 +339,9 @@ class OverrideFieldData(FieldData):
             # If this is an inheritable field and an override is set above,
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    if self.get_override(ancestor, name) is not NOTSET:
-                        return False
+            if name in InheritanceMixin.fields and not overrides_disabled():
+                if self.get_inherited_override(block, name) is not NOTSET:
+                    return False
 
         return has is not NOTSET or self.fallback.has(block, name)
 
@@ -246,12 +352,10 @@ class OverrideFieldData(FieldData):
         # The `default` method is overloaded by the field storage system to
         # also handle inheritance.
         if self.providers and not overrides_disabled():
-            inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    value = self.get_override(ancestor, name)
-                    if value is not NOTSET:
-                        return value
+            if name in InheritanceMixin.fields:
+                value = self.get_inherited_override(block, name)
+                if value is not NOTSET:
+                    return value
         return self.fallback.default(block, name)
 
 
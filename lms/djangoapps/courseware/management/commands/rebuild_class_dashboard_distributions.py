@@ -0,0 +1,53 @@
+"""
+Command to rebuild the class dashboard's grade and subsection distributions.
+"""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from xmodule.modulestore.django import modulestore
+
+from courseware.models import rebuild_distributions
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the ProblemGradeCount and SequentialOpenCount tables from StudentModule.
+
+    Example usage:
+        $ ./manage.py lms rebuild_class_dashboard_distributions --all --settings=devstack
+        $ ./manage.py lms rebuild_class_dashboard_distributions 'edX/DemoX/Demo_Course' --settings=devstack
+    """
+    args = '<course_id course_id ...>'
+    help = 'Rebuilds the class dashboard distributions of one or more courses.'
+
+    def add_arguments(self, parser):
+        """
+        Add arguments to the command parser.
+        """
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='all',
+            default=False,
+            help='Rebuild the distributions of all courses.',
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            course_keys = [course.id for course in modulestore().get_course_summaries()]
+        else:
+            if len(args) < 1:
+                raise CommandError('At least one course or --all must be specified.')
+            try:
+                course_keys = [CourseKey.from_string(arg) for arg in args]
+            except InvalidKeyError:
+                raise CommandError('Invalid key specified.')
+
+        for course_key in course_keys:
+            log.info(u'Rebuilding class dashboard distributions for course %s', course_key)
+            rebuild_distributions(course_key)
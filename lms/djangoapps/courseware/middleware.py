@@ -5,6 +5,7 @@ Middleware for the courseware app
 from django.shortcuts import redirect
 
 from lms.djangoapps.courseware.exceptions import Redirect
+from lms.djangoapps.courseware.field_overrides import report_override_index_metrics
 
 
 class RedirectMiddleware(object):
@@ -17,3 +18,23 @@ class RedirectMiddleware(object):
         """
         if isinstance(exception, Redirect):
             return redirect(exception.url)
+
+
+class OverrideIndexMetricsMiddleware(object):
+    """
+    Reports the counts of field override lookups once the request is over.
+    Must come after MonitoringCustomMetrics in MIDDLEWARE_CLASSES, so that
+    they are reported along with the request's other custom metrics.
+    """
+    def process_response(self, _request, response):
+        """
+        Reports the counts of field override lookups of the request.
+        """
+        report_override_index_metrics()
+        return response
+
+    def process_exception(self, _request, _exception):
+        """
+        Reports the counts of field override lookups of the failed request.
+        """
+        report_override_index_metrics()
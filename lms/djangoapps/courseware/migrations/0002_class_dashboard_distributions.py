@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, LocationKeyField
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courseware', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProblemGradeCount',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', CourseKeyField(max_length=255, db_index=True)),
+                ('module_state_key', LocationKeyField(max_length=255, db_column=b'module_id')),
+                ('grade', models.FloatField()),
+                ('max_grade', models.FloatField(default=0)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SequentialOpenCount',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', CourseKeyField(max_length=255, db_index=True)),
+                ('module_state_key', LocationKeyField(max_length=255, db_column=b'module_id')),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='sequentialopencount',
+            unique_together=set([('course_id', 'module_state_key')]),
+        ),
+        migrations.AlterUniqueTogether(
+            name='problemgradecount',
+            unique_together=set([('course_id', 'module_state_key', 'grade', 'max_grade')]),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, LocationKeyField
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courseware', '0002_class_dashboard_distributions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistributionCountDelta',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', CourseKeyField(max_length=255, db_index=True)),
+                ('module_type', models.CharField(max_length=32)),
+                ('module_state_key', LocationKeyField(max_length=255, db_column=b'module_id')),
+                ('grade', models.FloatField(null=True, blank=True)),
+                ('max_grade', models.FloatField(default=0)),
+                ('delta', models.IntegerField()),
+            ],
+        ),
+    ]
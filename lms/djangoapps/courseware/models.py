@@ -14,18 +14,25 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 """
 import itertools
 import logging
+from collections import Counter
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from model_utils.models import TimeStampedModel
 
 import coursewarehistoryextended
 from openedx.core.djangoapps.xmodule_django.models import BlockTypeKeyField, CourseKeyField, LocationKeyField
+from util.db import run_after_commit
 
 log = logging.getLogger("edx.courseware")
 
+DISTRIBUTIONS_UPDATE_SCHEDULED_KEY = u'courseware.class_dashboard_distributions.update_scheduled.{course_id}'
+
 
 def chunks(items, chunk_size):
     """
@@ -129,6 +136,19 @@ class StudentModule(models.Model):
         else:
             return queryset
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(StudentModule, cls).from_db(db, field_names, values)
+        loaded_values = dict(zip(field_names, values))
+        if 'grade' in loaded_values and 'max_grade' in loaded_values:
+            # Remember the grade the module was loaded with, so that saving it
+            # can move the student between the buckets of the class dashboard's
+            # grade distribution of the problem.
+            instance._distribution_grade = _distribution_grade(  # pylint: disable=protected-access
+                loaded_values['grade'], loaded_values['max_grade'],
+            )
+        return instance
+
     def __repr__(self):
         return 'StudentModule<%r>' % ({
             'course_id': self.course_id,
@@ -355,3 +375,257 @@ class StudentFieldOverride(TimeStampedModel):
 
     field = models.CharField(max_length=255)
     value = models.TextField(default='null')
+
+
+def materialize_distributions_enabled():
+    """
+    Returns whether the class dashboard distributions are maintained in (and
+    read from) the ProblemGradeCount and SequentialOpenCount tables.
+    """
+    return settings.FEATURES.get('MATERIALIZE_CLASS_DASHBOARD_DISTRIBUTIONS', False)
+
+
+def _distribution_grade(grade, max_grade):
+    """
+    Returns the (grade, max_grade) bucket of the class dashboard's grade
+    distributions that a StudentModule with the given grade is counted in.
+    StudentModules without a max_grade are counted with a max_grade of 0, so
+    that the buckets stay unique.
+    """
+    return (grade, max_grade or 0)
+
+
+def _adjust_count(model, delta, **key):
+    """
+    Adds delta to the count of the given distribution model row, creating the
+    row if it doesn't exist yet.
+    """
+    if model.objects.filter(**key).update(count=F('count') + delta):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=delta, **key)
+    except IntegrityError:
+        # Another task created the row since we tried to update it.
+        model.objects.filter(**key).update(count=F('count') + delta)
+
+
+class ProblemGradeCount(models.Model):
+    """
+    The number of students with a given grade on a problem, as displayed by
+    the class dashboard's grade distributions.
+
+    Maintained from DistributionCountDeltas while the
+    MATERIALIZE_CLASS_DASHBOARD_DISTRIBUTIONS feature is enabled, and rebuilt
+    from StudentModule by the rebuild_class_dashboard_distributions
+    management command.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_column='module_id')
+    grade = models.FloatField()
+    max_grade = models.FloatField(default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta(object):
+        app_label = "courseware"
+        unique_together = (('course_id', 'module_state_key', 'grade', 'max_grade'),)
+
+    @classmethod
+    def rebuild_for_course(cls, course_id):
+        """
+        Recomputes the grade distributions of all problems in the course from StudentModule.
+        """
+        rows = StudentModule.objects.filter(
+            course_id=course_id,
+            module_type='problem',
+            grade__isnull=False,
+        ).values('module_state_key', 'grade', 'max_grade').annotate(num_students=Count('grade'))
+        counts = Counter()
+        for row in rows:
+            bucket = (row['module_state_key'],) + _distribution_grade(row['grade'], row['max_grade'])
+            counts[bucket] += row['num_students']
+        with transaction.atomic():
+            cls.objects.filter(course_id=course_id).delete()
+            cls.objects.bulk_create(
+                cls(
+                    course_id=course_id,
+                    module_state_key=module_state_key,
+                    grade=grade,
+                    max_grade=max_grade,
+                    count=count,
+                )
+                for (module_state_key, grade, max_grade), count in counts.iteritems()
+            )
+
+
+class SequentialOpenCount(models.Model):
+    """
+    The number of students that opened a subsection, as displayed by the class
+    dashboard.
+
+    Maintained and rebuilt along with ProblemGradeCount.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_column='module_id')
+    count = models.IntegerField(default=0)
+
+    class Meta(object):
+        app_label = "courseware"
+        unique_together = (('course_id', 'module_state_key'),)
+
+    @classmethod
+    def rebuild_for_course(cls, course_id):
+        """
+        Recomputes the number of students that opened each subsection of the course from StudentModule.
+        """
+        rows = StudentModule.objects.filter(
+            course_id=course_id,
+            module_type='sequential',
+        ).values('module_state_key').annotate(num_students=Count('module_state_key'))
+        with transaction.atomic():
+            cls.objects.filter(course_id=course_id).delete()
+            cls.objects.bulk_create(
+                cls(course_id=course_id, module_state_key=row['module_state_key'], count=row['num_students'])
+                for row in rows
+            )
+
+
+class DistributionCountDelta(models.Model):
+    """
+    A change to a count of the class dashboard distributions, recorded along
+    with the StudentModule change it follows from.
+
+    StudentModule changes only insert these rows, so that saving student
+    state does not contend on the rows of the distributions. A task applies
+    them to ProblemGradeCount and SequentialOpenCount, and deletes them.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_type = models.CharField(max_length=32)
+    module_state_key = LocationKeyField(max_length=255, db_column='module_id')
+    grade = models.FloatField(null=True, blank=True)
+    max_grade = models.FloatField(default=0)
+    delta = models.IntegerField()
+
+    class Meta(object):
+        app_label = "courseware"
+
+    @classmethod
+    def apply_for_course(cls, course_id):
+        """
+        Adds the recorded deltas of the course to its distributions, and deletes them.
+        """
+        delta_ids = list(cls.objects.filter(course_id=course_id).values_list('id', flat=True))
+        with transaction.atomic():
+            # Deltas already applied by a concurrent task are gone once their locks are released.
+            deltas = list(cls.objects.select_for_update().filter(id__in=delta_ids))
+            problem_deltas = Counter()
+            sequential_deltas = Counter()
+            for delta in deltas:
+                if delta.module_type == 'problem':
+                    problem_deltas[(delta.module_state_key, delta.grade, delta.max_grade)] += delta.delta
+                else:
+                    sequential_deltas[delta.module_state_key] += delta.delta
+
+            for (module_state_key, grade, max_grade), delta in problem_deltas.iteritems():
+                if delta:
+                    _adjust_count(
+                        ProblemGradeCount, delta,
+                        course_id=course_id, module_state_key=module_state_key, grade=grade, max_grade=max_grade,
+                    )
+            for module_state_key, delta in sequential_deltas.iteritems():
+                if delta:
+                    _adjust_count(SequentialOpenCount, delta, course_id=course_id, module_state_key=module_state_key)
+            cls.objects.filter(id__in=[delta.id for delta in deltas]).delete()
+
+
+def rebuild_distributions(course_id):
+    """
+    Recomputes the class dashboard distributions of the course from
+    StudentModule, discarding the deltas of the changes already counted.
+    """
+    with transaction.atomic():
+        # Deltas recorded from now on are not counted by the rebuild.
+        delta_ids = list(DistributionCountDelta.objects.filter(course_id=course_id).values_list('id', flat=True))
+        ProblemGradeCount.rebuild_for_course(course_id)
+        SequentialOpenCount.rebuild_for_course(course_id)
+        DistributionCountDelta.objects.filter(id__in=delta_ids).delete()
+
+
+@receiver(post_save, sender=StudentModule)
+def update_distributions_on_save(sender, instance, created, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """
+    Records the changes of a created or updated StudentModule to the class
+    dashboard distributions.
+    """
+    if raw or not materialize_distributions_enabled():
+        return
+
+    new_grade = _distribution_grade(instance.grade, instance.max_grade)
+    deltas = []
+    if instance.module_type == 'sequential' and created:
+        deltas.append((None, 0, 1))
+    elif instance.module_type == 'problem':
+        if created:
+            old_grade = (None, 0)
+        else:
+            # Without a remembered grade (e.g. the module was not loaded from
+            # the database), leave the distribution to the next rebuild.
+            old_grade = getattr(instance, '_distribution_grade', new_grade)
+        if old_grade != new_grade:
+            if old_grade[0] is not None:
+                deltas.append(old_grade + (-1,))
+            if new_grade[0] is not None:
+                deltas.append(new_grade + (1,))
+    instance._distribution_grade = new_grade  # pylint: disable=protected-access
+    _record_distribution_deltas(instance, deltas)
+
+
+@receiver(post_delete, sender=StudentModule)
+def update_distributions_on_delete(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Records the removal of a deleted StudentModule from the class dashboard distributions.
+    """
+    if not materialize_distributions_enabled():
+        return
+
+    if instance.module_type == 'sequential':
+        _record_distribution_deltas(instance, [(None, 0, -1)])
+    elif instance.module_type == 'problem':
+        grade = getattr(instance, '_distribution_grade', _distribution_grade(instance.grade, instance.max_grade))
+        if grade[0] is not None:
+            _record_distribution_deltas(instance, [grade + (-1,)])
+
+
+def _record_distribution_deltas(student_module, deltas):
+    """
+    Records the given (grade, max_grade, delta) changes to the distributions
+    of the StudentModule's block, and schedules their update.
+    """
+    if not deltas:
+        return
+    DistributionCountDelta.objects.bulk_create(
+        DistributionCountDelta(
+            course_id=student_module.course_id,
+            module_type=student_module.module_type,
+            module_state_key=student_module.module_state_key,
+            grade=grade,
+            max_grade=max_grade,
+            delta=delta,
+        )
+        for grade, max_grade, delta in deltas
+    )
+    course_id = unicode(student_module.course_id)
+    # Schedule the update once the deltas are committed, so that they are applied.
+    run_after_commit(lambda: _schedule_distributions_update(course_id))
+
+
+def _schedule_distributions_update(course_id):
+    """
+    Queues a task applying the distribution deltas of the course, unless one
+    is queued already. Deltas are applied at most once every
+    CLASS_DASHBOARD_DISTRIBUTIONS_UPDATE_DELAY seconds per course.
+    """
+    delay = settings.CLASS_DASHBOARD_DISTRIBUTIONS_UPDATE_DELAY
+    if cache.add(DISTRIBUTIONS_UPDATE_SCHEDULED_KEY.format(course_id=course_id), True, delay):
+        from courseware.tasks import update_class_dashboard_distributions
+        update_class_dashboard_distributions.apply_async(args=[course_id], countdown=delay)
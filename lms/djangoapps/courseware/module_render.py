@@ -29,7 +29,7 @@ from xblock.runtime import KvsFieldData
 
 import static_replace
 from capa.xqueue_interface import XQueueInterface
-from courseware.access import get_user_role, has_access
+from courseware.access import batched_access_checks, get_user_role, has_access
 from courseware.entrance_exams import user_can_skip_entrance_exam, user_has_passed_entrance_exam
 from courseware.masquerade import (
     MasqueradingKeyValueStore,
@@ -38,6 +38,7 @@ from courseware.masquerade import (
     setup_masquerade
 )
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache
+from courseware.score_snapshot import get_cached_histogram
 from edxmako.shortcuts import render_to_string
 from eventtracking import tracker
 from lms.djangoapps.grades.signals.signals import SCORE_PUBLISHED
@@ -147,7 +148,7 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
     field_data_cache must include data from the course module and 2 levels of its descendants
     '''
 
-    with modulestore().bulk_operations(course.id):
+    with modulestore().bulk_operations(course.id), batched_access_checks(user, course.id):
         course_module = get_module_for_descriptor(
             user, request, course, field_data_cache, course.id, course=course
         )
@@ -612,7 +613,10 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
             staff_access = has_access(user, 'staff', descriptor, course_id)
             instructor_access = bool(has_access(user, 'instructor', descriptor, course_id))
         if staff_access:
-            block_wrappers.append(partial(add_staff_markup, user, instructor_access, disable_staff_debug_info))
+            block_wrappers.append(partial(
+                add_staff_markup, user, instructor_access, disable_staff_debug_info,
+                get_cached_histogram=get_cached_histogram,
+            ))
 
     if course.enable_vertical_grading:
         block_wrappers.append(partial(add_grading_markup, course))
@@ -0,0 +1,253 @@
+"""
+A per-course, columnar snapshot of the problem scores in StudentModule.
+
+Instructor analytics that summarize scores across a course (grade
+distributions, histograms, per-student score vectors) share a snapshot
+loaded by a single streaming query, rather than each scanning StudentModule
+with its own filters:
+
+    snapshot = get_course_score_snapshot(course_key)
+    snapshot.histogram(usage_key)
+
+Snapshots are kept in a process-level cache for SNAPSHOT_CACHE_TIMEOUT
+seconds, so they may not reflect the most recent submissions.
+"""
+import calendar
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+import numpy
+
+from courseware.models import StudentModule
+
+# Number of seconds a snapshot is served from the process-level cache.
+SNAPSHOT_CACHE_TIMEOUT = 60
+
+# Maximum number of course snapshots kept in the process-level cache.
+SNAPSHOT_CACHE_SIZE = 4
+
+SCORE_SNAPSHOT_PROCESS_CACHE = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class CourseScoreSnapshot(object):
+    """
+    The scores of all students on the problems of a course.
+
+    Each StudentModule of a problem is a row of the parallel numpy arrays:
+        user_ids: the id of the student.
+        block_indices: the index of the problem in `block_keys`.
+        grades, max_grades: the score of the student, NaN if there is none.
+        modified: when the StudentModule last changed, in seconds since the epoch.
+    """
+    def __init__(self, course_key, block_keys, user_ids, block_indices, grades, max_grades, modified):
+        self.course_key = course_key
+        self.block_keys = block_keys
+        self.user_ids = user_ids
+        self.block_indices = block_indices
+        self.grades = grades
+        self.max_grades = max_grades
+        self.modified = modified
+        self._block_index = {block_key: index for index, block_key in enumerate(block_keys)}
+
+    @classmethod
+    def load(cls, course_key):
+        """
+        Loads the snapshot of the given course from StudentModule.
+        """
+        block_index = {}
+        user_ids, block_indices = array('l'), array('l')
+        grades, max_grades, modified = array('d'), array('d'), array('d')
+
+        rows = StudentModule.objects.filter(
+            course_id=course_key,
+            module_type='problem',
+        ).values_list('student_id', 'module_state_key', 'grade', 'max_grade', 'modified').iterator()
+        for user_id, module_state_key, grade, max_grade, modified_at in rows:
+            user_ids.append(user_id)
+            block_indices.append(block_index.setdefault(module_state_key, len(block_index)))
+            grades.append(numpy.nan if grade is None else grade)
+            max_grades.append(numpy.nan if max_grade is None else max_grade)
+            modified.append(calendar.timegm(modified_at.utctimetuple()))
+
+        # Keys are only parsed once per problem, rather than once per row.
+        block_keys = [None] * len(block_index)
+        for module_state_key, index in block_index.iteritems():
+            block_keys[index] = course_key.make_usage_key_from_deprecated_string(module_state_key)
+
+        return cls(
+            course_key,
+            block_keys,
+            _to_numpy(user_ids, numpy.int_),
+            _to_numpy(block_indices, numpy.int_),
+            _to_numpy(grades, numpy.float64),
+            _to_numpy(max_grades, numpy.float64),
+            _to_numpy(modified, numpy.float64),
+        )
+
+    def _block_rows(self, usage_key):
+        """
+        Returns a boolean mask of the rows of the given problem, or None if no
+        student has state for it.
+        """
+        index = self._block_index.get(usage_key.map_into_course(self.course_key))
+        if index is None:
+            return None
+        return self.block_indices == index
+
+    def histogram(self, usage_key):
+        """
+        Returns the number of students with each grade on the given problem,
+        as a list of (grade, count) ordered by grade. Students without a grade
+        are counted under a grade of None, which comes first.
+        """
+        rows = self._block_rows(usage_key)
+        if rows is None:
+            return []
+        (grades,), counts = _group_counts(self.grades[rows])
+        return zip(_to_list(grades), counts.tolist())
+
+    def grade_distributions(self, usage_keys=None):
+        """
+        Returns the number of students with each score on each problem (or on
+        the given problems only), as a dict mapping problem usage keys to lists
+        of (grade, max_grade, count) ordered by grade. Students without a
+        grade are left out.
+        """
+        rows = ~numpy.isnan(self.grades)
+        if usage_keys is not None:
+            indices = [
+                self._block_index[key]
+                for key in (usage_key.map_into_course(self.course_key) for usage_key in usage_keys)
+                if key in self._block_index
+            ]
+            rows &= numpy.in1d(self.block_indices, indices)
+
+        distributions = {}
+        (block_indices, grades, max_grades), counts = _group_counts(
+            self.block_indices[rows], self.grades[rows], self.max_grades[rows],
+        )
+        for index, grade, max_grade, count in zip(
+                block_indices.tolist(), _to_list(grades), _to_list(max_grades), counts.tolist()
+        ):
+            distributions.setdefault(self.block_keys[index], []).append((grade, max_grade, count))
+        return distributions
+
+    def problem_stats(self, usage_key):
+        """
+        Returns a dict of summary statistics of the scores on the given problem:
+            num_students: the number of students with state for the problem.
+            num_graded: the number of those students with a grade.
+            mean_grade: the mean of their grades, or None.
+            max_grade: the highest possible grade, or None.
+            last_modified: when a student's state last changed, in seconds since the epoch, or None.
+        """
+        rows = self._block_rows(usage_key)
+        if rows is None:
+            return {'num_students': 0, 'num_graded': 0, 'mean_grade': None, 'max_grade': None, 'last_modified': None}
+
+        grades = self.grades[rows]
+        grades = grades[~numpy.isnan(grades)]
+        max_grades = self.max_grades[rows]
+        max_grades = max_grades[~numpy.isnan(max_grades)]
+        return {
+            'num_students': int(rows.sum()),
+            'num_graded': len(grades),
+            'mean_grade': float(grades.mean()) if len(grades) else None,
+            'max_grade': float(max_grades.max()) if len(max_grades) else None,
+            'last_modified': float(self.modified[rows].max()),
+        }
+
+    def user_grades(self, user_id):
+        """
+        Returns the grades of the given student, as a numpy array aligned with
+        `block_keys`, holding NaN for the problems the student has no grade for.
+        """
+        grades = numpy.empty(len(self.block_keys))
+        grades.fill(numpy.nan)
+        rows = self.user_ids == user_id
+        grades[self.block_indices[rows]] = self.grades[rows]
+        return grades
+
+
+def get_course_score_snapshot(course_key, cached_only=False):
+    """
+    Returns the score snapshot of the given course, from the process-level
+    cache if it holds a recent enough one. If `cached_only` is set, returns
+    None rather than loading a new snapshot.
+    """
+    now = time.time()
+    with _cache_lock:
+        cached = SCORE_SNAPSHOT_PROCESS_CACHE.get(course_key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    if cached_only:
+        return None
+
+    snapshot = CourseScoreSnapshot.load(course_key)
+    with _cache_lock:
+        SCORE_SNAPSHOT_PROCESS_CACHE.pop(course_key, None)
+        SCORE_SNAPSHOT_PROCESS_CACHE[course_key] = (now + SNAPSHOT_CACHE_TIMEOUT, snapshot)
+        while len(SCORE_SNAPSHOT_PROCESS_CACHE) > SNAPSHOT_CACHE_SIZE:
+            SCORE_SNAPSHOT_PROCESS_CACHE.popitem(last=False)
+    return snapshot
+
+
+def get_cached_histogram(usage_key):
+    """
+    Returns the histogram of the given problem from its course's score
+    snapshot when one is already loaded, or None. Doesn't load a whole
+    course's snapshot for a single problem.
+    """
+    if usage_key.block_type != 'problem':
+        return None
+    snapshot = get_course_score_snapshot(usage_key.course_key, cached_only=True)
+    if snapshot is None:
+        return None
+    return snapshot.histogram(usage_key)
+
+
+def _to_numpy(values, dtype):
+    """
+    Returns the given array.array as a numpy array of the given type.
+    """
+    return numpy.fromiter(values, dtype=dtype, count=len(values))
+
+
+def _to_list(values):
+    """
+    Returns the given numpy array of floats as a list, with None for NaN.
+    """
+    return [None if numpy.isnan(value) else value for value in values.tolist()]
+
+
+def _group_counts(*columns):
+    """
+    Returns the distinct rows of the given equal-length numpy columns, and the
+    number of times each of them occurs, as a list of columns and an array of
+    counts ordered by the columns. NaN values are grouped together and ordered
+    first.
+    """
+    # NaN never compares equal, so group its occurrences as -inf instead.
+    columns = [
+        numpy.where(numpy.isnan(column), -numpy.inf, column) if column.dtype.kind == 'f' else column
+        for column in columns
+    ]
+    if not len(columns[0]):
+        return columns, numpy.zeros(0, dtype=numpy.int_)
+
+    # lexsort sorts by its last key first.
+    order = numpy.lexsort(columns[::-1])
+    columns = [column[order] for column in columns]
+    starts = numpy.zeros(len(order), dtype=bool)
+    starts[0] = True
+    for column in columns:
+        starts[1:] |= column[1:] != column[:-1]
+    starts = numpy.flatnonzero(starts)
+    counts = numpy.diff(numpy.append(starts, len(order)))
+    return [
+        numpy.where(numpy.isneginf(column), numpy.nan, column) if column.dtype.kind == 'f' else column
+        for column in (column[starts] for column in columns)
+    ], counts
@@ -4,7 +4,7 @@ by the individual due dates feature.
 """
 import json
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, clear_override_index
 from .models import StudentFieldOverride
 
 
@@ -70,6 +70,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    clear_override_index()
 
 
 def clear_override_for_user(user, block, name):
@@ -87,3 +88,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    clear_override_index()
@@ -0,0 +1,20 @@
+"""
+Asynchronous tasks for the courseware app.
+"""
+from celery import task
+from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey
+
+from courseware.models import DISTRIBUTIONS_UPDATE_SCHEDULED_KEY, DistributionCountDelta
+
+
+@task()
+def update_class_dashboard_distributions(course_id):
+    """
+    Applies the recorded changes to the class dashboard distributions of a
+    course. See courseware.models.DistributionCountDelta.
+    """
+    course_key = CourseKey.from_string(course_id)
+    # Let changes made from now on schedule another update.
+    cache.delete(DISTRIBUTIONS_UPDATE_SCHEDULED_KEY.format(course_id=course_key))
+    DistributionCountDelta.apply_for_course(course_key)
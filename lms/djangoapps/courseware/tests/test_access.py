@@ -493,6 +493,34 @@ class AccessTestCase(LoginEnrollmentTestCase, ModuleStoreTestCase, MilestonesTes
 
         self.verify_access(mock_unit, expected_access, expected_error_type)
 
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_has_access_many(self):
+        descriptors = [
+            ItemFactory.create(category='chapter', parent=self.course),
+            ItemFactory.create(category='chapter', parent=self.course, visible_to_staff_only=True),
+            ItemFactory.create(category='chapter', parent=self.course, start=self.TOMORROW),
+        ]
+        for user in (self.student, self.course_staff, self.anonymous_user):
+            responses = access.has_access_many(user, 'load', descriptors, self.course.id)
+            self.assertEqual(
+                {location: bool(response) for location, response in responses.iteritems()},
+                {
+                    descriptor.location: bool(access.has_access(user, 'load', descriptor, self.course.id))
+                    for descriptor in descriptors
+                },
+            )
+
+    def test_has_access_many_user_lookups(self):
+        descriptors = [ItemFactory.create(category='chapter', parent=self.course) for __ in range(3)]
+        with patch('courseware.access.get_user_role', wraps=access.get_user_role) as mock_user_role:
+            access.has_access_many(self.student, 'load', descriptors, self.course.id)
+            self.assertEqual(mock_user_role.call_count, 1)
+
+            # Outside of a batch, each check looks up the user's role.
+            for descriptor in descriptors:
+                access.has_access(self.student, 'load', descriptor, self.course.id)
+            self.assertEqual(mock_user_role.call_count, 1 + len(descriptors))
+
     def test__has_access_course_can_enroll(self):
         yesterday = datetime.datetime.now(pytz.utc) - datetime.timedelta(days=1)
         tomorrow = datetime.datetime.now(pytz.utc) + datetime.timedelta(days=1)
@@ -5,6 +5,7 @@ Tests for `field_overrides` module.
 import unittest
 
 from django.test.utils import override_settings
+from mock import call, patch
 from nose.plugins.attrib import attr
 from xblock.field_data import DictFieldData
 
@@ -15,7 +16,9 @@ from ..field_overrides import (
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
+    clear_override_index,
     disable_overrides,
+    report_override_index_metrics,
     resolve_dotted
 )
 from ..testutils import FieldOverrideTestMixin
@@ -142,6 +145,135 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+class FakeBlock(object):
+    """
+    A block with a location and a parent, standing in for an XBlock.
+    """
+    def __init__(self, location, parent=None):
+        self.location = location
+        self.parent = parent
+
+    def get_parent(self):
+        return self.parent
+
+
+class CountingOverrideProvider(FieldOverrideProvider):
+    """
+    Overrides the due date of the 'chapter' block, counting the lookups it gets.
+    """
+    lookups = 0
+
+    def get(self, block, name, default):
+        CountingOverrideProvider.lookups += 1
+        if block.location == 'chapter' and name == 'due':
+            return 'tomorrow'
+        return default
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
+@attr(shard=1)
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'courseware.tests.test_field_overrides.CountingOverrideProvider',))
+class OverrideIndexTests(SharedModuleStoreTestCase):
+    """
+    Tests for the overrides compiled by `OverrideFieldData` during a request.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super(OverrideIndexTests, cls).setUpClass()
+        cls.course = CourseFactory.create()
+
+    def setUp(self):
+        super(OverrideIndexTests, self).setUp()
+        OverrideFieldData.provider_classes = None
+        CountingOverrideProvider.lookups = 0
+        self.chapter = FakeBlock('chapter', FakeBlock('course'))
+        self.sequential = FakeBlock('sequential', self.chapter)
+        self.vertical = FakeBlock('vertical', self.sequential)
+        self.fallback = DictFieldData({'due': 'never', 'display_name': 'Unit'})
+
+    def tearDown(self):
+        super(OverrideIndexTests, self).tearDown()
+        OverrideFieldData.provider_classes = None
+
+    def make_one(self, user=TESTUSER):
+        """
+        Factory method.
+        """
+        return OverrideFieldData.wrap(user, self.course, self.fallback)
+
+    def test_overrides_looked_up_once(self):
+        self.assertEqual(self.make_one().get(self.chapter, 'due'), 'tomorrow')
+        self.assertEqual(self.make_one().get(self.vertical, 'display_name'), 'Unit')
+        self.assertEqual(CountingOverrideProvider.lookups, 2)
+
+        # Other field data of the same user share the compiled overrides.
+        self.assertEqual(self.make_one().get(self.chapter, 'due'), 'tomorrow')
+        self.assertEqual(self.make_one().get(self.vertical, 'display_name'), 'Unit')
+        self.assertEqual(CountingOverrideProvider.lookups, 2)
+
+        # But those of other users don't.
+        self.assertEqual(self.make_one(user='otheruser').get(self.chapter, 'due'), 'tomorrow')
+        self.assertEqual(CountingOverrideProvider.lookups, 3)
+
+    def test_inherited_overrides(self):
+        data = self.make_one()
+        self.assertFalse(data.has(self.vertical, 'due'))
+        self.assertEqual(data.default(self.vertical, 'due'), 'tomorrow')
+        self.assertEqual(data.default(self.sequential, 'due'), 'tomorrow')
+        # The vertical, sequential, and chapter are each asked for their own
+        # override once, and the lineage is not walked again.
+        self.assertEqual(CountingOverrideProvider.lookups, 3)
+
+        with disable_overrides():
+            self.assertTrue(data.has(self.vertical, 'due'))
+        self.assertEqual(CountingOverrideProvider.lookups, 3)
+
+    def test_clear_override_index(self):
+        self.make_one().get(self.chapter, 'due')
+        clear_override_index()
+        self.make_one().get(self.chapter, 'due')
+        self.assertEqual(CountingOverrideProvider.lookups, 2)
+
+    @patch('courseware.field_overrides.OVERRIDE_INDEX_CACHE_SIZE', 1)
+    def test_override_index_cache_size(self):
+        self.make_one().get(self.chapter, 'due')
+        self.make_one().get(self.chapter, 'due')
+        self.assertEqual(CountingOverrideProvider.lookups, 1)
+
+        # Compiling the overrides of another user discards the first user's.
+        self.make_one(user='otheruser').get(self.chapter, 'due')
+        self.make_one().get(self.chapter, 'due')
+        self.assertEqual(CountingOverrideProvider.lookups, 3)
+
+    @patch('courseware.field_overrides.monitoring_utils.accumulate')
+    def test_lookup_metrics(self, mock_accumulate):
+        data = self.make_one()
+        mock_accumulate.reset_mock()
+        data.get(self.chapter, 'due')
+        data.get(self.chapter, 'due')
+        self.assertFalse(mock_accumulate.called)
+
+        report_override_index_metrics()
+        self.assertEqual(mock_accumulate.call_args_list, [
+            call('field_overrides.lookups', 2),
+            call('field_overrides.provider_lookups', 1),
+        ])
+
+        # The counts are reset once reported, and reported when the index is cleared.
+        mock_accumulate.reset_mock()
+        data.get(self.chapter, 'due')
+        clear_override_index()
+        self.assertEqual(mock_accumulate.call_args_list, [
+            call('field_overrides.lookups', 1),
+            call('field_overrides.provider_lookups', 0),
+        ])
+
+
 @attr(shard=1)
 class ResolveDottedTests(unittest.TestCase):
     """
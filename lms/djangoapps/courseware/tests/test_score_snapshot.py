@@ -0,0 +1,117 @@
+"""
+Tests for course score snapshots.
+"""
+import math
+
+from mock import patch
+from nose.plugins.attrib import attr
+
+from courseware.score_snapshot import CourseScoreSnapshot, get_cached_histogram, get_course_score_snapshot
+from courseware.tests.factories import StudentModuleFactory
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from openedx.core.lib.xblock_utils import grade_histogram
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from student.tests.factories import UserFactory
+
+
+@attr(shard=1)
+class CourseScoreSnapshotTest(CacheIsolationTestCase):
+    """
+    Tests for CourseScoreSnapshot and get_course_score_snapshot.
+    """
+    def setUp(self):
+        super(CourseScoreSnapshotTest, self).setUp()
+        self.course_key = SlashSeparatedCourseKey('edX', 'snapshot', 'run')
+        self.problem_1 = self.course_key.make_usage_key('problem', 'problem_1')
+        self.problem_2 = self.course_key.make_usage_key('problem', 'problem_2')
+        self.users = [UserFactory.create() for __ in range(3)]
+        for user, grade in zip(self.users, [1, 1, None]):
+            self._create_module(user, self.problem_1, grade, 2)
+        self._create_module(self.users[0], self.problem_2, 3, 4)
+
+        # Neither other courses nor other module types are part of the snapshot.
+        self._create_module(
+            self.users[0], SlashSeparatedCourseKey('edX', 'other', 'run').make_usage_key('problem', 'problem_1'), 1, 1
+        )
+        StudentModuleFactory.create(
+            student=self.users[1],
+            course_id=self.course_key,
+            module_type='sequential',
+            module_state_key=self.course_key.make_usage_key('sequential', 'sequential'),
+        )
+
+    def _create_module(self, user, usage_key, grade, max_grade):
+        """
+        Creates a StudentModule of the given problem.
+        """
+        StudentModuleFactory.create(
+            student=user,
+            course_id=usage_key.course_key,
+            module_state_key=usage_key,
+            grade=grade,
+            max_grade=max_grade,
+        )
+
+    def test_load(self):
+        snapshot = CourseScoreSnapshot.load(self.course_key)
+        self.assertItemsEqual(snapshot.block_keys, [self.problem_1, self.problem_2])
+        self.assertEqual(len(snapshot.user_ids), 4)
+        self.assertItemsEqual(snapshot.user_ids.tolist(), [user.id for user in self.users] + [self.users[0].id])
+
+    def test_histogram(self):
+        snapshot = CourseScoreSnapshot.load(self.course_key)
+        self.assertEqual(snapshot.histogram(self.problem_1), [(None, 1), (1.0, 2)])
+        self.assertEqual(snapshot.histogram(self.problem_2), [(3.0, 1)])
+        self.assertEqual(snapshot.histogram(self.course_key.make_usage_key('problem', 'unattempted')), [])
+
+    def test_grade_distributions(self):
+        snapshot = CourseScoreSnapshot.load(self.course_key)
+        self.assertEqual(
+            snapshot.grade_distributions(),
+            {self.problem_1: [(1.0, 2.0, 2)], self.problem_2: [(3.0, 4.0, 1)]},
+        )
+        self.assertEqual(snapshot.grade_distributions([self.problem_2]), {self.problem_2: [(3.0, 4.0, 1)]})
+
+    def test_problem_stats(self):
+        snapshot = CourseScoreSnapshot.load(self.course_key)
+        stats = snapshot.problem_stats(self.problem_1)
+        self.assertEqual(stats['num_students'], 3)
+        self.assertEqual(stats['num_graded'], 2)
+        self.assertEqual(stats['mean_grade'], 1.0)
+        self.assertEqual(stats['max_grade'], 2.0)
+        self.assertIsNotNone(stats['last_modified'])
+        self.assertEqual(
+            snapshot.problem_stats(self.course_key.make_usage_key('problem', 'unattempted'))['num_students'], 0
+        )
+
+    def test_user_grades(self):
+        snapshot = CourseScoreSnapshot.load(self.course_key)
+        grades = dict(zip(snapshot.block_keys, snapshot.user_grades(self.users[2].id).tolist()))
+        self.assertTrue(math.isnan(grades[self.problem_1]))
+        self.assertTrue(math.isnan(grades[self.problem_2]))
+        grades = dict(zip(snapshot.block_keys, snapshot.user_grades(self.users[0].id).tolist()))
+        self.assertEqual(grades, {self.problem_1: 1.0, self.problem_2: 3.0})
+
+    def test_process_cache(self):
+        snapshot = get_course_score_snapshot(self.course_key)
+        with self.assertNumQueries(0):
+            self.assertIs(get_course_score_snapshot(self.course_key), snapshot)
+
+    @patch('courseware.score_snapshot.SNAPSHOT_CACHE_TIMEOUT', -1)
+    def test_process_cache_expiry(self):
+        snapshot = get_course_score_snapshot(self.course_key)
+        self.assertIsNot(get_course_score_snapshot(self.course_key), snapshot)
+
+    def test_cached_only(self):
+        self.assertIsNone(get_course_score_snapshot(self.course_key, cached_only=True))
+        snapshot = get_course_score_snapshot(self.course_key)
+        self.assertIs(get_course_score_snapshot(self.course_key, cached_only=True), snapshot)
+
+    def test_grade_histogram(self):
+        # Without a cached snapshot, the histogram is queried, and is the same.
+        self._create_module(self.users[2], self.problem_2, 1, 4)
+        from_query = grade_histogram(self.problem_2, get_cached_histogram)
+        get_course_score_snapshot(self.course_key)
+        with self.assertNumQueries(0):
+            self.assertEqual(grade_histogram(self.problem_2, get_cached_histogram), from_query)
+        self.assertEqual(from_query, [(1.0, 1), (3.0, 1)])
@@ -40,7 +40,7 @@ from util.views import ensure_valid_course_key
 from xmodule.modulestore.django import modulestore
 from xmodule.x_module import STUDENT_VIEW
 
-from ..access import has_access
+from ..access import batched_access_checks, has_access
 from ..access_utils import in_preview_mode, is_course_open_for_learner
 from ..courses import get_course_with_access, get_current_child, get_studio_url
 from ..entrance_exams import (
@@ -140,19 +140,24 @@ class CoursewareIndex(View):
         """
         check_access_to_course(request, self.course)
         self._redirect_if_needed_to_pay_for_course()
-        self._prefetch_and_bind_course(request)
 
-        if self.course.has_children_at_depth(CONTENT_DEPTH):
-            self._reset_section_to_exam_if_required()
-            self.chapter = self._find_chapter()
-            self.section = self._find_section()
+        # The blocks of the page are bound to the user, and their access checked, one by one.
+        with batched_access_checks(self.effective_user, self.course_key):
+            self._prefetch_and_bind_course(request)
 
-            if self.chapter and self.section:
-                self._redirect_if_not_requested_section()
-                self._save_positions()
-                self._prefetch_and_bind_section()
+            if self.course.has_children_at_depth(CONTENT_DEPTH):
+                self._reset_section_to_exam_if_required()
+                self.chapter = self._find_chapter()
+                self.section = self._find_section()
 
-        return render_to_response('courseware/courseware.html', self._create_courseware_context(request))
+                if self.chapter and self.section:
+                    self._redirect_if_not_requested_section()
+                    self._save_positions()
+                    self._prefetch_and_bind_section()
+
+            courseware_context = self._create_courseware_context(request)
+
+        return render_to_response('courseware/courseware.html', courseware_context)
 
     def _redirect_if_not_requested_section(self):
         """
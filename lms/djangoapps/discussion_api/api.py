@@ -23,7 +23,13 @@ from discussion_api.permissions import (
     get_initializable_comment_fields,
     get_initializable_thread_fields
 )
-from discussion_api.serializers import CommentSerializer, DiscussionTopicSerializer, ThreadSerializer, get_context
+from discussion_api.serializers import (
+    CommentSerializer,
+    DiscussionTopicSerializer,
+    ThreadSerializer,
+    get_context,
+    retrieve_cc_requester
+)
 from django_comment_client.base.views import track_comment_created_event, track_thread_created_event, track_voted_event
 from django_comment_client.utils import get_accessible_discussion_xblocks, get_group_id_for_user, is_commentable_divided
 from django_comment_common.signals import (
@@ -86,13 +92,16 @@ def _get_course(course_key, user):
     return course
 
 
-def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
+def _get_thread_and_context(request, thread_id, retrieve_kwargs=None, cc_requester_call=None):
     """
     Retrieve the given thread and build a serializer context for it, returning
     both. This function also enforces access control for the thread (checking
     both the user's access to the course and to the thread's cohort if
     applicable). Raises ThreadNotFoundError if the thread does not exist or the
     user cannot access it.
+
+    If given, cc_requester_call is the retrieval of the requester's comments
+    service user, already started with `retrieve_cc_requester`.
     """
     retrieve_kwargs = retrieve_kwargs or {}
     try:
@@ -103,7 +112,7 @@ def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
         cc_thread = Thread(id=thread_id).retrieve(**retrieve_kwargs)
         course_key = CourseKey.from_string(cc_thread["course_id"])
         course = _get_course(course_key, request.user)
-        context = get_context(course, request, cc_thread)
+        context = get_context(course, request, cc_thread, cc_requester_call)
         course_discussion_settings = get_course_discussion_settings(course_key)
         if (
                 not context["is_requester_privileged"] and
@@ -535,8 +544,13 @@ def get_thread_list(
             "order_direction": ["Invalid value. '{}' must be 'desc'".format(order_direction)]
         })
 
-    course = _get_course(course_key, request.user)
-    context = get_context(course, request)
+    # Retrieve the requester from the comments service while loading the course.
+    cc_requester_call = retrieve_cc_requester(request.user)
+    try:
+        course = _get_course(course_key, request.user)
+        context = get_context(course, request, cc_requester_call=cc_requester_call)
+    finally:
+        cc_requester_call.discard()
 
     query_params = {
         "user_id": unicode(request.user.id),
@@ -615,17 +629,23 @@ def get_comment_list(request, thread_id, endorsed, page, page_size, requested_fi
         discussion_api.views.CommentViewSet for more detail.
     """
     response_skip = page_size * (page - 1)
-    cc_thread, context = _get_thread_and_context(
-        request,
-        thread_id,
-        retrieve_kwargs={
-            "with_responses": True,
-            "recursive": False,
-            "user_id": request.user.id,
-            "response_skip": response_skip,
-            "response_limit": page_size,
-        }
-    )
+    # Retrieve the requester and the thread from the comments service concurrently.
+    cc_requester_call = retrieve_cc_requester(request.user)
+    try:
+        cc_thread, context = _get_thread_and_context(
+            request,
+            thread_id,
+            retrieve_kwargs={
+                "with_responses": True,
+                "recursive": False,
+                "user_id": request.user.id,
+                "response_skip": response_skip,
+                "response_limit": page_size,
+            },
+            cc_requester_call=cc_requester_call,
+        )
+    finally:
+        cc_requester_call.discard()
 
     # Responses to discussion threads cannot be separated by endorsed, but
     # responses to question threads must be separated by endorsed due to the
@@ -0,0 +1,191 @@
+"""
+Runs independent comments service calls of a Discussion API call concurrently.
+
+Remote calls are started on a small pool of worker threads, while the calling
+thread carries on with its own work (e.g. database queries), and collects
+their results when it needs them. When every worker is busy, e.g. with slow
+calls that timed out or were discarded, calls run on the calling thread
+instead of queueing behind them:
+
+    call = RemoteCall(u'retrieve_requester', cc_user.retrieve)
+    ...  # database queries
+    cc_user = call.result()
+
+Worker threads must not use the database, since each thread has its own
+database connection and transaction. The forums configuration and the active
+language are looked up by the calling thread and handed to the workers instead,
+along with the request's comments service request coalescer.
+"""
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from multiprocessing import TimeoutError as PoolTimeoutError
+from multiprocessing.pool import ThreadPool
+from time import time
+
+import six
+from django.conf import settings
+from django.utils import translation
+
+from django_comment_common.models import ForumsConfig
+from lms.lib.comment_client.utils import (
+    CommentClientError,
+    forums_config_override,
+    get_request_coalescer,
+    request_coalescer_override
+)
+from openedx.core.djangoapps import monitoring_utils
+
+try:
+    import newrelic.agent
+except ImportError:
+    newrelic = None  # pylint: disable=invalid-name
+
+# The number of seconds to wait for a remote call by default.
+DEFAULT_TIMEOUT = 10
+
+_pool_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+# Counts the workers of _pool that are not running a call.
+_free_workers = None
+
+
+class RemoteCallTimeout(CommentClientError):
+    """
+    A remote call did not complete within its timeout.
+    """
+    pass
+
+
+def _get_pool():
+    """
+    Returns the pool of worker threads of this process and the semaphore
+    counting its free workers, creating them if needed (and again after a
+    fork, since threads don't survive one).
+    """
+    global _pool, _pool_pid, _free_workers  # pylint: disable=global-statement
+    pid = os.getpid()
+    if _pool is None or _pool_pid != pid:
+        with _pool_lock:
+            if _pool is None or _pool_pid != pid:
+                _free_workers = threading.BoundedSemaphore(settings.DISCUSSION_API_POOL_SIZE)
+                _pool = ThreadPool(settings.DISCUSSION_API_POOL_SIZE)
+                _pool_pid = pid
+    return _pool, _free_workers
+
+
+def _run(func, args, kwargs, config, language, coalescer):
+    """
+    Runs a remote call with the caller's forums configuration, language and
+    request coalescer. Returns its result and duration.
+    """
+    start = time()
+    with forums_config_override(config), translation.override(language), request_coalescer_override(coalescer):
+        result = func(*args, **kwargs)
+    return result, time() - start
+
+
+def _run_on_worker(free_workers, *args):
+    """
+    Runs a remote call on a worker thread, and frees the worker once the call
+    completes, whether or not its result is still awaited.
+    """
+    try:
+        return _run(*args)
+    finally:
+        free_workers.release()
+
+
+class _InlineResult(object):
+    """
+    The outcome of a remote call run on the calling thread, with the interface
+    of the AsyncResult of a call run on a worker thread.
+    """
+    def __init__(self, args):
+        self._exc_info = None
+        try:
+            self._value = _run(*args)
+        except Exception:  # pylint: disable=broad-except
+            self._exc_info = sys.exc_info()
+
+    def ready(self):
+        """
+        Returns True, since the call has completed.
+        """
+        return True
+
+    def get(self, timeout=None):  # pylint: disable=unused-argument
+        """
+        Returns the result of the call, or raises its exception.
+        """
+        if self._exc_info:
+            six.reraise(*self._exc_info)
+        return self._value
+
+
+class RemoteCall(object):
+    """
+    A comments service call running on a worker thread, or completed on the
+    calling thread when no worker is free.
+
+    Arguments:
+        name (unicode): the name of the call, under which it is traced.
+        func: the function making the call.
+        args, kwargs: the arguments to pass to `func`.
+        timeout (float): the number of seconds to wait for the call to complete.
+    """
+    def __init__(self, name, func, args=(), kwargs=None, timeout=DEFAULT_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+        self._collected = False
+        run_args = (
+            func, args, kwargs or {}, ForumsConfig.current(), translation.get_language(), get_request_coalescer()
+        )
+        pool, free_workers = _get_pool()
+        if free_workers.acquire(False):
+            self._async_result = pool.apply_async(_run_on_worker, (free_workers,) + run_args)
+        else:
+            monitoring_utils.increment(u'discussion_api.remote_call.{}.inline'.format(self.name))
+            self._async_result = _InlineResult(run_args)
+
+    def result(self):
+        """
+        Waits for the call to complete, and returns its result or raises its
+        exception. Raises RemoteCallTimeout if it doesn't complete in time.
+        """
+        with _function_trace(u'discussion_api.remote_call.{}'.format(self.name)):
+            try:
+                result, duration = self._async_result.get(self.timeout)
+            except PoolTimeoutError:
+                raise RemoteCallTimeout(u"{} did not complete within {} seconds".format(self.name, self.timeout))
+        self._collected = True
+        monitoring_utils.accumulate(u'discussion_api.remote_call.{}.duration'.format(self.name), duration)
+        return result
+
+    def discard(self):
+        """
+        Gives up on the result of the call, without waiting for it, e.g. when
+        the caller fails before needing it. Does nothing if the result was
+        collected.
+
+        A call still in progress runs to completion on its worker thread, which
+        only uses the state handed over by the caller, and its outcome is
+        ignored. The worker only takes new calls once it completes.
+        """
+        if not self._collected and not self._async_result.ready():
+            monitoring_utils.increment(u'discussion_api.remote_call.{}.discarded'.format(self.name))
+        self._collected = True
+
+
+@contextmanager
+def _function_trace(name):
+    """
+    Traces the enclosed code under the given name in New Relic, if it is installed.
+    """
+    if newrelic:
+        with newrelic.agent.FunctionTrace(newrelic.agent.current_transaction(), name):
+            yield
+    else:
+        yield
@@ -9,6 +9,7 @@ from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
 from rest_framework import serializers
 
+from discussion_api.concurrency import RemoteCall
 from discussion_api.permissions import NON_UPDATABLE_COMMENT_FIELDS, NON_UPDATABLE_THREAD_FIELDS, get_editable_fields
 from discussion_api.render import render_body
 from django_comment_client.utils import is_comment_too_deep
@@ -21,29 +22,46 @@ from lms.lib.comment_client.user import User as CommentClientUser
 from lms.lib.comment_client.utils import CommentClientRequestError
 
 
-def get_context(course, request, thread=None):
+def retrieve_cc_requester(user):
+    """
+    Starts retrieving the comments service user of the given user on a worker
+    thread, returning the RemoteCall to pass to `get_context`.
+    """
+    return RemoteCall(u'retrieve_requester', CommentClientUser.from_django_user(user).retrieve)
+
+
+def get_context(course, request, thread=None, cc_requester_call=None):
     """
     Returns a context appropriate for use with ThreadSerializer or
     (if thread is provided) CommentSerializer.
+
+    The requester's comments service user is retrieved concurrently with the
+    database queries, unless it's already being retrieved by the given
+    `cc_requester_call` (see `retrieve_cc_requester`).
     """
-    # TODO: cache staff_user_ids and ta_user_ids if we need to improve perf
-    staff_user_ids = {
-        user.id
-        for role in Role.objects.filter(
-            name__in=[FORUM_ROLE_ADMINISTRATOR, FORUM_ROLE_MODERATOR],
-            course_id=course.id
-        )
-        for user in role.users.all()
-    }
-    ta_user_ids = {
-        user.id
-        for role in Role.objects.filter(name=FORUM_ROLE_COMMUNITY_TA, course_id=course.id)
-        for user in role.users.all()
-    }
     requester = request.user
-    cc_requester = CommentClientUser.from_django_user(requester).retrieve()
+    if cc_requester_call is None:
+        cc_requester_call = retrieve_cc_requester(requester)
+    try:
+        # TODO: cache staff_user_ids and ta_user_ids if we need to improve perf
+        staff_user_ids = {
+            user.id
+            for role in Role.objects.filter(
+                name__in=[FORUM_ROLE_ADMINISTRATOR, FORUM_ROLE_MODERATOR],
+                course_id=course.id
+            )
+            for user in role.users.all()
+        }
+        ta_user_ids = {
+            user.id
+            for role in Role.objects.filter(name=FORUM_ROLE_COMMUNITY_TA, course_id=course.id)
+            for user in role.users.all()
+        }
+        course_discussion_settings = get_course_discussion_settings(course.id)
+        cc_requester = cc_requester_call.result()
+    finally:
+        cc_requester_call.discard()
     cc_requester["course_id"] = course.id
-    course_discussion_settings = get_course_discussion_settings(course.id)
     return {
         "course": course,
         "request": request,
@@ -1158,7 +1158,7 @@ class GetCommentListTest(ForumsEnableMixin, CommentsServiceMockMixin, SharedModu
             page_size=14
         )
         self.assert_query_params_equal(
-            httpretty.httpretty.latest_requests[-2],
+            self.get_latest_request("/api/v1/threads/dummy"),
             {
                 "user_id": [str(self.user.id)],
                 "mark_as_read": ["False"],
@@ -0,0 +1,89 @@
+"""
+Tests for Discussion API concurrency helpers
+"""
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+
+import mock
+from django.test import TestCase
+from django.utils import translation
+from nose.plugins.attrib import attr
+
+from discussion_api.concurrency import RemoteCall, RemoteCallTimeout
+from django_comment_common.models import ForumsConfig
+from lms.lib.comment_client import utils as cc_utils
+
+
+@attr(shard=2)
+class RemoteCallTest(TestCase):
+    """Tests for RemoteCall"""
+
+    def test_result(self):
+        call = RemoteCall(u'add', lambda x, y: x + y, args=(1,), kwargs={'y': 2})
+        self.assertEqual(call.result(), 3)
+
+    def test_runs_on_worker_thread(self):
+        call = RemoteCall(u'thread', threading.current_thread)
+        self.assertNotEqual(call.result(), threading.current_thread())
+
+    def test_exception(self):
+        def fail():
+            """Raises a ValueError."""
+            raise ValueError('failed')
+
+        call = RemoteCall(u'fail', fail)
+        with self.assertRaises(ValueError):
+            call.result()
+
+    def test_timeout(self):
+        event = threading.Event()
+        call = RemoteCall(u'wait', event.wait, timeout=0.1)
+        with self.assertRaises(RemoteCallTimeout):
+            call.result()
+        event.set()
+
+    def test_discard_does_not_wait(self):
+        event = threading.Event()
+        call = RemoteCall(u'wait', event.wait)
+        start = time.time()
+        call.discard()
+        self.assertLess(time.time() - start, 1)
+        event.set()
+
+    def test_runs_inline_when_workers_busy(self):
+        pool = ThreadPool(1)
+        self.addCleanup(pool.terminate)
+        event = threading.Event()
+        with mock.patch(
+            'discussion_api.concurrency._get_pool', return_value=(pool, threading.BoundedSemaphore(1))
+        ):
+            stuck_call = RemoteCall(u'wait', event.wait, timeout=0.1)
+            with self.assertRaises(RemoteCallTimeout):
+                stuck_call.result()
+
+            # The worker is still busy with the call that timed out.
+            call = RemoteCall(u'thread', threading.current_thread)
+            self.assertEqual(call.result(), threading.current_thread())
+
+            # And is used again once that call completes.
+            event.set()
+            stuck_call._async_result.wait(1)  # pylint: disable=protected-access
+            call = RemoteCall(u'thread', threading.current_thread)
+            self.assertNotEqual(call.result(), threading.current_thread())
+
+    def test_caller_config_and_language(self):
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        def get_config_and_language():
+            """Returns the forums config and language seen by the worker thread."""
+            thread_config = getattr(cc_utils._thread_config, 'config', None)  # pylint: disable=protected-access
+            return thread_config, translation.get_language()
+
+        with translation.override('eo'):
+            call = RemoteCall(u'config', get_config_and_language)
+            worker_config, worker_language = call.result()
+        self.assertEqual(worker_config, ForumsConfig.current())
+        self.assertEqual(worker_language, 'eo')
@@ -1021,7 +1021,7 @@ class CommentViewSetListTest(DiscussionAPIViewTestMixin, ModuleStoreTestCase, Pr
             )
         )
         self.assert_query_params_equal(
-            httpretty.httpretty.latest_requests[-2],
+            self.get_latest_request("/api/v1/threads/{}".format(self.thread_id)),
             {
                 "resp_skip": ["0"],
                 "resp_limit": ["10"],
@@ -1055,7 +1055,7 @@ class CommentViewSetListTest(DiscussionAPIViewTestMixin, ModuleStoreTestCase, Pr
             {"developer_message": "Page not found (No results on this page)."}
         )
         self.assert_query_params_equal(
-            httpretty.httpretty.latest_requests[-2],
+            self.get_latest_request("/api/v1/threads/{}".format(self.thread_id)),
             {
                 "resp_skip": ["68"],
                 "resp_limit": ["4"],
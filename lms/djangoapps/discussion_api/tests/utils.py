@@ -6,6 +6,7 @@ import json
 import re
 from contextlib import closing
 from datetime import datetime
+from urlparse import urlparse
 
 import httpretty
 from PIL import Image
@@ -319,6 +320,15 @@ class CommentsServiceMockMixin(object):
         actual_params.pop("request_id")  # request_id is random
         self.assertEqual(actual_params, expected_params)
 
+    def get_latest_request(self, path):
+        """
+        Returns the latest mock request for the given path, for requests that
+        are sent concurrently with others and so in no particular order.
+        """
+        return [
+            request for request in httpretty.httpretty.latest_requests if urlparse(request.path).path == path
+        ][-1]
+
     def assert_last_query_params(self, expected_params):
         """
         Assert that the last mock request had the expected query parameters
@@ -50,7 +50,7 @@ class MockRequestSetupMixin(object):
 
 
 @attr(shard=2)
-@patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+@patch('lms.lib.comment_client.utils.send_request', autospec=True)
 class CreateThreadGroupIdTestCase(
         MockRequestSetupMixin,
         CohortedTestCase,
@@ -86,7 +86,7 @@ class CreateThreadGroupIdTestCase(
 
 
 @attr(shard=2)
-@patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+@patch('lms.lib.comment_client.utils.send_request', autospec=True)
 @disable_signal(views, 'thread_edited')
 @disable_signal(views, 'thread_voted')
 @disable_signal(views, 'thread_deleted')
@@ -345,7 +345,7 @@ class ViewsTestCaseMixin(object):
 
 @attr(shard=2)
 @ddt.ddt
-@patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+@patch('lms.lib.comment_client.utils.send_request', autospec=True)
 @disable_signal(views, 'thread_created')
 @disable_signal(views, 'thread_edited')
 class ViewsQueryCountTestCase(
@@ -399,7 +399,7 @@ class ViewsQueryCountTestCase(
 
 @attr(shard=2)
 @ddt.ddt
-@patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+@patch('lms.lib.comment_client.utils.send_request', autospec=True)
 class ViewsTestCase(
         ForumsEnableMixin,
         UrlResetMixin,
@@ -1027,7 +1027,7 @@ class ViewsTestCase(
 
 
 @attr(shard=2)
-@patch("lms.lib.comment_client.utils.requests.request", autospec=True)
+@patch("lms.lib.comment_client.utils.send_request", autospec=True)
 @disable_signal(views, 'comment_endorsed')
 class ViewPermissionsTestCase(ForumsEnableMixin, UrlResetMixin, SharedModuleStoreTestCase, MockRequestSetupMixin):
 
@@ -1157,7 +1157,7 @@ class CreateThreadUnicodeTestCase(
         cls.student = UserFactory.create()
         CourseEnrollmentFactory(user=cls.student, course_id=cls.course.id)
 
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def _test_unicode_data(self, text, mock_request,):
         """
         Test to make sure unicode data in a thread doesn't break it.
@@ -1201,7 +1201,7 @@ class UpdateThreadUnicodeTestCase(
         CourseEnrollmentFactory(user=cls.student, course_id=cls.course.id)
 
     @patch('django_comment_client.utils.get_discussion_categories_ids', return_value=["test_commentable"])
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def _test_unicode_data(self, text, mock_request, mock_get_discussion_id_map):
         self._set_mock_request_data(mock_request, {
             "user_id": str(self.student.id),
@@ -1243,7 +1243,7 @@ class CreateCommentUnicodeTestCase(
         cls.student = UserFactory.create()
         CourseEnrollmentFactory(user=cls.student, course_id=cls.course.id)
 
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def _test_unicode_data(self, text, mock_request):
         commentable_id = "non_team_dummy_id"
         self._set_mock_request_data(mock_request, {
@@ -1291,7 +1291,7 @@ class UpdateCommentUnicodeTestCase(
         cls.student = UserFactory.create()
         CourseEnrollmentFactory(user=cls.student, course_id=cls.course.id)
 
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def _test_unicode_data(self, text, mock_request):
         self._set_mock_request_data(mock_request, {
             "user_id": str(self.student.id),
@@ -1332,7 +1332,7 @@ class CreateSubCommentUnicodeTestCase(
         cls.student = UserFactory.create()
         CourseEnrollmentFactory(user=cls.student, course_id=cls.course.id)
 
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def _test_unicode_data(self, text, mock_request):
         """
         Create a comment with unicode in it.
@@ -1361,7 +1361,7 @@ class CreateSubCommentUnicodeTestCase(
 
 @attr(shard=2)
 @ddt.ddt
-@patch("lms.lib.comment_client.utils.requests.request", autospec=True)
+@patch("lms.lib.comment_client.utils.send_request", autospec=True)
 @disable_signal(views, 'thread_voted')
 @disable_signal(views, 'thread_edited')
 @disable_signal(views, 'comment_created')
@@ -1656,7 +1656,7 @@ class ForumEventTestCase(ForumsEnableMixin, SharedModuleStoreTestCase, MockReque
         CourseAccessRoleFactory(course_id=cls.course.id, user=cls.student, role='Wizard')
 
     @patch('eventtracking.tracker.emit')
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def test_thread_event(self, __, mock_emit):
         request = RequestFactory().post(
             "dummy_url", {
@@ -1685,7 +1685,7 @@ class ForumEventTestCase(ForumsEnableMixin, SharedModuleStoreTestCase, MockReque
         self.assertEquals(event['anonymous_to_peers'], False)
 
     @patch('eventtracking.tracker.emit')
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def test_response_event(self, mock_request, mock_emit):
         """
         Check to make sure an event is fired when a user responds to a thread.
@@ -1711,7 +1711,7 @@ class ForumEventTestCase(ForumsEnableMixin, SharedModuleStoreTestCase, MockReque
         self.assertEqual(event['options']['followed'], True)
 
     @patch('eventtracking.tracker.emit')
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def test_comment_event(self, mock_request, mock_emit):
         """
         Ensure an event is fired when someone comments on a response.
@@ -1738,7 +1738,7 @@ class ForumEventTestCase(ForumsEnableMixin, SharedModuleStoreTestCase, MockReque
         self.assertEqual(event['options']['followed'], False)
 
     @patch('eventtracking.tracker.emit')
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     @ddt.data((
         'create_thread',
         'edx.forum.thread.created', {
@@ -1790,7 +1790,7 @@ class ForumEventTestCase(ForumsEnableMixin, SharedModuleStoreTestCase, MockReque
     )
     @ddt.unpack
     @patch('eventtracking.tracker.emit')
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def test_thread_voted_event(self, view_name, obj_id_name, obj_type, mock_request, mock_emit):
         undo = view_name.startswith('undo')
 
@@ -1853,7 +1853,7 @@ class UsersEndpointTestCase(ForumsEnableMixin, SharedModuleStoreTestCase, MockRe
         request.view_name = "users"
         return views.users(request, course_id=course_id.to_deprecated_string())
 
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def test_finds_exact_match(self, mock_request):
         self.set_post_counts(mock_request)
         response = self.make_request(username="other")
@@ -1863,7 +1863,7 @@ class UsersEndpointTestCase(ForumsEnableMixin, SharedModuleStoreTestCase, MockRe
             [{"id": self.other_user.id, "username": self.other_user.username}]
         )
 
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def test_finds_no_match(self, mock_request):
         self.set_post_counts(mock_request)
         response = self.make_request(username="othor")
@@ -1900,7 +1900,7 @@ class UsersEndpointTestCase(ForumsEnableMixin, SharedModuleStoreTestCase, MockRe
         self.assertIn("errors", content)
         self.assertNotIn("users", content)
 
-    @patch('lms.lib.comment_client.utils.requests.request', autospec=True)
+    @patch('lms.lib.comment_client.utils.send_request', autospec=True)
     def test_requires_matched_user_has_forum_content(self, mock_request):
         self.set_post_counts(mock_request, 0, 0)
         response = self.make_request(username="other")
@@ -1,11 +1,16 @@
 # -*- coding: utf-8 -*-
 import datetime
 import json
+import threading
+import time
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
 
 import ddt
 import mock
 from django.core.urlresolvers import reverse
 from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
 from django.utils.timezone import UTC as django_utc
 from mock import Mock, patch
 from nose.plugins.attrib import attr
@@ -24,12 +29,21 @@ from django_comment_common.models import CourseDiscussionSettings, ForumsConfig
 from django_comment_common.utils import get_course_discussion_settings, set_course_discussion_settings
 from edxmako import add_lookup
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory
-from lms.lib.comment_client.utils import CommentClientMaintenanceError, perform_request
+from lms.lib.comment_client.utils import (
+    CommentClientMaintenanceError,
+    RequestCoalescer,
+    get_request_coalescer,
+    get_session,
+    perform_request,
+    request_coalescer_override
+)
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups import cohorts
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, config_course_cohorts
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from request_cache.middleware import RequestCache
 from student.roles import CourseStaffRole
 from student.tests.factories import AdminFactory, CourseEnrollmentFactory, UserFactory
 from xmodule.modulestore import ModuleStoreEnum
@@ -1693,7 +1707,7 @@ class ClientConfigurationTestCase(TestCase):
         with self.assertRaises(CommentClientMaintenanceError):
             perform_request('GET', 'http://www.google.com')
 
-    @patch('requests.request')
+    @patch('lms.lib.comment_client.utils.send_request')
     def test_enabled(self, mock_request):
         """Ensures that requests proceed normally when forums are enabled."""
         config = ForumsConfig.current()
@@ -1710,6 +1724,122 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """
+    An HTTP server handling each request in its own thread.
+    """
+    pass
+
+
+class _StubCommentsServiceHandler(BaseHTTPRequestHandler):
+    """
+    Responds to every GET with an empty JSON object and a session cookie,
+    after `delay` seconds, recording the client port of each request.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Responds to a GET request.
+        """
+        self.server.requests.append(self.client_address[1])
+        time.sleep(self.server.delay)
+        body = '{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'sessionid=secret; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """
+        Keeps the test output quiet.
+        """
+        pass
+
+
+@attr(shard=1)
+@ddt.ddt
+class PooledRequestTestCase(CacheIsolationTestCase):
+    """
+    Tests the connection pooling, coalescing and caching of comments service requests,
+    against a stub comments service.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(PooledRequestTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _StubCommentsServiceHandler)
+        self.server.daemon_threads = True
+        self.server.requests = []
+        self.server.delay = 0
+        server_thread = threading.Thread(target=self.server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = 'http://127.0.0.1:{}/api/v1/users/1'.format(self.server.server_address[1])
+
+    def test_connection_reused(self):
+        perform_request('get', self.url)
+        perform_request('get', self.url, {'page': 2})
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(len(set(self.server.requests)), 1)
+
+    def _perform_concurrent_requests(self, coalescers):
+        """
+        Performs the same request concurrently with each of the given
+        coalescers, and returns the results.
+        """
+        self.server.delay = 0.5
+        results = []
+
+        def perform(coalescer):
+            """
+            Performs the request with the given coalescer.
+            """
+            with request_coalescer_override(coalescer):
+                results.append(perform_request('get', self.url))
+
+        threads = [threading.Thread(target=perform, args=(coalescer,)) for coalescer in coalescers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_requests_coalesced(self):
+        results = self._perform_concurrent_requests([get_request_coalescer()] * 3)
+        self.assertEqual(results, [{}] * 3)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_requests_of_other_requests_not_coalesced(self):
+        coalescer = get_request_coalescer()
+        RequestCache.clear_request_cache()
+        self.assertIsNot(get_request_coalescer(), coalescer)
+
+        results = self._perform_concurrent_requests([RequestCoalescer(), RequestCoalescer()])
+        self.assertEqual(results, [{}] * 2)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_cookies_not_kept(self):
+        perform_request('get', self.url)
+        self.assertEqual(len(get_session().cookies), 0)
+
+    @ddt.data(0, 60)
+    def test_response_cache(self, timeout):
+        with override_settings(COMMENTS_SERVICE_RESPONSE_CACHE_TIMEOUT=timeout):
+            for __ in range(2):
+                self.assertEqual(perform_request('get', self.url, cacheable=True), {})
+            perform_request('get', self.url)
+        self.assertEqual(len(self.server.requests), 2 if timeout else 3)
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
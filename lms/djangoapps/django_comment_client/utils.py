@@ -15,7 +15,7 @@ from opaque_keys.edx.locations import i4xEncoder
 
 import pystache_custom as pystache
 from courseware import courses
-from courseware.access import has_access
+from courseware.access import has_access, has_access_many
 from django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 from django_comment_client.permissions import check_permissions_by_view, get_team, has_permission
 from django_comment_client.settings import MAX_COMMENT_DEPTH
@@ -130,11 +130,12 @@ def get_accessible_discussion_xblocks(course, user, include_all=False):  # pylin
     are accessible to the given user.
     """
     all_xblocks = modulestore().get_items(course.id, qualifiers={'category': 'discussion'}, include_orphans=False)
+    xblocks = [xblock for xblock in all_xblocks if has_required_keys(xblock)]
+    if include_all:
+        return xblocks
 
-    return [
-        xblock for xblock in all_xblocks
-        if has_required_keys(xblock) and (include_all or has_access(user, 'load', xblock, course.id))
-    ]
+    access = has_access_many(user, 'load', xblocks, course.id)
+    return [xblock for xblock in xblocks if access[xblock.location]]
 
 
 def get_discussion_id_map_entry(xblock):
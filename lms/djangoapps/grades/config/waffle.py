@@ -11,6 +11,7 @@ WAFFLE_NAMESPACE = u'grades'
 WRITE_ONLY_IF_ENGAGED = u'write_only_if_engaged'
 ASSUME_ZERO_GRADE_IF_ABSENT = u'assume_zero_grade_if_absent'
 ESTIMATE_FIRST_ATTEMPTED = u'estimate_first_attempted'
+COMPACT_VISIBLE_BLOCKS = u'compact_visible_blocks'
 
 
 def waffle():
@@ -0,0 +1,138 @@
+"""
+Rewrite the visible blocks of persistent grades in the compact serialization.
+
+Rows keep their hash, so the grades referring to them are unaffected. In dry
+run mode, only reports the savings in size and the time taken to decode rows
+in each serialization.
+"""
+import logging
+from textwrap import dedent
+from time import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from lms.djangoapps.grades.models import BlockRecordList, VisibleBlocks
+from openedx.core.lib.command_utils import get_mutually_exclusive_required_option, parse_course_keys
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Rewrite the visible blocks of persistent grades in the compact serialization.
+    """
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        """
+        Add arguments to the command parser.
+        """
+        parser.add_argument(
+            '--dry_run',
+            action='store_true',
+            default=False,
+            dest='dry_run',
+            help="Report the size and decoding time of each serialization, without rewriting any rows.",
+        )
+        parser.add_argument(
+            '--courses',
+            dest='courses',
+            nargs='+',
+            help='Rewrite the visible blocks of the list of courses provided.',
+        )
+        parser.add_argument(
+            '--all_courses',
+            action='store_true',
+            dest='all_courses',
+            default=False,
+            help='Rewrite the visible blocks of all courses.',
+        )
+        parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=1000,
+            dest='batch_size',
+            help='Number of rows rewritten per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        courses_mode = get_mutually_exclusive_required_option(options, 'courses', 'all_courses')
+        visible_blocks = VisibleBlocks.objects.order_by('id')
+        if courses_mode == 'courses':
+            visible_blocks = visible_blocks.filter(course_id__in=parse_course_keys(options['courses']))
+
+        stats = _CompactionStats()
+        last_id = 0
+        while True:
+            batch = list(visible_blocks.filter(id__gt=last_id)[:options['batch_size']])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            with transaction.atomic():
+                for row in batch:
+                    compact_value = stats.compact(row)
+                    if compact_value is not None and not options['dry_run']:
+                        VisibleBlocks.objects.filter(id=row.id).update(blocks_json=compact_value)
+            log.info("compact_visible_blocks: Processed rows up to id %d.", last_id)
+
+        stats.log(options['dry_run'])
+
+
+class _CompactionStats(object):
+    """
+    The sizes and decoding times of the rows compacted by the command.
+    """
+    def __init__(self):
+        self.rows = 0
+        self.compacted = 0
+        self.skipped = 0
+        self.json_size = 0
+        self.compact_size = 0
+        self.json_decode_time = 0.0
+        self.compact_decode_time = 0.0
+
+    def compact(self, row):
+        """
+        Returns the compact serialization of the visible blocks of the given
+        row, or None if it is already compact or its hash would not be kept.
+        """
+        self.rows += 1
+        if not row.blocks_json.startswith(u'{'):
+            return None
+
+        start = time()
+        blocks = BlockRecordList.from_json(row.blocks_json)
+        self.json_decode_time += time() - start
+
+        compact_value = blocks.compact_value
+        start = time()
+        compact_blocks = BlockRecordList.from_json(compact_value)
+        self.compact_decode_time += time() - start
+
+        if compact_blocks.hash_value != row.hashed:
+            log.warning("compact_visible_blocks: Skipping row %d, whose hash would change.", row.id)
+            self.skipped += 1
+            return None
+
+        self.compacted += 1
+        self.json_size += len(row.blocks_json)
+        self.compact_size += len(compact_value)
+        return compact_value
+
+    def log(self, dry_run):
+        """
+        Logs the totals of the command.
+        """
+        log.info(
+            "compact_visible_blocks: %s %d of %d row(s), skipped %d. Size: %d to %d characters. "
+            "Decoding time: %.3fs to %.3fs.",
+            "Would compact" if dry_run else "Compacted",
+            self.compacted,
+            self.rows,
+            self.skipped,
+            self.json_size,
+            self.compact_size,
+            self.json_decode_time,
+            self.compact_decode_time,
+        )
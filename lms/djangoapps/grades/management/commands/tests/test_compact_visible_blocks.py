@@ -0,0 +1,49 @@
+"""
+Tests for compact_visible_blocks management command.
+"""
+from django.core.management import call_command
+from django.test import TestCase
+from opaque_keys.edx.locator import CourseLocator
+
+from lms.djangoapps.grades.models import BlockRecord, BlockRecordList, VisibleBlocks
+
+
+class TestCompactVisibleBlocks(TestCase):
+    """
+    Tests compact_visible_blocks management command.
+    """
+    def setUp(self):
+        super(TestCompactVisibleBlocks, self).setUp()
+        self.block_record_lists = []
+        for run in ('run_1', 'run_2'):
+            course_key = CourseLocator(org='some_org', course='some_course', run=run)
+            block_record_list = BlockRecordList.from_list(
+                [BlockRecord(course_key.make_usage_key('problem', 'problem'), 1, 2, True)], course_key
+            )
+            VisibleBlocks.objects.create_from_blockrecords(block_record_list)
+            self.block_record_lists.append(block_record_list)
+
+    def _assert_compacted(self, *compacted):
+        """
+        Asserts that only the given block record lists are stored compact,
+        and that all of them are read back unchanged.
+        """
+        for block_record_list in self.block_record_lists:
+            row = VisibleBlocks.objects.get(hashed=block_record_list.hash_value)
+            self.assertEqual(
+                row.blocks_json,
+                block_record_list.compact_value if block_record_list in compacted else block_record_list.json_value,
+            )
+            self.assertEqual(row.blocks, block_record_list)
+
+    def test_dry_run(self):
+        call_command('compact_visible_blocks', '--dry_run', '--all_courses')
+        self._assert_compacted()
+
+    def test_courses(self):
+        call_command('compact_visible_blocks', '--courses', unicode(self.block_record_lists[0].course_key))
+        self._assert_compacted(self.block_record_lists[0])
+
+    def test_all_courses(self):
+        call_command('compact_visible_blocks', '--all_courses', '--batch_size', '1')
+        self._assert_compacted(*self.block_record_lists)
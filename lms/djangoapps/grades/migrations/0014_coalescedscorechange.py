@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import openedx.core.djangoapps.xmodule_django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grades', '0013_persistent_vertical_grade'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoalescedScoreChange',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('user_id', models.IntegerField()),
+                ('course_id', openedx.core.djangoapps.xmodule_django.models.CourseKeyField(max_length=255)),
+                ('only_if_higher', models.BooleanField(default=False)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('task_kwargs', models.TextField()),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='coalescedscorechange',
+            index_together=set([('user_id', 'course_id', 'only_if_higher')]),
+        ),
+    ]
@@ -34,6 +34,10 @@ log = logging.getLogger(__name__)
 
 BLOCK_RECORD_LIST_VERSION = 1
 
+# Version of the compact serialization of block record lists. See
+# BlockRecordList.compact_value.
+COMPACT_BLOCK_RECORD_LIST_VERSION = 2
+
 # Used to serialize information about a block at the time it was used in
 # grade calculation.
 BlockRecord = namedtuple('BlockRecord', ['locator', 'weight', 'raw_possible', 'graded'])
@@ -127,12 +131,48 @@ class BlockRecordList(tuple):
             sort_keys=True,
         )
 
+    @lazy
+    def compact_value(self):
+        """
+        Return a compact JSON serialization of the list of block records: a
+        list of the serialization version, the course key, the block types of
+        the blocks, and a [block type index, block id, weight, raw_possible,
+        graded] list per block. Unlike json_value, blocks are identified
+        relative to the course rather than by their full usage keys, and
+        their fields are not named.
+
+        The hash_value of a list of block records remains that of its
+        json_value, whichever serialization is stored.
+        """
+        block_types = []
+        block_type_indices = {}
+        blocks = []
+        for block in self:
+            block_type = block.locator.block_type
+            if block_type not in block_type_indices:
+                block_type_indices[block_type] = len(block_types)
+                block_types.append(block_type)
+            blocks.append([
+                block_type_indices[block_type],
+                block.locator.block_id,
+                block.weight,
+                block.raw_possible,
+                block.graded,
+            ])
+        return json.dumps(
+            [COMPACT_BLOCK_RECORD_LIST_VERSION, unicode(self.course_key), block_types, blocks],
+            separators=(',', ':'),
+        )
+
     @classmethod
     def from_json(cls, blockrecord_json):
         """
-        Return a BlockRecordList from previously serialized json.
+        Return a BlockRecordList from previously serialized json, in either
+        the json_value or the compact_value serialization.
         """
         data = json.loads(blockrecord_json)
+        if isinstance(data, list):
+            return cls._from_compact_data(data)
         course_key = CourseKey.from_string(data['course_key'])
         block_dicts = data['blocks']
         record_generator = (
@@ -146,6 +186,25 @@ class BlockRecordList(tuple):
         )
         return cls(record_generator, course_key, version=data['version'])
 
+    @classmethod
+    def _from_compact_data(cls, data):
+        """
+        Return a BlockRecordList from the decoded compact_value
+        serialization of one.
+        """
+        __, course_key, block_types, blocks = data
+        course_key = CourseKey.from_string(course_key)
+        record_generator = (
+            BlockRecord(
+                locator=course_key.make_usage_key(block_types[block_type_index], block_id),
+                weight=weight,
+                raw_possible=raw_possible,
+                graded=graded,
+            )
+            for block_type_index, block_id, weight, raw_possible, graded in blocks
+        )
+        return cls(record_generator, course_key)
+
     @classmethod
     def from_list(cls, blocks, course_key):
         """
@@ -167,7 +226,7 @@ class VisibleBlocksQuerySet(models.QuerySet):
         """
         model, _ = self.get_or_create(
             hashed=blocks.hash_value,
-            defaults={u'blocks_json': blocks.json_value, u'course_id': blocks.course_key},
+            defaults={u'blocks_json': VisibleBlocks.serialize(blocks), u'course_id': blocks.course_key},
         )
         return model
 
@@ -180,6 +239,11 @@ class VisibleBlocks(models.Model):
     This state is represented using an array of BlockRecord, stored
     in the blocks_json field. A hash of this json array is used for lookup
     purposes.
+
+    Once the COMPACT_VISIBLE_BLOCKS waffle switch is enabled, blocks_json
+    is stored in the compact serialization of BlockRecordList instead (see
+    the compact_visible_blocks management command for existing rows). Both
+    serializations are read, and are hashed alike.
     """
     CACHE_NAMESPACE = u"grades.models.VisibleBlocks"
     blocks_json = models.TextField()
@@ -197,13 +261,26 @@ class VisibleBlocks(models.Model):
         """
         return u"VisibleBlocks object - hash:{}, raw json:'{}'".format(self.hashed, self.blocks_json)
 
+    _decoded_blocks = None
+
     @property
     def blocks(self):
         """
         Returns the blocks_json data stored on this model as a list of
         BlockRecords in the order they were provided.
         """
-        return BlockRecordList.from_json(self.blocks_json)
+        if self._decoded_blocks is None:
+            self._decoded_blocks = BlockRecordList.from_json(self.blocks_json)
+        return self._decoded_blocks
+
+    @staticmethod
+    def serialize(block_record_list):
+        """
+        Returns the blocks_json value to store for the given BlockRecordList.
+        """
+        if waffle.waffle().is_enabled(waffle.COMPACT_VISIBLE_BLOCKS):
+            return block_record_list.compact_value
+        return block_record_list.json_value
 
     @classmethod
     def bulk_read(cls, course_key):
@@ -231,7 +308,7 @@ class VisibleBlocks(models.Model):
         """
         created = cls.objects.bulk_create([
             VisibleBlocks(
-                blocks_json=brl.json_value,
+                blocks_json=cls.serialize(brl),
                 hashed=brl.hash_value,
                 course_id=course_key,
             )
@@ -340,6 +417,8 @@ class PersistentSubsectionGrade(DeleteGradesMixin, TimeStampedModel):
     # track which blocks were visible at the time of grade calculation
     visible_blocks = models.ForeignKey(VisibleBlocks, db_column='visible_blocks_hash', to_field='hashed')
 
+    CACHE_NAMESPACE = u"grades.models.PersistentSubsectionGrade"
+
     @property
     def full_usage_key(self):
         """
@@ -389,17 +468,33 @@ class PersistentSubsectionGrade(DeleteGradesMixin, TimeStampedModel):
     @classmethod
     def bulk_read_grades(cls, user_id, course_key):
         """
-        Reads all grades for the given user and course.
+        Reads all grades for the given user and course, from the grades
+        prefetched for the user, if any.
 
         Arguments:
             user_id: The user associated with the desired grades
             course_key: The course identifier for the desired grades
         """
+        prefetched_grades = _pop_prefetched_grades(cls, user_id, course_key)
+        if prefetched_grades is not None:
+            return prefetched_grades
         return cls.objects.select_related('visible_blocks').filter(
             user_id=user_id,
             course_id=course_key,
         )
 
+    @classmethod
+    def prefetch(cls, course_key, users):
+        """
+        Prefetches the grades of the given users for the given course, in a
+        single query. See _prefetch_grades.
+        """
+        _prefetch_grades(cls, course_key, users)
+
+    @classmethod
+    def _cache_key(cls, course_key):
+        return u"subsection_grades_cache.{}".format(course_key)
+
     @classmethod
     def update_or_create_grade(cls, **params):
         """
@@ -584,6 +679,8 @@ class PersistentVerticalGrade(DeleteGradesMixin, TimeStampedModel):
     # track which blocks were visible at the time of grade calculation
     visible_blocks = models.ForeignKey(VisibleBlocks, db_column='visible_blocks_hash', to_field='hashed')
 
+    CACHE_NAMESPACE = u"grades.models.PersistentVerticalGrade"
+
     @property
     def full_usage_key(self):
         """
@@ -631,16 +728,32 @@ class PersistentVerticalGrade(DeleteGradesMixin, TimeStampedModel):
     @classmethod
     def bulk_read_grades(cls, user_id, course_key):
         """
-        Reads all grades for the given user and course.
+        Reads all grades for the given user and course, from the grades
+        prefetched for the user, if any.
          Arguments:
             user_id: The user associated with the desired grades
             course_key: The course identifier for the desired grades
         """
+        prefetched_grades = _pop_prefetched_grades(cls, user_id, course_key)
+        if prefetched_grades is not None:
+            return prefetched_grades
         return cls.objects.select_related('visible_blocks').filter(
             user_id=user_id,
             course_id=course_key,
         )
 
+    @classmethod
+    def prefetch(cls, course_key, users):
+        """
+        Prefetches the grades of the given users for the given course, in a
+        single query. See _prefetch_grades.
+        """
+        _prefetch_grades(cls, course_key, users)
+
+    @classmethod
+    def _cache_key(cls, course_key):
+        return u"vertical_grades_cache.{}".format(course_key)
+
     @classmethod
     def update_or_create_grade(cls, **params):
         """
@@ -769,6 +882,36 @@ class PersistentVerticalGrade(DeleteGradesMixin, TimeStampedModel):
             )
 
 
+def _prefetch_grades(model_class, course_key, users):
+    """
+    Prefetches into the request cache the grades of the given model class
+    (PersistentSubsectionGrade or PersistentVerticalGrade) for the given users
+    and course, in a single query, for bulk_read_grades to consume.
+    """
+    prefetched_grades = {user.id: [] for user in users}
+    grades = model_class.objects.select_related('visible_blocks').filter(
+        user_id__in=list(prefetched_grades),
+        course_id=course_key,
+    )
+    for grade in grades:
+        prefetched_grades[grade.user_id].append(grade)
+    cache_key = model_class._cache_key(course_key)  # pylint: disable=protected-access
+    get_cache(model_class.CACHE_NAMESPACE)[cache_key] = prefetched_grades
+
+
+def _pop_prefetched_grades(model_class, user_id, course_key):
+    """
+    Returns the grades prefetched by _prefetch_grades for the given user and
+    course, or None if they were not prefetched. Prefetched grades are only
+    returned once, since the caller may go on to update them.
+    """
+    cache_key = model_class._cache_key(course_key)  # pylint: disable=protected-access
+    prefetched_grades = get_cache(model_class.CACHE_NAMESPACE).get(cache_key)
+    if prefetched_grades is None:
+        return None
+    return prefetched_grades.pop(user_id, None)
+
+
 class PersistentCourseGrade(DeleteGradesMixin, TimeStampedModel):
     """
     A django model tracking persistent course grades.
@@ -907,3 +1050,70 @@ class PersistentCourseGrade(DeleteGradesMixin, TimeStampedModel):
                     'grading_policy_hash': unicode(grade.grading_policy_hash),
                 }
             )
+
+
+class CoalescedScoreChange(models.Model):
+    """
+    A django model tracking the score changes awaiting a grades
+    recalculation of the user's score changes in the course, so that score
+    changes coalesced into another's recalculation are not lost. See
+    lms.djangoapps.grades.tasks.coalesce_recalculation.
+
+    Rows are deleted once a recalculation covered them.
+    """
+
+    class Meta(object):
+        app_label = "grades"
+        index_together = [
+            ('user_id', 'course_id', 'only_if_higher'),
+        ]
+
+    user_id = models.IntegerField(blank=False)
+    course_id = CourseKeyField(blank=False, max_length=255)
+    only_if_higher = models.BooleanField(default=False)
+    created = models.DateTimeField(auto_now_add=True)
+
+    # Keyword arguments of the recalculate_grades_v3 task for the score change.
+    task_kwargs = models.TextField()
+
+    def __unicode__(self):
+        """
+        Returns a string representation of this model.
+        """
+        return u"{} user: {}, course: {}, created: {}".format(
+            type(self).__name__, self.user_id, self.course_id, self.created,
+        )
+
+    @property
+    def score_change(self):
+        """
+        Returns the keyword arguments of the recalculate_grades_v3 task for
+        the score change.
+        """
+        return json.loads(self.task_kwargs)
+
+    @classmethod
+    def record(cls, score_change):
+        """
+        Records the score change given as the keyword arguments of its
+        recalculate_grades_v3 task.
+        """
+        return cls.objects.create(
+            user_id=score_change['user_id'],
+            course_id=CourseKey.from_string(score_change['course_id']),
+            only_if_higher=bool(score_change['only_if_higher']),
+            task_kwargs=json.dumps(score_change),
+        )
+
+    @classmethod
+    def pending(cls, score_change):
+        """
+        Returns the score changes awaiting recalculation alongside the given
+        one, in the order they were recorded. Only score changes with the
+        same only_if_higher are recalculated together.
+        """
+        return cls.objects.filter(
+            user_id=score_change['user_id'],
+            course_id=CourseKey.from_string(score_change['course_id']),
+            only_if_higher=bool(score_change['only_if_higher']),
+        ).order_by('id')
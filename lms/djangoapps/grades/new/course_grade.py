@@ -240,9 +240,13 @@ class CourseGrade(CourseGradeBase):
     Course Grade class when grades are updated or read from storage.
     """
     def __init__(self, user, course_data, *args, **kwargs):
+        vertical_grade_factory = kwargs.pop('vertical_grade_factory', None)
+        subsection_grade_factory = kwargs.pop('subsection_grade_factory', None)
         super(CourseGrade, self).__init__(user, course_data, *args, **kwargs)
-        self._vertical_grade_factory = VerticalGradeFactory(user, course_data=course_data)
-        self._subsection_grade_factory = SubsectionGradeFactory(user, course_data=course_data)
+        self._vertical_grade_factory = vertical_grade_factory or VerticalGradeFactory(user, course_data=course_data)
+        self._subsection_grade_factory = (
+            subsection_grade_factory or SubsectionGradeFactory(user, course_data=course_data)
+        )
 
     def update(self):
         """
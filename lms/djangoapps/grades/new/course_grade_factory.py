@@ -74,16 +74,32 @@ class CourseGradeFactory(object):
             course_structure=None,
             course_key=None,
             force_update_subsections=False,
+            subsection_grade_factory=None,
+            vertical_grade_factory=None,
     ):
         """
         Computes, updates, and returns the CourseGrade for the given
         user in the course.
 
         At least one of course, collected_block_structure, course_structure,
-        or course_key should be provided.
+        course_key or subsection_grade_factory should be provided.
+
+        The given subsection_grade_factory and vertical_grade_factory of the
+        user in the course, if any, are used to get the grades of the course
+        grade, reusing the scores and grades they already loaded.
         """
-        course_data = CourseData(user, course, collected_block_structure, course_structure, course_key)
-        return self._update(user, course_data, read_only=False, force_update_subsections=force_update_subsections)
+        if subsection_grade_factory is not None:
+            course_data = subsection_grade_factory.course_data
+        else:
+            course_data = CourseData(user, course, collected_block_structure, course_structure, course_key)
+        return self._update(
+            user,
+            course_data,
+            read_only=False,
+            force_update_subsections=force_update_subsections,
+            subsection_grade_factory=subsection_grade_factory,
+            vertical_grade_factory=vertical_grade_factory,
+        )
 
     @contextmanager
     def _course_transaction(self, course_key):
@@ -179,14 +195,27 @@ class CourseGradeFactory(object):
         return course_grade, persistent_grade.grading_policy_hash
 
     @staticmethod
-    def _update(user, course_data, read_only, force_update_subsections=False):
+    def _update(
+            user,
+            course_data,
+            read_only,
+            force_update_subsections=False,
+            subsection_grade_factory=None,
+            vertical_grade_factory=None,
+    ):
         """
         Computes, saves, and returns a CourseGrade object for the
         given user and course.
         Sends a COURSE_GRADE_CHANGED signal to listeners and a
         COURSE_GRADE_NOW_PASSED if learner has passed course.
         """
-        course_grade = CourseGrade(user, course_data, force_update_subsections=force_update_subsections)
+        course_grade = CourseGrade(
+            user,
+            course_data,
+            force_update_subsections=force_update_subsections,
+            subsection_grade_factory=subsection_grade_factory,
+            vertical_grade_factory=vertical_grade_factory,
+        )
         course_grade.update()
 
         should_persist = (
@@ -134,7 +134,8 @@ class SubsectionGradeFactory(object):
     def _get_bulk_cached_subsection_grades(self):
         """
         Returns and caches (for future access) the results of
-        a bulk retrieval of all subsection grades in the course.
+        a bulk retrieval of all subsection grades in the course, which
+        uses the grades prefetched by PersistentSubsectionGrade.prefetch, if any.
         """
         if self._cached_subsection_grades is None:
             self._cached_subsection_grades = {
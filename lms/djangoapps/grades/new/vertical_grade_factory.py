@@ -131,7 +131,8 @@ class VerticalGradeFactory(object):
     def _get_bulk_cached_vertical_grades(self):
         """
         Returns and caches (for future access) the results of
-        a bulk retrieval of all vertical grades in the course.
+        a bulk retrieval of all vertical grades in the course, which
+        uses the grades prefetched by PersistentVerticalGrade.prefetch, if any.
         """
         if self._cached_vertical_grades is None:
             self._cached_vertical_grades = {
@@ -8,8 +8,6 @@ from crum import get_current_user
 from django.conf import settings
 from django.dispatch import receiver
 from xblock.scorable import ScorableXBlockMixin, Score
-from xmodule.modulestore.django import modulestore
-from opaque_keys.edx.keys import CourseKey
 
 from courseware.model_data import get_score, set_score
 from eventtracking import tracker
@@ -27,7 +25,7 @@ from util.date_utils import to_timestamp
 from ..constants import ScoreDatabaseTableEnum
 from ..new.course_grade_factory import CourseGradeFactory
 from ..scores import weighted_score
-from ..tasks import RECALCULATE_GRADE_DELAY, recalculate_subsection_grade_v3, recalculate_vertical_grade_v3
+from ..tasks import RECALCULATE_GRADE_DELAY, coalesce_recalculation, recalculate_grades_v3
 from .signals import (
     PROBLEM_RAW_SCORE_CHANGED,
     PROBLEM_WEIGHTED_SCORE_CHANGED,
@@ -220,24 +218,27 @@ def enqueue_subsection_update(sender, **kwargs):  # pylint: disable=unused-argum
     enqueueing a subsection update operation to occur asynchronously.
     """
     _emit_event(kwargs)
-    course_obj = modulestore().get_course(CourseKey.from_string(str(kwargs['course_id'])), depth=0)
-    recalculate_method = recalculate_vertical_grade_v3 if course_obj.enable_vertical_grading\
-        else recalculate_subsection_grade_v3
-    result = recalculate_method.apply_async(
-        kwargs=dict(
-            user_id=kwargs['user_id'],
-            anonymous_user_id=kwargs.get('anonymous_user_id'),
-            course_id=kwargs['course_id'],
-            usage_id=kwargs['usage_id'],
-            only_if_higher=kwargs.get('only_if_higher'),
-            expected_modified_time=to_timestamp(kwargs['modified']),
-            score_deleted=kwargs.get('score_deleted', False),
-            event_transaction_id=unicode(get_event_transaction_id()),
-            event_transaction_type=unicode(get_event_transaction_type()),
-            score_db_table=kwargs['score_db_table'],
-        ),
-        countdown=RECALCULATE_GRADE_DELAY,
+    task_kwargs = dict(
+        user_id=kwargs['user_id'],
+        anonymous_user_id=kwargs.get('anonymous_user_id'),
+        course_id=kwargs['course_id'],
+        usage_id=kwargs['usage_id'],
+        only_if_higher=kwargs.get('only_if_higher'),
+        expected_modified_time=to_timestamp(kwargs['modified']),
+        score_deleted=kwargs.get('score_deleted', False),
+        event_transaction_id=unicode(get_event_transaction_id()),
+        event_transaction_type=unicode(get_event_transaction_type()),
+        score_db_table=kwargs['score_db_table'],
     )
+    if not coalesce_recalculation(task_kwargs):
+        log.info(
+            u'Grades: Coalesced async calculation of subsection grades for user: {}, course: {}, usage: {}'.format(
+                kwargs['user_id'], kwargs['course_id'], kwargs['usage_id'],
+            )
+        )
+        return
+
+    result = recalculate_grades_v3.apply_async(kwargs=task_kwargs, countdown=RECALCULATE_GRADE_DELAY)
     log.info(
         u'Grades: Request async calculation of subsection grades with args: {}. Task [{}]'.format(
             ', '.join('{}:{}'.format(arg, kwargs[arg]) for arg in sorted(kwargs)),
@@ -249,16 +250,20 @@ def enqueue_subsection_update(sender, **kwargs):  # pylint: disable=unused-argum
 @receiver(VERTICAL_SCORE_CHANGED)
 def recalculate_course_grade(sender, course, course_structure, user, **kwargs):  # pylint: disable=unused-argument
     """
-    Updates a saved course grade.
+    Updates a saved course grade, unless the sender already did.
     """
+    if kwargs.get('course_grade_updated'):
+        return
     CourseGradeFactory().update(user, course=course, course_structure=course_structure)
 
 
 @receiver(SUBSECTION_SCORE_CHANGED)
 def recalculate_course_grade(sender, course, course_structure, user, **kwargs):  # pylint: disable=unused-argument
     """
-    Updates a saved course grade.
+    Updates a saved course grade, unless the sender already did.
     """
+    if kwargs.get('course_grade_updated'):
+        return
     CourseGradeFactory().update(user, course=course, course_structure=course_structure)
 
 
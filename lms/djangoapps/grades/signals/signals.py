@@ -79,6 +79,7 @@ SUBSECTION_SCORE_CHANGED = Signal(
         'course_structure',  # BlockStructure object
         'user',  # User object
         'subsection_grade',  # SubsectionGrade object
+        'course_grade_updated',  # Boolean indicating whether the sender already updated the course grade
     ]
 )
 
@@ -92,6 +93,7 @@ VERTICAL_SCORE_CHANGED = Signal(
         'course_structure',  # BlockStructure object
         'user',  # User object
         'vertical_grade',  # VerticalGrade object
+        'course_grade_updated',  # Boolean indicating whether the sender already updated the course grade
     ]
 )
 
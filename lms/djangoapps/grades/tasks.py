@@ -2,8 +2,11 @@
 This module contains tasks for asynchronous execution of grade updates.
 """
 
+from datetime import timedelta
 from logging import getLogger
+from time import time
 
+import dogstats_wrapper as dog_stats_api
 import six
 from celery import task
 from celery_utils.logged_task import LoggedTask
@@ -11,7 +14,10 @@ from celery_utils.persist_on_failure import PersistOnFailureTask
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Max
 from django.db.utils import DatabaseError
+from django.utils.timezone import now
 from opaque_keys.edx.keys import CourseKey, UsageKey
 from opaque_keys.edx.locator import CourseLocator
 
@@ -22,13 +28,20 @@ from lms.djangoapps.grades.config.models import ComputeGradesSetting
 from openedx.core.djangoapps.monitoring_utils import set_custom_metric, set_custom_metrics_for_course_key
 from student.models import CourseEnrollment
 from submissions import api as sub_api
-from track.event_transaction_utils import set_event_transaction_id, set_event_transaction_type
+from track.event_transaction_utils import (
+    get_event_transaction_id,
+    get_event_transaction_type,
+    set_event_transaction_id,
+    set_event_transaction_type
+)
 from util.date_utils import from_timestamp
 from xmodule.modulestore.django import modulestore
 
 from .config.waffle import ESTIMATE_FIRST_ATTEMPTED, waffle
 from .constants import ScoreDatabaseTableEnum
 from .exceptions import DatabaseNotReadyError
+from .models import CoalescedScoreChange
+from .new.course_data import CourseData
 from .new.course_grade_factory import CourseGradeFactory
 from .new.subsection_grade_factory import SubsectionGradeFactory
 from .new.vertical_grade_factory import VerticalGradeFactory
@@ -43,6 +56,7 @@ KNOWN_RETRY_ERRORS = (  # Errors we expect occasionally, should be resolved on r
     DatabaseNotReadyError,
 )
 RECALCULATE_GRADE_DELAY = 2  # in seconds, to prevent excessive _has_db_updated failures. See TNL-6424.
+RECALCULATE_GRADE_COALESCED_TIMEOUT = 60 * 60  # in seconds, after which a coalescing window is no longer joined.
 
 
 class _BaseTask(PersistOnFailureTask, LoggedTask):  # pylint: disable=abstract-method
@@ -124,27 +138,57 @@ def compute_grades_for_course(course_key, offset, batch_size, **kwargs):  # pyli
 
 
 @task(bind=True, base=_BaseTask, default_retry_delay=30, routing_key=settings.RECALCULATE_GRADES_ROUTING_KEY)
-def recalculate_subsection_grade_v3(self, **kwargs):
+def recalculate_grades_v3(self, **kwargs):
     """
-    Latest version of the recalculate_subsection_grade task.  See docstring
-    for _recalculate_subsection_grade for further description.
+    Updates, in a single pass, the saved vertical or subsection grades and
+    the course grade affected by a score change, along with those of the
+    score changes coalesced into it. See docstring for _recalculate for its
+    arguments, and coalesce_recalculation for coalescing.
     """
-    _recalculate_subsection_grade(self, **kwargs)
+    if _should_defer_recalculation(kwargs):
+        _increment_recalculation_metric('deferred')
+        recalculate_grades_v3.apply_async(kwargs=kwargs, countdown=RECALCULATE_GRADE_DELAY)
+        return
 
+    pending_score_changes = list(CoalescedScoreChange.pending(kwargs))
+    _increment_recalculation_metric('executed')
+    _recalculate(self, _update_grades, pending_score_changes=pending_score_changes, **kwargs)
+
+    next_score_change = _close_coalescing_window(kwargs, pending_score_changes)
+    if next_score_change is not None:
+        # Score changes joined the window while it was closing.
+        recalculate_grades_v3.apply_async(kwargs=next_score_change, countdown=RECALCULATE_GRADE_DELAY)
+
+
+@task(bind=True, base=_BaseTask, default_retry_delay=30, routing_key=settings.RECALCULATE_GRADES_ROUTING_KEY)
+def recalculate_subsection_grade_v3(self, **kwargs):
+    """
+    Updates the saved subsection grades affected by a score change. See
+    docstring for _recalculate for its arguments.
+
+    Superseded by recalculate_grades_v3 for score changes.
+    """
+    _recalculate(self, _update_subsection_grades, **kwargs)
 
 
 @task(bind=True, base=_BaseTask, default_retry_delay=30, routing_key=settings.RECALCULATE_GRADES_ROUTING_KEY)
 def recalculate_vertical_grade_v3(self, **kwargs):
     """
-    Latest version of the recalculate_subsection_grade task.  See docstring
-    for _recalculate_subsection_grade for further description.
+    Updates the saved vertical grades affected by a score change. See
+    docstring for _recalculate for its arguments.
+
+    Superseded by recalculate_grades_v3 for score changes.
     """
-    _recalculate_vertical_grade(self, **kwargs)
+    _recalculate(self, _update_vertical_grades, **kwargs)
 
 
-def _recalculate_vertical_grade(self, **kwargs):
+def _recalculate(self, update_grades, pending_score_changes=None, **kwargs):
     """
-    Updates a saved vertical grade.
+    Updates saved grades after a score change, with the given function.
+
+    Given the CoalescedScoreChange objects pending alongside the score
+    change, the function also updates the grades affected by those that
+    were coalesced into it.
 
     Keyword Arguments:
         user_id (int): id of applicable User object
@@ -186,14 +230,39 @@ def _recalculate_vertical_grade(self, **kwargs):
         # process.
         has_database_updated = _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs)
 
+        update_grades_kwargs = {}
+        if pending_score_changes is not None:
+            score_changes = [pending_score_change.score_change for pending_score_change in pending_score_changes]
+            coalesced_score_changes = [score_change for score_change in score_changes if score_change != kwargs]
+
+            # The score change is recorded in the same transaction as the
+            # score, and score changes joining its coalescing window would
+            # be missed if it was recalculated before then.
+            if kwargs not in score_changes and not settings.CELERY_ALWAYS_EAGER:
+                has_database_updated = False
+
+            # Score changes coalesced into this one did not queue tasks of their
+            # own, so verify the database has been updated with them as well.
+            has_database_updated = has_database_updated and all(
+                _has_db_updated_with_new_score(
+                    self,
+                    UsageKey.from_string(score_change['usage_id']).replace(course_key=course_key),
+                    **score_change
+                )
+                for score_change in coalesced_score_changes
+            )
+            update_grades_kwargs['coalesced_score_changes'] = coalesced_score_changes
+
         if not has_database_updated:
             raise DatabaseNotReadyError
 
-        _update_vertical_grades(
+        update_grades(
             course_key,
             scored_block_usage_key,
             kwargs['only_if_higher'],
             kwargs['user_id'],
+            kwargs['expected_modified_time'],
+            **update_grades_kwargs
         )
     except Exception as exc:   # pylint: disable=broad-except
         if not isinstance(exc, KNOWN_RETRY_ERRORS):
@@ -205,67 +274,92 @@ def _recalculate_vertical_grade(self, **kwargs):
         raise self.retry(kwargs=kwargs, exc=exc)
 
 
-def _recalculate_subsection_grade(self, **kwargs):
+def coalesce_recalculation(score_change):
     """
-    Updates a saved subsection grade.
-
-    Keyword Arguments:
-        user_id (int): id of applicable User object
-        anonymous_user_id (int, OPTIONAL): Anonymous ID of the User
-        course_id (string): identifying the course
-        usage_id (string): identifying the course block
-        only_if_higher (boolean): indicating whether grades should
-            be updated only if the new raw_earned is higher than the
-            previous value.
-        expected_modified_time (serialized timestamp): indicates when the task
-            was queued so that we can verify the underlying data update.
-        score_deleted (boolean): indicating whether the grade change is
-            a result of the problem's score being deleted.
-        event_transaction_id (string): uuid identifying the current
-            event transaction.
-        event_transaction_type (string): human-readable type of the
-            event at the root of the current event transaction.
-        score_db_table (ScoreDatabaseTableEnum): database table that houses
-            the changed score. Used in conjunction with expected_modified_time.
+    Debounces the grades recalculations of the score changes of the given
+    user in the given course.
+
+    Score changes are recorded as CoalescedScoreChange objects, in the same
+    transaction as their scores. The first score change opens a coalescing
+    window, and queues a recalculate_grades_v3 task for it. The user's later
+    score changes in the course with the same only_if_higher join the window
+    rather than queueing their own tasks, and the task recalculates the
+    grades affected by all of them. The task is put off while score changes
+    keep joining the window within RECALCULATE_GRADES_DEBOUNCE_PERIOD
+    seconds of each other, but by no more than RECALCULATE_GRADES_MAX_DELAY
+    seconds. The window closes when the task deletes the score changes it
+    covered.
+
+    Joining a window locks the score change that opened it until the
+    joining transaction commits, so that the task either covers the joining
+    score change or finds it left over once it closes the window.
+
+    Arguments:
+        score_change (dict): keyword arguments of the recalculate_grades_v3
+            task for the score change.
+
+    Returns whether a recalculate_grades_v3 task is to be queued for the
+    score change.
     """
-    try:
-        course_key = CourseLocator.from_string(kwargs['course_id'])
-        scored_block_usage_key = UsageKey.from_string(kwargs['usage_id']).replace(course_key=course_key)
+    if settings.CELERY_ALWAYS_EAGER:
+        # Tasks run as soon as they are queued, before the window closes.
+        return True
+
+    window_opener_id = CoalescedScoreChange.pending(score_change).filter(
+        created__gte=now() - timedelta(seconds=RECALCULATE_GRADE_COALESCED_TIMEOUT),
+    ).values_list('id', flat=True).first()
+    with transaction.atomic():
+        # The window may have closed in the meantime.
+        joined = window_opener_id is not None and CoalescedScoreChange.objects.select_for_update().filter(
+            id=window_opener_id,
+        ).exists()
+        CoalescedScoreChange.record(score_change)
+
+    if not joined:
+        return True
+    _increment_recalculation_metric('collapsed')
+    return False
+
+
+def _should_defer_recalculation(score_change):
+    """
+    Returns whether the recalculation of the given score change is to be
+    put off, since the user's score changes in the course are still joining
+    its coalescing window.
+    """
+    last_change = CoalescedScoreChange.pending(score_change).aggregate(Max('created'))['created__max']
+    if last_change is None:
+        return False
+    return (
+        (now() - last_change).total_seconds() < settings.RECALCULATE_GRADES_DEBOUNCE_PERIOD and
+        time() - score_change['expected_modified_time'] < settings.RECALCULATE_GRADES_MAX_DELAY
+    )
 
-        set_custom_metrics_for_course_key(course_key)
-        set_custom_metric('usage_id', unicode(scored_block_usage_key))
 
-        # The request cache is not maintained on celery workers,
-        # where this code runs. So we take the values from the
-        # main request cache and store them in the local request
-        # cache. This correlates model-level grading events with
-        # higher-level ones.
-        set_event_transaction_id(kwargs.get('event_transaction_id'))
-        set_event_transaction_type(kwargs.get('event_transaction_type'))
+def _close_coalescing_window(score_change, pending_score_changes):
+    """
+    Closes the coalescing window of the given score change by deleting the
+    pending score changes its recalculation covered, so that the user's next
+    score changes queue a new recalculation.
 
-        # Verify the database has been updated with the scores when the task was
-        # created. This race condition occurs if the transaction in the task
-        # creator's process hasn't committed before the task initiates in the worker
-        # process.
-        has_database_updated = _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs)
+    Returns the keyword arguments of the recalculate_grades_v3 task for the
+    first of the score changes that were recorded in the meantime, or None.
+    """
+    pending_ids = [pending_score_change.id for pending_score_change in pending_score_changes]
+    with transaction.atomic():
+        # Wait for the score changes joining the window to commit.
+        list(CoalescedScoreChange.objects.select_for_update().filter(id__in=pending_ids).values_list('id', flat=True))
+        CoalescedScoreChange.objects.filter(id__in=pending_ids).delete()
 
-        if not has_database_updated:
-            raise DatabaseNotReadyError
+    next_score_change = CoalescedScoreChange.pending(score_change).first()
+    return next_score_change.score_change if next_score_change is not None else None
 
-        _update_subsection_grades(
-            course_key,
-            scored_block_usage_key,
-            kwargs['only_if_higher'],
-            kwargs['user_id'],
-        )
-    except Exception as exc:   # pylint: disable=broad-except
-        if not isinstance(exc, KNOWN_RETRY_ERRORS):
-            log.info("tnl-6244 grades unexpected failure: {}. task id: {}. kwargs={}".format(
-                repr(exc),
-                self.request.id,
-                kwargs,
-            ))
-        raise self.retry(kwargs=kwargs, exc=exc)
+
+def _increment_recalculation_metric(outcome):
+    """
+    Counts a grades recalculation task collapsed into another, deferred or executed.
+    """
+    dog_stats_api.increment('grades.recalculate_grades', tags=[u'outcome:{}'.format(outcome)])
 
 
 def _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs):
@@ -309,7 +403,13 @@ def _has_db_updated_with_new_score(self, scored_block_usage_key, **kwargs):
     return db_is_updated
 
 
-def _update_subsection_grades(course_key, scored_block_usage_key, only_if_higher, user_id):
+def _update_subsection_grades(
+        course_key,
+        scored_block_usage_key,
+        only_if_higher,
+        user_id,
+        expected_modified_time,  # pylint: disable=unused-argument
+):
     """
     A helper function to update subsection grades in the database
     for each subsection containing the given block, and to signal
@@ -349,6 +449,7 @@ def _update_vertical_grades(
         scored_block_usage_key,
         only_if_higher,
         user_id,
+        expected_modified_time,  # pylint: disable=unused-argument
 ):
     """
     A helper function to update vertical grades in the database
@@ -385,6 +486,98 @@ def _update_vertical_grades(
                 )
 
 
+def _update_grades(
+        course_key,
+        scored_block_usage_key,
+        only_if_higher,
+        user_id,
+        expected_modified_time,  # pylint: disable=unused-argument
+        coalesced_score_changes=(),
+):
+    """
+    A helper function to update, in a single transaction, the grades of
+    the user that the score of the given block counts towards: those of the
+    verticals (in courses graded by vertical) or subsections containing the
+    block, and the course grade. The user's course structure, course and
+    scores are loaded once for all of them.
+
+    The grades affected by the score changes coalesced into this one, given
+    as the keyword arguments of their recalculate_grades_v3 tasks, are
+    updated along with them. Coalesced score changes share only_if_higher.
+
+    Signals that those vertical or subsection grades were updated once they
+    are saved.
+    """
+    student = User.objects.get(id=user_id)
+    store = modulestore()
+    with store.bulk_operations(course_key):
+        course_structure = get_course_blocks(student, store.make_course_usage_key(course_key))
+        course = store.get_course(course_key, depth=0)
+        course_data = CourseData(student, course=course, structure=course_structure)
+        subsection_grade_factory = SubsectionGradeFactory(student, course_data=course_data)
+        vertical_grade_factory = VerticalGradeFactory(student, course_data=course_data)
+
+        if course.enable_vertical_grading:
+            grade_factory, field_name = vertical_grade_factory, 'verticals'
+        else:
+            grade_factory, field_name = subsection_grade_factory, 'subsections'
+
+        # Grades are updated under the event transaction of the first score
+        # change affecting them, and the course grade under this one's.
+        event_transaction = (unicode(get_event_transaction_id()), get_event_transaction_type())
+        score_changes = [(scored_block_usage_key, event_transaction)] + [
+            (
+                UsageKey.from_string(score_change['usage_id']).replace(course_key=course_key),
+                (score_change.get('event_transaction_id'), score_change.get('event_transaction_type')),
+            )
+            for score_change in coalesced_score_changes
+        ]
+
+        updated_grades = []
+        updated_block_keys = set()
+        with transaction.atomic():
+            for usage_key, score_change_event_transaction in score_changes:
+                _set_event_transaction(*score_change_event_transaction)
+                for block_key in course_structure.get_transformer_block_field(
+                        usage_key, GradesTransformer, field_name, set()
+                ):
+                    if block_key in course_structure and block_key not in updated_block_keys:
+                        updated_block_keys.add(block_key)
+                        grade = grade_factory.update(course_structure[block_key], only_if_higher)
+                        updated_grades.append((grade, score_change_event_transaction))
+
+            _set_event_transaction(*event_transaction)
+            CourseGradeFactory().update(
+                student,
+                subsection_grade_factory=subsection_grade_factory,
+                vertical_grade_factory=vertical_grade_factory,
+            )
+
+        signal_kwargs = dict(
+            sender=None,
+            course=course,
+            course_structure=course_structure,
+            user=student,
+            course_grade_updated=True,
+        )
+        for grade, score_change_event_transaction in updated_grades:
+            _set_event_transaction(*score_change_event_transaction)
+            if course.enable_vertical_grading:
+                VERTICAL_SCORE_CHANGED.send(vertical_grade=grade, **signal_kwargs)
+            else:
+                SUBSECTION_SCORE_CHANGED.send(subsection_grade=grade, **signal_kwargs)
+        _set_event_transaction(*event_transaction)
+
+
+def _set_event_transaction(event_transaction_id, event_transaction_type):
+    """
+    Sets the current event transaction, so that grading events are
+    correlated with the score change they follow from.
+    """
+    set_event_transaction_id(event_transaction_id)
+    set_event_transaction_type(event_transaction_type)
+
+
 def _course_task_args(course_key, **kwargs):
     """
     Helper function to generate course-grade task args.
@@ -13,8 +13,9 @@ from django.db.utils import IntegrityError
 from django.test import TestCase
 from django.utils.timezone import now
 from freezegun import freeze_time
-from mock import patch
+from mock import Mock, patch
 from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
+from request_cache.middleware import RequestCache
 
 from lms.djangoapps.grades.config import waffle
 from lms.djangoapps.grades.models import (
@@ -57,6 +58,28 @@ class BlockRecordListTestCase(TestCase):
             brs
         )
 
+    def test_compact_value(self):
+        blocks = BlockRecordList([
+            BlockRecord(self.course_key.make_usage_key('problem', 'a'), 1, 10.5, True),
+            BlockRecord(self.course_key.make_usage_key('html', 'b'), None, None, None),
+            BlockRecord(self.course_key.make_usage_key('problem', 'c'), 0.5, 2, False),
+        ], self.course_key)
+        self.assertEqual(
+            json.loads(blocks.compact_value),
+            [2, unicode(self.course_key), ['problem', 'html'], [
+                [0, 'a', 1, 10.5, True],
+                [1, 'b', None, None, None],
+                [0, 'c', 0.5, 2, False],
+            ]],
+        )
+        self.assertLess(len(blocks.compact_value), len(blocks.json_value))
+
+        # Both serializations are read back into the same list, with the same hash.
+        compact_blocks = BlockRecordList.from_json(blocks.compact_value)
+        self.assertEqual(list(compact_blocks), list(blocks))
+        self.assertEqual(compact_blocks.json_value, blocks.json_value)
+        self.assertEqual(compact_blocks.hash_value, BlockRecordList.from_json(blocks.json_value).hash_value)
+
 
 class GradesModelTestCase(TestCase):
     """
@@ -156,6 +179,18 @@ class VisibleBlocksTest(GradesModelTestCase):
         self.assertEqual(expected_json, vblocks.blocks_json)
         self.assertEqual(expected_hash, vblocks.hashed)
 
+    def test_compact_creation(self):
+        """
+        With compact visible blocks, rows are stored in the compact
+        serialization, but hashed and read as before.
+        """
+        block_record_list = BlockRecordList.from_list([self.record_a, self.record_b], self.course_key)
+        with waffle.waffle().override(waffle.COMPACT_VISIBLE_BLOCKS, active=True):
+            vblocks = VisibleBlocks.objects.create_from_blockrecords(block_record_list)
+        self.assertEqual(vblocks.blocks_json, block_record_list.compact_value)
+        self.assertEqual(vblocks.hashed, b64encode(sha1(block_record_list.json_value).digest()))
+        self.assertEqual(VisibleBlocks.objects.get(hashed=vblocks.hashed).blocks, block_record_list)
+
     def test_ordering_matters(self):
         """
         When creating new vblocks, different ordering of blocks produces
@@ -296,6 +331,22 @@ class PersistentSubsectionGradeTest(GradesModelTestCase):
         self.assertIsInstance(grade.first_attempted, datetime)
         self.assertEqual(grade.earned_all, 6.0)
 
+    def test_prefetch(self):
+        self.addCleanup(RequestCache.clear_request_cache)
+        user_id = self.params["user_id"]
+        created_grade = PersistentSubsectionGrade.create_grade(**self.params)
+        with self.assertNumQueries(1):
+            PersistentSubsectionGrade.prefetch(self.course_key, [Mock(id=user_id), Mock(id=54321)])
+        with self.assertNumQueries(0):
+            grades = PersistentSubsectionGrade.bulk_read_grades(user_id, self.course_key)
+            self.assertEqual(list(grades), [created_grade])
+            self.assertEqual(list(PersistentSubsectionGrade.bulk_read_grades(54321, self.course_key)), [])
+
+        # Prefetched grades are only read once.
+        with self.assertNumQueries(1):
+            grades = PersistentSubsectionGrade.bulk_read_grades(user_id, self.course_key)
+            self.assertEqual(list(grades), [created_grade])
+
     def test_update_or_create_event(self):
         with patch('lms.djangoapps.grades.models.tracker') as tracker_mock:
             grade = PersistentSubsectionGrade.update_or_create_grade(**self.params)
@@ -12,23 +12,31 @@ import pytz
 import six
 from django.conf import settings
 from django.db.utils import IntegrityError
+from django.test.utils import override_settings
 from mock import MagicMock, patch
 
 from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
 from lms.djangoapps.grades.constants import ScoreDatabaseTableEnum
-from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
+from lms.djangoapps.grades.models import CoalescedScoreChange, PersistentCourseGrade, PersistentSubsectionGrade
 from lms.djangoapps.grades.signals.signals import PROBLEM_WEIGHTED_SCORE_CHANGED
 from lms.djangoapps.grades.tasks import (
+    RECALCULATE_GRADE_COALESCED_TIMEOUT,
     RECALCULATE_GRADE_DELAY,
     _course_task_args,
+    coalesce_recalculation,
     compute_all_grades_for_course,
     compute_grades_for_course_v2,
+    recalculate_grades_v3,
     recalculate_subsection_grade_v3
 )
 from openedx.core.djangoapps.content.block_structure.exceptions import BlockStructureNotFound
 from student.models import CourseEnrollment, anonymous_id_for_user
 from student.tests.factories import UserFactory
-from track.event_transaction_utils import create_new_event_transaction_id, get_event_transaction_id
+from track.event_transaction_utils import (
+    create_new_event_transaction_id,
+    get_event_transaction_id,
+    get_event_transaction_type
+)
 from util.date_utils import to_timestamp
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
@@ -58,8 +66,8 @@ class HasCourseWithProblemsMixin(object):
         self.problem = ItemFactory.create(parent=self.sequential, category='problem', display_name='Problem')
 
         if create_multiple_subsections:
-            seq2 = ItemFactory.create(parent=self.chapter, category='sequential')
-            ItemFactory.create(parent=seq2, category='problem')
+            self.sequential2 = ItemFactory.create(parent=self.chapter, category='sequential')
+            self.problem2 = ItemFactory.create(parent=self.sequential2, category='problem')
 
         self.frozen_now_datetime = datetime.now().replace(tzinfo=pytz.UTC)
         self.frozen_now_timestamp = to_timestamp(self.frozen_now_datetime)
@@ -127,7 +135,7 @@ class RecalculateSubsectionGradeTest(HasCourseWithProblemsMixin, ModuleStoreTest
         local_task_args = self.recalculate_subsection_grade_kwargs.copy()
         local_task_args['event_transaction_type'] = u'edx.grades.problem.submitted'
         with self.mock_get_score() and patch(
-            'lms.djangoapps.grades.tasks.recalculate_subsection_grade_v3.apply_async',
+            'lms.djangoapps.grades.tasks.recalculate_grades_v3.apply_async',
             return_value=None
         ) as mock_task_apply:
             PROBLEM_WEIGHTED_SCORE_CHANGED.send(sender=None, **send_args)
@@ -374,6 +382,179 @@ class RecalculateSubsectionGradeTest(HasCourseWithProblemsMixin, ModuleStoreTest
         self.assertFalse(mock_retry.called)
 
 
+@patch.dict(settings.FEATURES, {'PERSISTENT_GRADES_ENABLED_FOR_ALL_TESTS': False})
+class RecalculateGradesTest(HasCourseWithProblemsMixin, ModuleStoreTestCase):
+    """
+    Ensures that the recalculate grades task updates subsection and course
+    grades in a single pass, and coalesces bursts of score changes.
+    """
+    ENABLED_SIGNALS = ['course_published', 'pre_publish']
+
+    def setUp(self):
+        super(RecalculateGradesTest, self).setUp()
+        self.user = UserFactory()
+        PersistentGradesEnabledFlag.objects.create(enabled_for_all_courses=True, enabled=True)
+        self.set_up_course(create_multiple_subsections=True)
+
+    def _apply_recalculate_grades(self):
+        """
+        Calls the recalculate_grades task with the score in place.
+        """
+        mock_score = MagicMock(modified=datetime.utcnow().replace(tzinfo=pytz.UTC) + timedelta(days=1))
+        with patch("lms.djangoapps.grades.tasks.get_score", return_value=mock_score):
+            recalculate_grades_v3.apply(kwargs=self.recalculate_subsection_grade_kwargs)
+
+    @patch('lms.djangoapps.grades.new.course_grade_factory.COURSE_GRADE_CHANGED.send_robust')
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    def test_updates_subsection_and_course_grades(self, mock_subsection_signal, mock_course_signal):
+        self._apply_recalculate_grades()
+        self.assertEqual(
+            [kwargs['subsection_grade'].location for __, kwargs in mock_subsection_signal.call_args_list],
+            [self.sequential.location],
+        )
+        self.assertTrue(mock_subsection_signal.call_args[1]['course_grade_updated'])
+        self.assertEqual(mock_course_signal.call_count, 1)
+        self.assertIsNotNone(PersistentCourseGrade.read(self.user.id, self.course.id))
+        self.assertIsNotNone(PersistentSubsectionGrade.read_grade(self.user.id, self.sequential.location))
+
+    @patch('lms.djangoapps.grades.new.course_grade_factory.COURSE_GRADE_CHANGED.send_robust')
+    def test_course_grade_updated_once(self, mock_course_signal):
+        self._apply_recalculate_grades()
+        self.assertEqual(mock_course_signal.call_count, 1)
+
+    @override_settings(CELERY_ALWAYS_EAGER=False, RECALCULATE_GRADES_DEBOUNCE_PERIOD=0)
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    def test_coalesced_score_changes(self, mock_subsection_signal):
+        score_change = self.recalculate_subsection_grade_kwargs
+        self.assertTrue(coalesce_recalculation(score_change))
+        self.assertFalse(coalesce_recalculation(dict(score_change, usage_id=unicode(self.problem2.location))))
+        self.assertTrue(coalesce_recalculation(dict(score_change, user_id=UserFactory().id)))
+
+        # The subsections affected by both score changes are updated by the
+        # recalculation of the first one.
+        self._apply_recalculate_grades()
+        self.assertEqual(
+            {kwargs['subsection_grade'].location for __, kwargs in mock_subsection_signal.call_args_list},
+            {self.sequential.location, self.sequential2.location},
+        )
+
+        # Which closed the window.
+        self.assertFalse(CoalescedScoreChange.pending(score_change).exists())
+        self.assertTrue(coalesce_recalculation(score_change))
+
+    @override_settings(CELERY_ALWAYS_EAGER=False)
+    def test_only_if_higher_not_coalesced_with_others(self):
+        score_change = self.recalculate_subsection_grade_kwargs
+        self.assertTrue(coalesce_recalculation(score_change))
+        self.assertTrue(coalesce_recalculation(dict(score_change, only_if_higher=True)))
+        self.assertFalse(coalesce_recalculation(dict(score_change, only_if_higher=False)))
+
+    @override_settings(CELERY_ALWAYS_EAGER=False, RECALCULATE_GRADES_DEBOUNCE_PERIOD=0)
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    def test_coalesced_score_changes_keep_event_transactions(self, mock_subsection_signal):
+        score_change = self.recalculate_subsection_grade_kwargs
+        coalesced_event_transaction_id = unicode(create_new_event_transaction_id())
+        self.assertTrue(coalesce_recalculation(score_change))
+        self.assertFalse(coalesce_recalculation(dict(
+            score_change,
+            usage_id=unicode(self.problem2.location),
+            event_transaction_id=coalesced_event_transaction_id,
+            event_transaction_type=u'edx.grades.problem.rescored',
+        )))
+
+        event_transactions = {}
+
+        def record_event_transaction(subsection_grade, **kwargs):  # pylint: disable=unused-argument
+            """
+            Records the event transaction that the subsection grade is updated under.
+            """
+            event_transactions[subsection_grade.location] = (
+                unicode(get_event_transaction_id()), get_event_transaction_type(),
+            )
+
+        mock_subsection_signal.side_effect = record_event_transaction
+        self._apply_recalculate_grades()
+        self.assertEqual(event_transactions, {
+            self.sequential.location: (score_change['event_transaction_id'], score_change['event_transaction_type']),
+            self.sequential2.location: (coalesced_event_transaction_id, u'edx.grades.problem.rescored'),
+        })
+
+    @override_settings(CELERY_ALWAYS_EAGER=False)
+    def test_stale_window_not_joined(self):
+        score_change = self.recalculate_subsection_grade_kwargs
+        self.assertTrue(coalesce_recalculation(score_change))
+        CoalescedScoreChange.objects.update(
+            created=datetime.now(pytz.UTC) - timedelta(seconds=RECALCULATE_GRADE_COALESCED_TIMEOUT + 1)
+        )
+        self.assertTrue(coalesce_recalculation(score_change))
+
+    @override_settings(CELERY_ALWAYS_EAGER=False, RECALCULATE_GRADES_DEBOUNCE_PERIOD=0)
+    def test_requeued_for_score_changes_joining_while_recalculating(self):
+        score_change = self.recalculate_subsection_grade_kwargs
+        joining_score_change = dict(score_change, usage_id=unicode(self.problem2.location))
+        self.assertTrue(coalesce_recalculation(score_change))
+
+        def join_window(*args, **kwargs):  # pylint: disable=unused-argument
+            """
+            Joins the window while the recalculation is underway.
+            """
+            self.assertFalse(coalesce_recalculation(joining_score_change))
+
+        with patch('lms.djangoapps.grades.tasks._update_grades', side_effect=join_window):
+            with patch('lms.djangoapps.grades.tasks.recalculate_grades_v3.apply_async') as mock_task_apply:
+                self._apply_recalculate_grades()
+        mock_task_apply.assert_called_once_with(kwargs=joining_score_change, countdown=RECALCULATE_GRADE_DELAY)
+
+    @override_settings(CELERY_ALWAYS_EAGER=False, RECALCULATE_GRADES_DEBOUNCE_PERIOD=0)
+    @patch('lms.djangoapps.grades.tasks.recalculate_grades_v3.retry')
+    def test_retry_until_score_change_recorded(self, mock_retry):
+        self._apply_recalculate_grades()
+        self.assertTrue(mock_retry.called)
+
+    @override_settings(CELERY_ALWAYS_EAGER=False, RECALCULATE_GRADES_DEBOUNCE_PERIOD=0)
+    @patch('lms.djangoapps.grades.tasks.recalculate_grades_v3.retry')
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    def test_retry_when_db_not_updated_with_coalesced_score_change(self, mock_subsection_signal, mock_retry):
+        score_change = self.recalculate_subsection_grade_kwargs
+        coalesced_usage_key = self.course.id.make_usage_key('problem', 'coalesced_problem')
+        self.assertTrue(coalesce_recalculation(score_change))
+        self.assertFalse(coalesce_recalculation(dict(score_change, usage_id=unicode(coalesced_usage_key))))
+
+        def get_score(user_id, usage_key):  # pylint: disable=unused-argument
+            """
+            Returns the score of the first score change only, as if the
+            coalesced one was not committed yet.
+            """
+            if usage_key == self.problem.location:
+                return MagicMock(modified=datetime.utcnow().replace(tzinfo=pytz.UTC) + timedelta(days=1))
+            return None
+
+        with patch('lms.djangoapps.grades.tasks.get_score', side_effect=get_score):
+            recalculate_grades_v3.apply(kwargs=score_change)
+        self.assertTrue(mock_retry.called)
+        self.assertFalse(mock_subsection_signal.called)
+
+    @override_settings(CELERY_ALWAYS_EAGER=False)
+    @patch('lms.djangoapps.grades.signals.signals.SUBSECTION_SCORE_CHANGED.send')
+    def test_deferred_while_score_changes_continue(self, mock_subsection_signal):
+        expected_modified_time = to_timestamp(datetime.now().replace(tzinfo=pytz.UTC))
+        self.recalculate_subsection_grade_kwargs['expected_modified_time'] = expected_modified_time
+        self.assertTrue(coalesce_recalculation(self.recalculate_subsection_grade_kwargs))
+        self.assertFalse(coalesce_recalculation(self.recalculate_subsection_grade_kwargs))
+
+        with patch('lms.djangoapps.grades.tasks.recalculate_grades_v3.apply_async') as mock_task_apply:
+            self._apply_recalculate_grades()
+            mock_task_apply.assert_called_once_with(
+                kwargs=self.recalculate_subsection_grade_kwargs, countdown=RECALCULATE_GRADE_DELAY
+            )
+        self.assertFalse(mock_subsection_signal.called)
+
+        # Up to the maximum delay.
+        with override_settings(RECALCULATE_GRADES_MAX_DELAY=0):
+            self._apply_recalculate_grades()
+        self.assertEqual(mock_subsection_signal.call_count, 1)
+
+
 @ddt.ddt
 class ComputeGradesForCourseTest(HasCourseWithProblemsMixin, ModuleStoreTestCase):
     """
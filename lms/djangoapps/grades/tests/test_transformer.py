@@ -8,11 +8,13 @@ from copy import deepcopy
 
 import ddt
 import pytz
+from mock import patch
 
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.course_blocks.transformers.tests.helpers import CourseStructureTestCase
 from openedx.core.djangoapps.content.block_structure.api import clear_course_from_cache
 from student.tests.factories import UserFactory
+from xmodule.capa_module import CapaDescriptor
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
@@ -344,6 +346,40 @@ class GradesTransformerTestCase(CourseStructureTestCase):
             max_score=2,
         )
 
+    @ddt.data(
+        (ModuleStoreEnum.Type.split, True),
+        (ModuleStoreEnum.Type.mongo, False),
+    )
+    @ddt.unpack
+    def test_static_max_score_collection(self, store_type, cached):
+        problem_data = u'''
+            <problem>
+                <numericalresponse answer="2">
+                    <textline label="1+1" points="3" />
+                </numericalresponse>
+            </problem>
+        '''
+        with self.store.default_store(store_type):
+            blocks = self.build_course_with_problems(data=problem_data)
+
+        # The max score is computed from the problem's definition, rather
+        # than by creating the problem.
+        with patch.object(CapaDescriptor, 'max_score') as mock_max_score:
+            get_course_blocks(self.student, blocks[u'course'].location, self.transformers)
+        self.assertFalse(mock_max_score.called)
+
+        # Where definitions are versioned, it is then cached by definition.
+        clear_course_from_cache(blocks[u'course'].id)
+        with patch.object(CapaDescriptor, 'static_max_score', return_value=3) as mock_static_max_score:
+            block_structure = get_course_blocks(self.student, blocks[u'course'].location, self.transformers)
+        self.assertEqual(mock_static_max_score.called, not cached)
+        self.assert_collected_transformer_block_fields(
+            block_structure,
+            blocks[u'problem'].location,
+            self.TRANSFORMER_CLASS_TO_TEST,
+            max_score=3,
+        )
+
     def test_course_version_not_collected_in_old_mongo(self):
         blocks = self.build_course_with_problems()
         block_structure = get_course_blocks(self.student, blocks[u'course'].location, self.transformers)
@@ -8,6 +8,8 @@ from hashlib import sha1
 from logging import getLogger
 
 from django.conf import settings
+from django.core.cache import cache
+from opaque_keys.edx.locator import DefinitionLocator
 
 from lms.djangoapps.course_blocks.transformers.utils import collect_unioned_set_field, get_field_on_block
 from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
@@ -52,6 +54,9 @@ class GradesTransformer(BlockStructureTransformer):
 
     EXPLICIT_GRADED_FIELD_NAME = 'explicit_graded'
 
+    # Number of seconds static max scores are cached for, by definition.
+    MAX_SCORE_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
     @classmethod
     def name(cls):
         """
@@ -145,22 +150,67 @@ class GradesTransformer(BlockStructureTransformer):
         """
         Collect the `max_score` for every block in the provided `block_structure`.
         """
-        for block_locator in block_structure.post_order_traversal():
-            block = block_structure.get_xblock(block_locator)
-            if getattr(block, 'has_score', False):
-                cls._collect_max_score(block_structure, block)
+        modules = list(cls._iter_scorable_xmodules(block_structure))
+        static_max_scores = cls._get_static_max_scores(modules)
+        for module in modules:
+            cls._collect_max_score(block_structure, module, static_max_scores.get(module.location))
 
     @classmethod
-    def _collect_max_score(cls, block_structure, module):
+    def _collect_max_score(cls, block_structure, module, static_max_score=None):
         """
         Collect the `max_score` from the given module, storing it as a
         `transformer_block_field` associated with the `GradesTransformer`.
+        The module's max_score is only computed if the given static max
+        score is None.
         """
-        max_score = module.max_score()
+        max_score = static_max_score if static_max_score is not None else module.max_score()
         block_structure.set_transformer_block_field(module.location, cls, 'max_score', max_score)
         if max_score is None:
             log.warning("GradesTransformer: max_score is None for {}".format(module.location))
 
+    @classmethod
+    def _get_static_max_scores(cls, modules):
+        """
+        Returns a dict mapping the locations of the given modules to the max
+        scores computed from their definitions alone, by modules that support
+        it with a `static_max_score` method, such as capa problems.
+
+        Since those max scores only change along with the definition, they
+        are cached by definition id where definitions are versioned, so they
+        are not recomputed when the course is collected again.
+        """
+        modules = [module for module in modules if hasattr(module, 'static_max_score')]
+        cache_keys = {module.location: cls._max_score_cache_key(module) for module in modules}
+        cached_max_scores = cache.get_many([cache_key for cache_key in cache_keys.itervalues() if cache_key])
+
+        static_max_scores = {}
+        max_scores_to_cache = {}
+        for module in modules:
+            cache_key = cache_keys[module.location]
+            if cache_key in cached_max_scores:
+                static_max_scores[module.location] = cached_max_scores[cache_key]
+                continue
+            max_score = module.static_max_score()
+            static_max_scores[module.location] = max_score
+            if cache_key and max_score is not None:
+                max_scores_to_cache[cache_key] = max_score
+
+        if max_scores_to_cache:
+            cache.set_many(max_scores_to_cache, cls.MAX_SCORE_CACHE_TIMEOUT)
+        return static_max_scores
+
+    @staticmethod
+    def _max_score_cache_key(module):
+        """
+        Returns the key under which the static max score of the given module
+        is cached, or None if its definition is not versioned, and the max
+        score cannot be cached by definition.
+        """
+        definition_id = module.scope_ids.def_id
+        if isinstance(definition_id, DefinitionLocator):
+            return u'grades.static_max_score.{}'.format(definition_id.definition_id)
+        return None
+
     @classmethod
     def _collect_grading_policy_hash(cls, block_structure):
         """
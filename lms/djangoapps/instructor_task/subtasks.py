@@ -25,6 +25,8 @@ SUBTASK_LOCK_EXPIRE = 60 * 10  # Lock expires in 10 minutes
 # Number of times to retry if a subtask update encounters a lock on the InstructorTask.
 # (These are recursive retries, so don't make this number too large.)
 MAX_DATABASE_LOCK_RETRIES = 5
+# Number of items read from the database at a time when generating subtasks.
+DEFAULT_ITEMS_PER_QUERY = 1000
 
 
 def _get_number_of_subtasks(total_num_items, items_per_task):
@@ -73,6 +75,7 @@ def _generate_items_for_subtask(
     items_per_task,
     total_num_subtasks,
     course_id,
+    items_per_query=DEFAULT_ITEMS_PER_QUERY,
 ):
     """
     Generates a chunk of "items" that should be passed into a subtask.
@@ -82,9 +85,9 @@ def _generate_items_for_subtask(
         `item_fields` : the fields that should be included in the dict that is returned.
             These are in addition to the 'pk' field.
         `total_num_items` : the result of summing the count of each queryset in `item_querysets`.
-        `items_per_query` : size of chunks to break the query operation into.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
         `course_id` : course_id of the course. Only needed for the track_memory_usage context manager.
+        `items_per_query` : size of chunks to break the query operation into.
 
     Returns:  yields a list of dicts, where each dict contains the fields in `item_fields`, plus the 'pk' field.
 
@@ -99,7 +102,7 @@ def _generate_items_for_subtask(
 
     with track_memory_usage('course_email.subtask_generation.memory', course_id):
         for queryset in item_querysets:
-            for item in queryset.values(*all_item_fields).iterator():
+            for item in _iterate_by_pk_range(queryset, all_item_fields, items_per_query):
                 if len(items_for_task) == items_per_task and num_subtasks < total_num_subtasks - 1:
                     yield items_for_task
                     num_items_queued += items_per_task
@@ -122,6 +125,26 @@ def _generate_items_for_subtask(
         TASK_LOG.info("Number of items generated by chunking %s not equal to original total %s", num_items_queued, total_num_items)
 
 
+def _iterate_by_pk_range(queryset, fields, items_per_query):
+    """
+    Yields the `fields` values of the items in `queryset`, in primary key order.
+
+    The queryset is read in chunks of at most `items_per_query` items, each
+    selected by a primary key range, so that neither the database client nor
+    this process ever holds the full result set in memory.
+    """
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        chunk = list(chunk_queryset.values(*fields)[:items_per_query])
+        for item in chunk:
+            yield item
+        if len(chunk) < items_per_query:
+            return
+        last_pk = chunk[-1]['pk']
+
+
 class SubtaskStatus(object):
     """
     Create and return a dict for tracking the status of a subtask.
@@ -281,6 +304,7 @@ def queue_subtasks_for_query(
     item_fields,
     items_per_task,
     total_num_items,
+    items_per_query=DEFAULT_ITEMS_PER_QUERY,
 ):
     """
     Generates and queues subtasks to each execute a chunk of "items" generated by a queryset.
@@ -296,6 +320,8 @@ def queue_subtasks_for_query(
             These are in addition to the 'pk' field.
         `items_per_task` : maximum size of chunks to break each query chunk into for use by a subtask.
         `total_num_items` : total amount of items that will be put into subtasks
+        `items_per_query` : number of items to read from the database at a time.  Each query
+            selects the next range of primary keys.
 
     Returns:  the task progress as stored in the InstructorTask object.
 
@@ -327,6 +353,7 @@ def queue_subtasks_for_query(
         items_per_task,
         total_num_subtasks,
         entry.course_id,
+        items_per_query,
     )
 
     # Now create the subtasks, and start them running.
@@ -15,8 +15,9 @@ from certificates.models import CertificateWhitelist, GeneratedCertificate, cert
 from courseware.courses import get_course_by_id
 from instructor_analytics.basic import list_problem_responses
 from instructor_analytics.csvs import format_dictlist
+from lms.djangoapps.grades.config import should_persist_grades
 from lms.djangoapps.grades.context import grading_context, grading_context_for_course
-from lms.djangoapps.grades.models import PersistentCourseGrade
+from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade, PersistentVerticalGrade
 from lms.djangoapps.grades.new.course_grade_factory import CourseGradeFactory
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
@@ -155,6 +156,10 @@ class _CourseGradeBulkContext(object):
         bulk_cache_cohorts(context.course_id, users)
         BulkRoleCache.prefetch(users)
         PersistentCourseGrade.prefetch(context.course_id, users)
+        if should_persist_grades(context.course_id):
+            PersistentSubsectionGrade.prefetch(context.course_id, users)
+            if context.course.enable_vertical_grading:
+                PersistentVerticalGrade.prefetch(context.course_id, users)
         BulkCourseTags.prefetch(context.course_id, users)
 
 
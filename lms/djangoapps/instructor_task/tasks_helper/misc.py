@@ -9,15 +9,17 @@ from datetime import datetime
 from time import time
 
 import unicodecsv
-from django.contrib.auth.models import User
-from django.core.exceptions import ValidationError
 from django.core.files.storage import DefaultStorage
 from openassessment.data import OraAggregateData
 from pytz import UTC
 
 from instructor_analytics.basic import get_proctored_exam_results
 from instructor_analytics.csvs import format_dictlist
-from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort
+from openedx.core.djangoapps.course_groups.cohorts import (
+    BULK_COHORT_ASSIGNMENT_CHUNK_SIZE,
+    CohortAssignmentStatus,
+    add_users_to_cohorts
+)
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
 from survey.models import SurveyAnswer
 from util.file import UniversalNewlineIterator, course_filename_prefix_generator
@@ -143,8 +145,15 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
     # to prevent redundant cohort queries.
     cohorts_status = {}
 
-    with DefaultStorage().open(task_input['file_name']) as f:
-        for row in unicodecsv.DictReader(UniversalNewlineIterator(f), encoding='utf-8'):
+    # Maps cohort ids to the status of the cohort with that id.
+    cohorts_status_by_id = {}
+
+    def get_assignments(rows):
+        """
+        Yields the (username_or_email, cohort) assignments of the given CSV
+        rows, skipping those naming a cohort that doesn't exist.
+        """
+        for row in rows:
             # Try to use the 'email' field to identify the user.  If it's not present, use 'username'.
             username_or_email = row.get('email') or row.get('username')
             cohort_name = row.get('cohort') or ''
@@ -159,12 +168,14 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
                     'Preassigned Learners': set()
                 }
                 try:
-                    cohorts_status[cohort_name]['cohort'] = CourseUserGroup.objects.get(
+                    cohort = CourseUserGroup.objects.get(
                         course_id=course_id,
                         group_type=CourseUserGroup.COHORT,
                         name=cohort_name
                     )
+                    cohorts_status[cohort_name]['cohort'] = cohort
                     cohorts_status[cohort_name]["Exists"] = True
+                    cohorts_status_by_id.setdefault(cohort.id, cohorts_status[cohort_name])
                 except CourseUserGroup.DoesNotExist:
                     cohorts_status[cohort_name]["Exists"] = False
 
@@ -172,32 +183,35 @@ def cohort_students_and_upload(_xmodule_instance_args, _entry_id, course_id, tas
                 task_progress.failed += 1
                 continue
 
-            try:
-                # If add_user_to_cohort successfully adds a user, a user object is returned.
-                # If a user is preassigned to a cohort, no user object is returned (we already have the email address).
-                (user, previous_cohort, preassigned) = add_user_to_cohort(cohorts_status[cohort_name]['cohort'], username_or_email)
-                if preassigned:
-                    cohorts_status[cohort_name]['Preassigned Learners'].add(username_or_email)
-                    task_progress.preassigned += 1
-                else:
-                    cohorts_status[cohort_name]['Learners Added'] += 1
-                    task_progress.succeeded += 1
-            except User.DoesNotExist:
-                # Raised when a user with the username could not be found, and the email is not valid
-                cohorts_status[cohort_name]['Learners Not Found'].add(username_or_email)
+            yield username_or_email, cohorts_status[cohort_name]['cohort']
+
+    with DefaultStorage().open(task_input['file_name']) as f:
+        rows = unicodecsv.DictReader(UniversalNewlineIterator(f), encoding='utf-8')
+        for index, result in enumerate(add_users_to_cohorts(get_assignments(rows)), 1):
+            status = cohorts_status_by_id[result.cohort.id]
+            if result.status == CohortAssignmentStatus.ADDED:
+                status['Learners Added'] += 1
+                task_progress.succeeded += 1
+            elif result.status == CohortAssignmentStatus.PREASSIGNED:
+                status['Preassigned Learners'].add(result.username_or_email)
+                task_progress.preassigned += 1
+            elif result.status == CohortAssignmentStatus.NOT_FOUND:
+                # The user could not be found, and the username is not a valid email
+                status['Learners Not Found'].add(result.username_or_email)
                 task_progress.failed += 1
-            except ValidationError:
-                # Raised when a user with the username could not be found, and the email is not valid,
+            elif result.status == CohortAssignmentStatus.INVALID_EMAIL:
+                # The user could not be found, and the username is not a valid email,
                 # but the entered string contains an "@"
                 # Since there is no way to know if the entered string is an invalid username or an invalid email,
                 # assume that a string with the "@" symbol in it is an attempt at entering an email
-                cohorts_status[cohort_name]['Invalid Email Addresses'].add(username_or_email)
+                status['Invalid Email Addresses'].add(result.username_or_email)
                 task_progress.failed += 1
-            except ValueError:
-                # Raised when the user is already in the given cohort
+            else:
+                # The user is already in the given cohort
                 task_progress.skipped += 1
 
-            task_progress.update_task_state(extra_meta=current_step)
+            if index % BULK_COHORT_ASSIGNMENT_CHUNK_SIZE == 0:
+                task_progress.update_task_state(extra_meta=current_step)
 
     current_step['step'] = 'Uploading CSV'
     task_progress.update_task_state(extra_meta=current_step)
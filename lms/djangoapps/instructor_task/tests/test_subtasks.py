@@ -5,7 +5,7 @@ from uuid import uuid4
 
 from mock import Mock, patch
 
-from lms.djangoapps.instructor_task.subtasks import queue_subtasks_for_query
+from lms.djangoapps.instructor_task.subtasks import DEFAULT_ITEMS_PER_QUERY, queue_subtasks_for_query
 from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import InstructorTaskCourseTestCase
 from student.models import CourseEnrollment
@@ -25,7 +25,9 @@ class TestSubtasks(InstructorTaskCourseTestCase):
             random_id = uuid4().hex[:8]
             self.create_student(username='student{0}'.format(random_id))
 
-    def _queue_subtasks(self, create_subtask_fcn, items_per_task, initial_count, extra_count):
+    def _queue_subtasks(
+            self, create_subtask_fcn, items_per_task, initial_count, extra_count, items_per_query=DEFAULT_ITEMS_PER_QUERY
+    ):
         """Queue subtasks while enrolling more students into course in the middle of the process."""
 
         task_id = str(uuid4())
@@ -54,6 +56,7 @@ class TestSubtasks(InstructorTaskCourseTestCase):
                 item_fields=[],
                 items_per_task=items_per_task,
                 total_num_items=initial_count,
+                items_per_query=items_per_query,
             )
 
     def test_queue_subtasks_for_query1(self):
@@ -79,3 +82,15 @@ class TestSubtasks(InstructorTaskCourseTestCase):
         self.assertEqual(len(mock_create_subtask_fcn_args[0][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[1][0][0]), 3)
         self.assertEqual(len(mock_create_subtask_fcn_args[2][0][0]), 5)
+
+    def test_queue_subtasks_for_query_chunked_by_pk(self):
+        """Test queue_subtasks_for_query() reads items in primary key ranges smaller than a subtask."""
+
+        mock_create_subtask_fcn = Mock()
+        self._queue_subtasks(mock_create_subtask_fcn, 3, 7, 0, items_per_query=2)
+
+        # Check that every item is queued exactly once, in primary key order
+        items = [item for call in mock_create_subtask_fcn.call_args_list for item in call[0][0]]
+        self.assertEqual([len(call[0][0]) for call in mock_create_subtask_fcn.call_args_list], [3, 3, 1])
+        item_pks = [item['pk'] for item in items]
+        self.assertEqual(item_pks, sorted(set(item_pks)))
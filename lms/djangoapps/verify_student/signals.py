@@ -1,12 +1,15 @@
 """
-Signal handler for setting default course verification dates
+Signal handlers for setting default course verification dates, and for
+invalidating dashboard snapshots when verification statuses change.
 """
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_save
 from django.dispatch.dispatcher import receiver
 
+from student.models import invalidate_dashboard_snapshot
 from xmodule.modulestore.django import SignalHandler, modulestore
 
-from .models import VerificationDeadline
+from .models import SoftwareSecurePhotoVerification, VerificationDeadline
 
 
 @receiver(SignalHandler.course_published)
@@ -23,3 +26,12 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
                 VerificationDeadline.set_deadline(course_key, course.end)
         except ObjectDoesNotExist:
             VerificationDeadline.set_deadline(course_key, course.end)
+
+
+@receiver(post_save, sender=SoftwareSecurePhotoVerification)
+def _listen_for_verification_save(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Catches changes to a user's photo verification and invalidates the
+    user's dashboard snapshot, which includes their verification status.
+    """
+    invalidate_dashboard_snapshot(instance.user_id)
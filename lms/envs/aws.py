@@ -252,6 +252,7 @@ PAYMENT_REPORT_GENERATOR_GROUP = ENV_TOKENS.get('PAYMENT_REPORT_GENERATOR_GROUP'
 # Bulk Email overrides
 BULK_EMAIL_DEFAULT_FROM_EMAIL = ENV_TOKENS.get('BULK_EMAIL_DEFAULT_FROM_EMAIL', BULK_EMAIL_DEFAULT_FROM_EMAIL)
 BULK_EMAIL_EMAILS_PER_TASK = ENV_TOKENS.get('BULK_EMAIL_EMAILS_PER_TASK', BULK_EMAIL_EMAILS_PER_TASK)
+BULK_EMAIL_EMAILS_PER_QUERY = ENV_TOKENS.get('BULK_EMAIL_EMAILS_PER_QUERY', BULK_EMAIL_EMAILS_PER_QUERY)
 BULK_EMAIL_DEFAULT_RETRY_DELAY = ENV_TOKENS.get('BULK_EMAIL_DEFAULT_RETRY_DELAY', BULK_EMAIL_DEFAULT_RETRY_DELAY)
 BULK_EMAIL_MAX_RETRIES = ENV_TOKENS.get('BULK_EMAIL_MAX_RETRIES', BULK_EMAIL_MAX_RETRIES)
 BULK_EMAIL_INFINITE_RETRY_CAP = ENV_TOKENS.get('BULK_EMAIL_INFINITE_RETRY_CAP', BULK_EMAIL_INFINITE_RETRY_CAP)
@@ -260,6 +261,8 @@ BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = ENV_TOKENS.get(
     'BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS',
     BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS
 )
+BULK_EMAIL_CONNECTIONS_PER_TASK = ENV_TOKENS.get('BULK_EMAIL_CONNECTIONS_PER_TASK', BULK_EMAIL_CONNECTIONS_PER_TASK)
+BULK_EMAIL_MAX_SENDS_PER_SECOND = ENV_TOKENS.get('BULK_EMAIL_MAX_SENDS_PER_SECOND', BULK_EMAIL_MAX_SENDS_PER_SECOND)
 # We want Bulk Email running on the high-priority queue, so we define the
 # routing key that points to it. At the moment, the name is the same.
 # We have to reset the value here, since we have changed the value of the queue name.
@@ -271,6 +274,10 @@ BULK_EMAIL_ROUTING_KEY_SMALL_JOBS = ENV_TOKENS.get('BULK_EMAIL_ROUTING_KEY_SMALL
 
 # Queue to use for updating persistent grades
 RECALCULATE_GRADES_ROUTING_KEY = ENV_TOKENS.get('RECALCULATE_GRADES_ROUTING_KEY', LOW_PRIORITY_QUEUE)
+RECALCULATE_GRADES_DEBOUNCE_PERIOD = ENV_TOKENS.get(
+    'RECALCULATE_GRADES_DEBOUNCE_PERIOD', RECALCULATE_GRADES_DEBOUNCE_PERIOD
+)
+RECALCULATE_GRADES_MAX_DELAY = ENV_TOKENS.get('RECALCULATE_GRADES_MAX_DELAY', RECALCULATE_GRADES_MAX_DELAY)
 
 # Message expiry time in seconds
 CELERY_EVENT_QUEUE_TTL = ENV_TOKENS.get('CELERY_EVENT_QUEUE_TTL', None)
@@ -351,6 +358,11 @@ VIRTUAL_UNIVERSITIES = ENV_TOKENS.get('VIRTUAL_UNIVERSITIES', [])
 META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_POOL_MAXSIZE = ENV_TOKENS.get('COMMENTS_SERVICE_POOL_MAXSIZE', COMMENTS_SERVICE_POOL_MAXSIZE)
+COMMENTS_SERVICE_RESPONSE_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'COMMENTS_SERVICE_RESPONSE_CACHE_TIMEOUT', COMMENTS_SERVICE_RESPONSE_CACHE_TIMEOUT
+)
+DISCUSSION_API_POOL_SIZE = ENV_TOKENS.get('DISCUSSION_API_POOL_SIZE', DISCUSSION_API_POOL_SIZE)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
 ZENDESK_URL = ENV_TOKENS.get('ZENDESK_URL', ZENDESK_URL)
 ZENDESK_CUSTOM_FIELDS = ENV_TOKENS.get('ZENDESK_CUSTOM_FIELDS', ZENDESK_CUSTOM_FIELDS)
@@ -854,6 +866,7 @@ if FEATURES.get('CUSTOM_COURSES_EDX'):
         'lms.djangoapps.ccx.overrides.CustomCoursesForEdxOverrideProvider',
     )
 CCX_MAX_STUDENTS_ALLOWED = ENV_TOKENS.get('CCX_MAX_STUDENTS_ALLOWED', CCX_MAX_STUDENTS_ALLOWED)
+CCX_OVERRIDES_CACHE_TIMEOUT = ENV_TOKENS.get('CCX_OVERRIDES_CACHE_TIMEOUT', CCX_OVERRIDES_CACHE_TIMEOUT)
 
 ##### Individual Due Date Extensions #####
 if FEATURES.get('INDIVIDUAL_DUE_DATES'):
@@ -1038,6 +1051,8 @@ ENTERPRISE_EXCLUDED_REGISTRATION_FIELDS = set(
 
 COURSES_API_CACHE_TIMEOUT = ENV_TOKENS.get('COURSES_API_CACHE_TIMEOUT', COURSES_API_CACHE_TIMEOUT)
 
+DASHBOARD_SNAPSHOT_CACHE_TIMEOUT = ENV_TOKENS.get('DASHBOARD_SNAPSHOT_CACHE_TIMEOUT', DASHBOARD_SNAPSHOT_CACHE_TIMEOUT)
+
 # Add an ICP license for serving content in China if your organization is registered to do so
 ICP_LICENSE = ENV_TOKENS.get('ICP_LICENSE', None)
 
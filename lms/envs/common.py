@@ -57,6 +57,18 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# Number of keep-alive connections kept open to each comments service host.
+COMMENTS_SERVICE_POOL_MAXSIZE = 10
+
+# Number of seconds responses of read-only comments service endpoints (user
+# info, thread lists) are cached for. Set to 0 to disable.
+COMMENTS_SERVICE_RESPONSE_CACHE_TIMEOUT = 0
+
+# Number of worker threads per process sending the comments service calls of
+# a Discussion API call concurrently. Calls run on the requesting thread when
+# every worker is busy.
+DISCUSSION_API_POOL_SIZE = 8
+
 LMS_ROOT_URL = "http://localhost:8000"
 
 # Features
@@ -1156,6 +1168,7 @@ MIDDLEWARE_CLASSES = (
     'crum.CurrentRequestUserMiddleware',
 
     'request_cache.middleware.RequestCache',
+    'util.db.AfterCommitMiddleware',
     'openedx.core.djangoapps.monitoring_utils.middleware.MonitoringCustomMetrics',
 
     'mobile_api.middleware.AppVersionUpgrade',
@@ -1229,6 +1242,9 @@ MIDDLEWARE_CLASSES = (
     # to redirected unenrolled students to the course info page
     'courseware.middleware.RedirectMiddleware',
 
+    # to report field override lookups along with the other custom metrics
+    'courseware.middleware.OverrideIndexMetricsMiddleware',
+
     'course_wiki.middleware.WikiAccessMiddleware',
 
     'openedx.core.djangoapps.theming.middleware.CurrentSiteThemeMiddleware',
@@ -1890,6 +1906,9 @@ BULK_EMAIL_DEFAULT_FROM_EMAIL = 'no-reply@example.com'
 # Parameters for breaking down course enrollment into subtasks.
 BULK_EMAIL_EMAILS_PER_TASK = 100
 
+# Number of recipients read from the database at a time when queueing subtasks.
+BULK_EMAIL_EMAILS_PER_QUERY = 1000
+
 # Initial delay used for retrying tasks.  Additional retries use
 # longer delays.  Value is in seconds.
 BULK_EMAIL_DEFAULT_RETRY_DELAY = 30
@@ -1925,11 +1944,25 @@ BULK_EMAIL_LOG_SENT_EMAILS = False
 # parallel, and what the SES rate is.
 BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 
+# Number of persistent connections each bulk email subtask opens to the
+# email backend.  Messages are sent concurrently, one per connection.
+BULK_EMAIL_CONNECTIONS_PER_TASK = 1
+
+# Maximum number of bulk email messages sent per second, shared by all
+# workers through the cache.  None means there is no limit.
+BULK_EMAIL_MAX_SENDS_PER_SECOND = None
+
 ############################# Persistent Grades ####################################
 
 # Queue to use for updating persistent grades
 RECALCULATE_GRADES_ROUTING_KEY = LOW_PRIORITY_QUEUE
 
+# Score changes of a user in a course made within this many seconds of each
+# other share a grades recalculation, which is put off by at most
+# RECALCULATE_GRADES_MAX_DELAY seconds.
+RECALCULATE_GRADES_DEBOUNCE_PERIOD = 1
+RECALCULATE_GRADES_MAX_DELAY = 30
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -2435,6 +2468,15 @@ FEATURES['CLASS_DASHBOARD'] = False
 if FEATURES.get('CLASS_DASHBOARD'):
     INSTALLED_APPS += ('class_dashboard',)
 
+# Maintain the Metrics tab's grade and subsection distributions in aggregate
+# tables as student state changes, rather than computing them on every load.
+# Run the rebuild_class_dashboard_distributions command after enabling this.
+FEATURES['MATERIALIZE_CLASS_DASHBOARD_DISTRIBUTIONS'] = False
+
+# Changes to the student state of a course are applied to its aggregate tables
+# at most this many seconds later.
+CLASS_DASHBOARD_DISTRIBUTIONS_UPDATE_DELAY = 10
+
 ################ Enable credit eligibility feature ####################
 ENABLE_CREDIT_ELIGIBILITY = True
 FEATURES['ENABLE_CREDIT_ELIGIBILITY'] = ENABLE_CREDIT_ELIGIBILITY
@@ -3077,6 +3119,10 @@ PROCTORING_SETTINGS = {}
 # to compete with the MOOC.
 CCX_MAX_STUDENTS_ALLOWED = 200
 
+# Number of seconds the overrides of a CCX are cached for. The cached overrides
+# are versioned, and replaced as soon as any override of the CCX changes.
+CCX_OVERRIDES_CACHE_TIMEOUT = 60 * 60 * 24
+
 # Financial assistance settings
 
 # Maximum and minimum length of answers, in characters, for the
@@ -3217,6 +3263,13 @@ COURSE_ENROLLMENT_MODES = {
     "honor": 6,
 }
 
+############## Settings for the Student Dashboard ######################
+
+# Number of seconds a user's precomputed dashboard statuses (certificates, credit
+# and verification) are cached for. They are also invalidated whenever the user's
+# enrollments, certificates, verifications or grades change. Set to 0 to disable.
+DASHBOARD_SNAPSHOT_CACHE_TIMEOUT = 300
+
 ############## Settings for the Discovery App ######################
 
 COURSES_API_CACHE_TIMEOUT = 3600  # Value is in seconds
@@ -156,6 +156,7 @@ class User(models.Model):
                 retrieve_params,
                 metric_action='model.retrieve',
                 metric_tags=self._metric_tags,
+                cacheable=True,
             )
         except CommentClientRequestError as e:
             if e.status_code == 404:
@@ -1,14 +1,22 @@
 """" Common utilities for comment client wrapper """
+import cookielib
+import hashlib
+import json
 import logging
+import os
+import threading
 from contextlib import contextmanager
 from time import time
 from uuid import uuid4
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import get_language
+from requests.adapters import HTTPAdapter
 
 import dogstats_wrapper as dog_stats_api
+import request_cache
 
 log = logging.getLogger(__name__)
 
@@ -53,11 +61,185 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
+RESPONSE_CACHE_KEY_PREFIX = u'comment_client.response'
+REQUEST_COALESCER_CACHE_NAMESPACE = u'comment_client.coalescer'
+
+_session_lock = threading.Lock()
+_session = None
+_session_pid = None
+
+
+class _BlockAllCookiesPolicy(cookielib.DefaultCookiePolicy):
+    """
+    A cookie policy that neither stores nor sends any cookie.
+    """
+    def set_ok(self, cookie, request):  # pylint: disable=unused-argument
+        return False
+
+    def return_ok(self, cookie, request):  # pylint: disable=unused-argument
+        return False
+
+
+def get_session():
+    """
+    Returns the `requests.Session` shared by all requests to the comments
+    service from this process, so that connections are kept alive and reused.
+
+    The session is created lazily, and again after a fork, so that forked
+    worker processes never share sockets. It keeps no cookies, so that
+    cookies set by responses to one user's requests are never sent with
+    another's.
+    """
+    global _session, _session_pid  # pylint: disable=global-statement
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                session = requests.Session()
+                session.cookies.set_policy(_BlockAllCookiesPolicy())
+                adapter = HTTPAdapter(pool_maxsize=settings.COMMENTS_SERVICE_POOL_MAXSIZE, pool_block=True)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session, _session_pid = session, pid
+    return _session
+
+
+def send_request(method, url, **kwargs):
+    """
+    Sends a request to the comments service over the shared session.
+    Accepts the same arguments as `requests.request`.
+    """
+    return get_session().request(method, url, **kwargs)
+
+
+class _CoalescedCall(object):
+    """
+    A request that is in flight, and whose outcome is shared with every
+    caller that asked for the same request in the meantime.
+    """
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class RequestCoalescer(object):
+    """
+    Coalesces identical requests made concurrently, e.g. by the threads of
+    a discussion view fetching the same user or thread, into a single request.
+
+    Each request has its own coalescer (see get_request_coalescer), so that
+    responses, which may depend on the user, are never shared across requests.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def perform(self, key, send):
+        """
+        Returns the outcome of `send()`, or of the call in flight for `key`
+        if there is one. Returns a tuple of the response and whether it was
+        shared with another caller.
+        """
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _CoalescedCall()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error  # pylint: disable=raising-bad-type
+            return call.response, True
+        try:
+            call.response = send()
+        except Exception as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+        return call.response, False
+
+
+_thread_config = threading.local()
+
+
+@contextmanager
+def forums_config_override(config):
+    """
+    Makes requests from the current thread use the given ForumsConfig rather
+    than looking it up, e.g. so that worker threads don't use the database.
+    """
+    previous = getattr(_thread_config, 'config', None)
+    _thread_config.config = config
+    try:
+        yield
+    finally:
+        _thread_config.config = previous
+
+
+def get_request_coalescer():
+    """
+    Returns the RequestCoalescer of the current request, which is kept in the
+    request cache.
+    """
+    coalescer = getattr(_thread_config, 'coalescer', None)
+    if coalescer is None:
+        coalescer_cache = request_cache.get_cache(REQUEST_COALESCER_CACHE_NAMESPACE)
+        coalescer = coalescer_cache.get('coalescer')
+        if coalescer is None:
+            coalescer = coalescer_cache['coalescer'] = RequestCoalescer()
+    return coalescer
+
+
+@contextmanager
+def request_coalescer_override(coalescer):
+    """
+    Makes requests from the current thread use the given RequestCoalescer,
+    e.g. so that worker threads share that of the request they work for,
+    since the request cache is local to each thread.
+    """
+    previous = getattr(_thread_config, 'coalescer', None)
+    _thread_config.coalescer = coalescer
+    try:
+        yield
+    finally:
+        _thread_config.coalescer = previous
+
+
+def _request_key(method, url, params, headers):
+    """
+    Returns a key identifying a request by its method, url, parameters and
+    headers, ignoring the request_id that is unique to each request.
+    """
+    params = sorted((key, unicode(value)) for key, value in params.iteritems() if key != 'request_id')
+    return method, url, tuple(params), tuple(sorted(headers.iteritems()))
+
+
+def _response_cache_key(request_key):
+    """
+    Returns the cache key under which the response to a request is cached.
+    """
+    digest = hashlib.md5(json.dumps(request_key, sort_keys=True).encode('utf-8')).hexdigest()
+    return u'{}.{}'.format(RESPONSE_CACHE_KEY_PREFIX, digest)
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
-                    metric_action=None, metric_tags=None, paged_results=False):
+                    metric_action=None, metric_tags=None, paged_results=False, cacheable=False):
+    """
+    Performs a request to the comments service, and returns the text of its
+    response if `raw`, or its decoded JSON otherwise.
+
+    GET requests are coalesced with identical requests of the current request
+    in flight. Those of read-only endpoints, marked `cacheable`, are also
+    served from the cache for COMMENTS_SERVICE_RESPONSE_CACHE_TIMEOUT seconds,
+    if it's set.
+    """
     # To avoid dependency conflict
     from django_comment_common.models import ForumsConfig
-    config = ForumsConfig.current()
+    config = getattr(_thread_config, 'config', None) or ForumsConfig.current()
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
@@ -84,15 +266,37 @@ def perform_request(method, url, data_or_params=None, raw=False,
     else:
         data = None
         params = merge_dict(data_or_params, request_id_dict)
-    with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
-            method,
-            url,
-            data=data,
-            params=params,
-            headers=headers,
-            timeout=config.connection_timeout
-        )
+
+    def send():
+        """
+        Sends the request, timing it.
+        """
+        with request_timer(request_id, method, url, metric_tags):
+            return send_request(
+                method,
+                url,
+                data=data,
+                params=params,
+                headers=headers,
+                timeout=config.connection_timeout
+            )
+
+    cache_timeout = 0
+    if method.lower() != 'get':
+        response = send()
+    else:
+        request_key = _request_key(method.lower(), url, params, headers)
+        if cacheable:
+            cache_timeout = settings.COMMENTS_SERVICE_RESPONSE_CACHE_TIMEOUT
+        if cache_timeout:
+            cache_key = _response_cache_key(request_key + (raw,))
+            cached = cache.get(cache_key)
+            if cached is not None:
+                dog_stats_api.increment('comment_client.request.cache_hit', tags=metric_tags)
+                return cached
+        response, coalesced = get_request_coalescer().perform(request_key, send)
+        if coalesced:
+            dog_stats_api.increment('comment_client.request.coalesced', tags=metric_tags)
 
     metric_tags.append(u'status_code:{}'.format(response.status_code))
     if response.status_code > 200:
@@ -111,7 +315,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         raise CommentClient500Error(response.text)
     else:
         if raw:
-            return response.text
+            data = response.text
         else:
             try:
                 data = response.json()
@@ -138,7 +342,9 @@ def perform_request(method, url, data_or_params=None, raw=False,
                     value=data.get('num_pages', 1),
                     tags=metric_tags
                 )
-            return data
+        if cache_timeout:
+            cache.set(cache_key, data, cache_timeout)
+        return data
 
 
 class CommentClientError(Exception):
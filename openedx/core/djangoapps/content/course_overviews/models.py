@@ -1,11 +1,16 @@
 """
 Declaration of CourseOverview model
 """
+import copy
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from urlparse import urlparse, urlunparse
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField, IntegerField
 from django.db.utils import IntegrityError
@@ -16,6 +21,7 @@ from model_utils.models import TimeStampedModel
 from opaque_keys.edx.keys import CourseKey
 
 from config_models.models import ConfigurationModel
+import request_cache
 from lms.djangoapps import django_comment_client
 from openedx.core.djangoapps.models.course_details import CourseDetails
 from static_replace.models import AssetBaseUrlConfig
@@ -27,6 +33,20 @@ from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, UsageK
 
 log = logging.getLogger(__name__)
 
+COURSE_OVERVIEW_CACHE_NAMESPACE = u'course_overviews.get_from_ids'
+
+# Maximum number of CourseOverviews kept in the process-level cache.
+OVERVIEW_PROCESS_CACHE_SIZE = 1000
+
+# Process-level cache of CourseOverviews, keyed by course id, in least
+# recently used order. Values are (expiration timestamp, CourseOverview) tuples.
+OVERVIEW_PROCESS_CACHE = OrderedDict()
+_process_cache_lock = threading.Lock()
+
+# Cache key set while a course's overview is queued for regeneration, so that
+# it is queued at most once per CourseOverview.REGENERATION_RETRY_DELAY.
+REGENERATION_SCHEDULED_KEY = u'course_overviews.regeneration_scheduled.{course_id}'
+
 
 class CourseOverview(TimeStampedModel):
     """
@@ -46,6 +66,15 @@ class CourseOverview(TimeStampedModel):
     # IMPORTANT: Bump this whenever you modify this model and/or add a migration.
     VERSION = 6
 
+    # Number of seconds get_from_ids may serve an overview from the process-level cache.
+    PROCESS_CACHE_TIMEOUT = 60
+
+    # Number of seconds before get_from_ids queues the same course for regeneration again.
+    REGENERATION_RETRY_DELAY = 5 * 60
+
+    # Number of seconds before a course missing from the module store is queued again.
+    MISSING_COURSE_RETRY_DELAY = 24 * 60 * 60
+
     # Cache entry versioning.
     version = IntegerField()
 
@@ -249,6 +278,7 @@ class CourseOverview(TimeStampedModel):
                     )
                     raise
 
+                cls.evict_from_cache(course_id)
                 return course_overview
             elif course is not None:
                 raise IOError(
@@ -319,6 +349,100 @@ class CourseOverview(TimeStampedModel):
             )
         }
 
+    @classmethod
+    def get_from_ids(cls, course_ids):
+        """
+        Return a dict mapping course_ids to current CourseOverviews, with their
+        tabs and image sets preloaded.
+
+        Overviews are looked up in the request cache, then in a process-level
+        cache that holds them for PROCESS_CACHE_TIMEOUT seconds, and the rest
+        are loaded from the database in a constant number of queries.
+
+        Unlike get_from_id, this method never loads a course from the module
+        store. Outdated CourseOverviews (and those without an image set, when
+        thumbnails are enabled) are returned as they are but not cached in the
+        process, and they are queued for regeneration in a celery task along
+        with the course IDs that have no CourseOverview at all. The latter are
+        left out of the result, so callers should fall back to get_from_id if
+        they need to guarantee a CourseOverview for every course.
+        """
+        course_ids = set(course_ids)
+        request_overviews = request_cache.get_cache(COURSE_OVERVIEW_CACHE_NAMESPACE)
+        overviews = {
+            course_id: request_overviews[course_id]
+            for course_id in course_ids
+            if course_id in request_overviews
+        }
+
+        now = time.time()
+        with _process_cache_lock:
+            for course_id in course_ids.difference(overviews):
+                cached = OVERVIEW_PROCESS_CACHE.pop(course_id, None)
+                # Overviews cached by a process running older code may be
+                # outdated, so the version of the overview itself is checked.
+                if cached is not None and cached[0] > now and cached[1].version >= cls.VERSION:
+                    OVERVIEW_PROCESS_CACHE[course_id] = cached
+                    # Hand out copies so that callers can't modify each other's overviews.
+                    overviews[course_id] = copy.copy(cached[1])
+
+        missing_ids = course_ids.difference(overviews)
+        stale_ids = set()
+        if missing_ids:
+            loaded = cls.objects.select_related('image_set').prefetch_related('tabs').filter(id__in=missing_ids)
+            expires = now + cls.PROCESS_CACHE_TIMEOUT
+            image_sets_enabled = None
+            for overview in loaded:
+                is_stale = overview.version < cls.VERSION
+                if not is_stale and not hasattr(overview, 'image_set'):
+                    # Image sets are only generated when thumbnails are enabled.
+                    if image_sets_enabled is None:
+                        image_sets_enabled = CourseOverviewImageConfig.current().enabled
+                    is_stale = image_sets_enabled
+                if is_stale:
+                    stale_ids.add(overview.id)
+                    overviews[overview.id] = overview
+                    continue
+                with _process_cache_lock:
+                    OVERVIEW_PROCESS_CACHE[overview.id] = (expires, overview)
+                    while len(OVERVIEW_PROCESS_CACHE) > OVERVIEW_PROCESS_CACHE_SIZE:
+                        OVERVIEW_PROCESS_CACHE.popitem(last=False)
+                overviews[overview.id] = copy.copy(overview)
+
+        request_overviews.update(overviews)
+
+        stale_ids.update(missing_ids.difference(overviews))
+        if stale_ids:
+            cls._schedule_regeneration(stale_ids)
+
+        return overviews
+
+    @classmethod
+    def _schedule_regeneration(cls, course_ids):
+        """
+        Queues the CourseOverviews of the given course IDs for regeneration,
+        skipping the courses already queued within REGENERATION_RETRY_DELAY.
+        """
+        course_ids = [
+            unicode(course_id)
+            for course_id in course_ids
+            if cache.add(REGENERATION_SCHEDULED_KEY.format(course_id=course_id), True, cls.REGENERATION_RETRY_DELAY)
+        ]
+        if course_ids:
+            # Imported here to avoid a circular import, since tasks depends on this module.
+            from .tasks import regenerate_course_overviews
+            regenerate_course_overviews.delay(course_ids)
+
+    @classmethod
+    def evict_from_cache(cls, course_id):
+        """
+        Removes the CourseOverview for course_id from this process's and the
+        current request's caches.
+        """
+        with _process_cache_lock:
+            OVERVIEW_PROCESS_CACHE.pop(course_id, None)
+        request_cache.get_cache(COURSE_OVERVIEW_CACHE_NAMESPACE).pop(course_id, None)
+
     def clean_id(self, padding_char='='):
         """
         Returns a unique deterministic base32-encoded ID for the course.
@@ -1,6 +1,7 @@
 """
 Signal handler for invalidating cached course overviews
 """
+from django.db.models.signals import post_delete, post_save
 from django.dispatch.dispatcher import receiver
 
 from .models import CourseOverview
@@ -27,3 +28,13 @@ def _listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=
     from cms.djangoapps.contentstore.courseware_index import CourseAboutSearchIndexer
     # Delete course entry from Course About Search_index
     CourseAboutSearchIndexer.remove_deleted_items(course_key)
+
+
+@receiver(post_save, sender=CourseOverview)
+@receiver(post_delete, sender=CourseOverview)
+def _listen_for_overview_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Evicts a CourseOverview that was saved or deleted from this process's
+    and the current request's caches.
+    """
+    CourseOverview.evict_from_cache(instance.id)
@@ -0,0 +1,41 @@
+"""
+Asynchronous tasks for the course_overviews app.
+"""
+import logging
+
+from celery.task import task
+from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey
+
+from xmodule.modulestore.django import modulestore
+
+from .models import CourseOverview, REGENERATION_SCHEDULED_KEY
+
+log = logging.getLogger('edx.celery.task')
+
+
+@task(name=u'openedx.core.djangoapps.content.course_overviews.tasks.regenerate_course_overviews')
+def regenerate_course_overviews(course_ids):
+    """
+    Creates or updates the CourseOverviews (and their image sets) for the
+    given serialized course keys.
+
+    Courses that no longer exist in the module store are skipped, and are
+    not queued again by CourseOverview.get_from_ids for
+    CourseOverview.MISSING_COURSE_RETRY_DELAY seconds.
+    """
+    store = modulestore()
+    course_keys = []
+    for course_id in course_ids:
+        course_key = CourseKey.from_string(course_id)
+        if store.has_course(course_key):
+            course_keys.append(course_key)
+        else:
+            log.info('Skipping course overview regeneration for missing course %s.', course_id)
+            cache.set(
+                REGENERATION_SCHEDULED_KEY.format(course_id=course_id),
+                True,
+                CourseOverview.MISSING_COURSE_RETRY_DELAY,
+            )
+    log.info('Regenerating course overviews for %d courses.', len(course_keys))
+    CourseOverview.get_select_courses(course_keys)
@@ -9,6 +9,7 @@ import math
 import mock
 from nose.plugins.attrib import attr
 import pytz
+import time
 
 from django.conf import settings
 from django.db.utils import IntegrityError
@@ -19,6 +20,7 @@ from PIL import Image
 from lms.djangoapps.certificates.api import get_active_web_certificate
 from openedx.core.djangoapps.models.course_details import CourseDetails
 from openedx.core.lib.courses import course_image_url
+from request_cache.middleware import RequestCache
 from static_replace.models import AssetBaseUrlConfig
 from xmodule.assetstore.assetmgr import AssetManager
 from xmodule.contentstore.django import contentstore
@@ -36,6 +38,7 @@ from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls, check_mongo_calls_range
 
 from .models import CourseOverview, CourseOverviewImageSet, CourseOverviewImageConfig
+from .tasks import regenerate_course_overviews
 
 
 @attr(shard=3)
@@ -545,6 +548,127 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
         self.assertEqual(len(course_ids_to_overviews), 1)
         self.assertIn(course_with_overview_1.id, course_ids_to_overviews)
 
+    def test_get_from_ids(self):
+        CourseOverviewImageConfig.objects.create(enabled=True)
+        course_with_overview = CourseFactory.create(emit_signals=True)
+        course_without_overview = CourseFactory.create(emit_signals=False)
+        course_ids = [course_with_overview.id, course_without_overview.id]
+
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.tasks.regenerate_course_overviews.delay'
+        ) as mock_regenerate:
+            # One query each for the overviews with their image sets, and for their tabs.
+            with self.assertNumQueries(2):
+                course_ids_to_overviews = CourseOverview.get_from_ids(course_ids)
+        self.assertEqual(course_ids_to_overviews.keys(), [course_with_overview.id])
+        mock_regenerate.assert_called_once_with([unicode(course_without_overview.id)])
+
+        # Tabs and image sets were loaded along with the overviews.
+        overview = course_ids_to_overviews[course_with_overview.id]
+        with self.assertNumQueries(0):
+            self.assertTrue(overview.image_set)
+            self.assertEqual(
+                [tab.tab_id for tab in overview.tabs.all()],
+                [tab.tab_id for tab in course_with_overview.tabs],
+            )
+
+        # The missing course is queued for regeneration only once.
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.tasks.regenerate_course_overviews.delay'
+        ) as mock_regenerate:
+            CourseOverview.get_from_ids(course_ids)
+        self.assertFalse(mock_regenerate.called)
+
+        # The missing overview is generated by the task.
+        regenerate_course_overviews([unicode(course_without_overview.id)])
+        self.assertTrue(CourseOverview.objects.filter(id=course_without_overview.id).exists())
+        RequestCache.clear_request_cache()
+        CourseOverview.get_from_ids(course_ids)
+
+        # Overviews are now served from the request and process-level caches.
+        with self.assertNumQueries(0):
+            self.assertEqual(len(CourseOverview.get_from_ids(course_ids)), 2)
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(0):
+            self.assertEqual(len(CourseOverview.get_from_ids(course_ids)), 2)
+
+        # Until they expire, or the overview is regenerated.
+        RequestCache.clear_request_cache()
+        with mock.patch('time.time', return_value=time.time() + CourseOverview.PROCESS_CACHE_TIMEOUT + 1):
+            with self.assertNumQueries(2):
+                CourseOverview.get_from_ids(course_ids)
+        CourseOverview.load_from_module_store(course_with_overview.id)
+        with self.assertNumQueries(2):
+            self.assertEqual(len(CourseOverview.get_from_ids(course_ids)), 2)
+
+    def test_get_from_ids_without_image_sets(self):
+        # Image sets are not generated when thumbnails are disabled, which
+        # is the default, so overviews without them are still returned.
+        course = CourseFactory.create(emit_signals=True)
+        self.assertFalse(hasattr(CourseOverview.get_from_id(course.id), 'image_set'))
+        RequestCache.clear_request_cache()
+
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.tasks.regenerate_course_overviews.delay'
+        ) as mock_regenerate:
+            self.assertEqual(CourseOverview.get_from_ids([course.id]).keys(), [course.id])
+        self.assertFalse(mock_regenerate.called)
+
+        # Overviews without image sets are regenerated once thumbnails are
+        # enabled, and served as they are in the meantime.
+        CourseOverviewImageConfig.objects.create(enabled=True)
+        CourseOverview.evict_from_cache(course.id)
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.tasks.regenerate_course_overviews.delay'
+        ) as mock_regenerate:
+            self.assertEqual(CourseOverview.get_from_ids([course.id]).keys(), [course.id])
+        mock_regenerate.assert_called_once_with([unicode(course.id)])
+
+    def test_get_from_ids_outdated(self):
+        course = CourseFactory.create(emit_signals=True)
+        CourseOverview.objects.filter(id=course.id).update(version=CourseOverview.VERSION - 1)
+
+        # Outdated overviews are served, and queued for regeneration once.
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.tasks.regenerate_course_overviews.delay'
+        ) as mock_regenerate:
+            for __ in range(2):
+                RequestCache.clear_request_cache()
+                overviews = CourseOverview.get_from_ids([course.id])
+                self.assertEqual(overviews[course.id].version, CourseOverview.VERSION - 1)
+        mock_regenerate.assert_called_once_with([unicode(course.id)])
+
+        regenerate_course_overviews([unicode(course.id)])
+        RequestCache.clear_request_cache()
+        self.assertEqual(CourseOverview.get_from_ids([course.id])[course.id].version, CourseOverview.VERSION)
+
+    def test_regenerate_missing_course(self):
+        course = CourseFactory.create(emit_signals=True)
+        missing_course_key = course.id.replace(run='missing')
+
+        # Courses missing from the module store are skipped, and not queued again.
+        regenerate_course_overviews([unicode(missing_course_key)])
+        self.assertFalse(CourseOverview.objects.filter(id=missing_course_key).exists())
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.tasks.regenerate_course_overviews.delay'
+        ) as mock_regenerate:
+            self.assertEqual(CourseOverview.get_from_ids([missing_course_key]), {})
+        self.assertFalse(mock_regenerate.called)
+
+    @mock.patch('openedx.core.djangoapps.content.course_overviews.models.OVERVIEW_PROCESS_CACHE_SIZE', 1)
+    def test_get_from_ids_process_cache_size(self):
+        CourseOverviewImageConfig.objects.create(enabled=True)
+        courses = [CourseFactory.create(emit_signals=True) for __ in range(2)]
+        for course in courses:
+            CourseOverview.get_from_ids([course.id])
+        RequestCache.clear_request_cache()
+
+        # Only the most recently loaded overview is kept in the process-level cache.
+        with self.assertNumQueries(0):
+            CourseOverview.get_from_ids([courses[1].id])
+        with self.assertNumQueries(2):
+            CourseOverview.get_from_ids([courses[0].id])
+
 
 @attr(shard=3)
 @ddt.ddt
@@ -5,6 +5,8 @@ forums, and to the cohort admin views.
 
 import logging
 import random
+from collections import namedtuple
+from itertools import islice
 
 import request_cache
 from courseware import courses
@@ -501,6 +503,240 @@ def add_user_to_cohort(cohort, username_or_email):
                 raise ex
 
 
+# The number of assignments add_users_to_cohorts resolves and applies at once.
+BULK_COHORT_ASSIGNMENT_CHUNK_SIZE = 1000
+
+
+class CohortAssignmentStatus(object):
+    """
+    The possible outcomes of assigning a learner to a cohort with `add_users_to_cohorts`.
+    """
+    ADDED = 'added'
+    PREASSIGNED = 'preassigned'
+    ALREADY_PRESENT = 'already_present'
+    NOT_FOUND = 'not_found'
+    INVALID_EMAIL = 'invalid_email'
+
+
+CohortAssignment = namedtuple('CohortAssignment', 'username_or_email cohort status user previous_cohort_name')
+
+
+def add_users_to_cohorts(assignments, chunk_size=BULK_COHORT_ASSIGNMENT_CHUNK_SIZE):
+    """
+    Adds users to cohorts in bulk, with the same outcome as calling
+    `add_user_to_cohort` for each assignment in turn.
+
+    Assignments are processed in chunks of `chunk_size`: the users of a chunk
+    are looked up with a couple of queries, the resulting memberships are
+    computed in memory, and then written with bulk inserts, updates and
+    deletes in a single transaction, after which the usual tracking events
+    are emitted.
+
+    Arguments:
+        assignments: iterable of (username_or_email, cohort) pairs, where
+            username_or_email is treated as an email if it has an '@', and
+            cohort is a CourseUserGroup.
+        chunk_size (int): the number of assignments to apply at once.
+
+    Returns:
+        A generator of `CohortAssignment`, one for each assignment and in the
+        same order, whose status is one of the `CohortAssignmentStatus` values.
+        `user` and `previous_cohort_name` are set for added users.
+    """
+    assignments = iter(assignments)
+    while True:
+        chunk = list(islice(assignments, chunk_size))
+        if not chunk:
+            return
+        try:
+            with transaction.atomic():
+                results, previous_cohorts = _add_users_to_cohorts(chunk)
+        except IntegrityError:
+            # Someone else created some of these memberships in the meantime,
+            # e.g. by assigning a learner to a random cohort. Fall back to
+            # adding users one at a time, which handles that case.
+            log.info("Bulk cohort assignment failed with an IntegrityError, adding users one at a time.")
+            results = [_add_user_to_cohort(cohort, username_or_email) for username_or_email, cohort in chunk]
+        else:
+            _emit_cohort_assignment_events(results, previous_cohorts)
+        request_cache.clear_cache(COHORT_CACHE_NAMESPACE)
+        for result in results:
+            yield result
+
+
+def _add_user_to_cohort(cohort, username_or_email):
+    """
+    Adds a single user to a cohort with `add_user_to_cohort`, and returns
+    the outcome as a `CohortAssignment`.
+    """
+    try:
+        user, previous_cohort_name, preassigned = add_user_to_cohort(cohort, username_or_email)
+    except User.DoesNotExist:
+        return CohortAssignment(username_or_email, cohort, CohortAssignmentStatus.NOT_FOUND, None, None)
+    except ValidationError:
+        return CohortAssignment(username_or_email, cohort, CohortAssignmentStatus.INVALID_EMAIL, None, None)
+    except ValueError:
+        return CohortAssignment(username_or_email, cohort, CohortAssignmentStatus.ALREADY_PRESENT, None, None)
+    if preassigned:
+        return CohortAssignment(username_or_email, cohort, CohortAssignmentStatus.PREASSIGNED, None, None)
+    return CohortAssignment(username_or_email, cohort, CohortAssignmentStatus.ADDED, user, previous_cohort_name)
+
+
+def _get_users_by_username_or_email(usernames_or_emails):
+    """
+    Returns a dict mapping the lowercased usernames and emails among
+    `usernames_or_emails` to their users, treating those with an '@' as emails.
+    """
+    emails = [value for value in usernames_or_emails if '@' in value]
+    usernames = [value for value in usernames_or_emails if '@' not in value]
+    users = {}
+    if usernames:
+        users.update((user.username.lower(), user) for user in User.objects.filter(username__in=usernames))
+    if emails:
+        users.update((user.email.lower(), user) for user in User.objects.filter(email__in=emails))
+    return users
+
+
+def _add_users_to_cohorts(chunk):
+    """
+    Applies a chunk of add_users_to_cohorts assignments. Must be called
+    within a transaction.
+
+    Returns the outcomes of the assignments, and the list of the cohorts the
+    users were in before each assignment.
+    """
+    users = _get_users_by_username_or_email(set(username_or_email for username_or_email, __ in chunk))
+    user_ids = set(user.id for user in users.itervalues())
+
+    memberships = {}
+    for course_id in set(cohort.course_id for __, cohort in chunk):
+        for membership in CohortMembership.objects.filter(
+                course_id=course_id, user_id__in=user_ids
+        ).select_related('course_user_group'):
+            memberships[(membership.user_id, course_id)] = membership
+
+    # Work out the outcome of each assignment, and everyone's final cohort.
+    results, previous_cohorts = [], []
+    cohorts = {key: membership.course_user_group for key, membership in memberships.iteritems()}
+    preassignments = {}
+    for username_or_email, cohort in chunk:
+        user = users.get(username_or_email.lower())
+        if user is None:
+            try:
+                validate_email(username_or_email)
+            except ValidationError:
+                status = CohortAssignmentStatus.INVALID_EMAIL if '@' in username_or_email \
+                    else CohortAssignmentStatus.NOT_FOUND
+            else:
+                status = CohortAssignmentStatus.PREASSIGNED
+                preassignments[(username_or_email, cohort.course_id)] = cohort
+            results.append(CohortAssignment(username_or_email, cohort, status, None, None))
+            previous_cohorts.append(None)
+            continue
+
+        key = (user.id, cohort.course_id)
+        previous_cohort = cohorts.get(key)
+        previous_cohorts.append(previous_cohort)
+        if previous_cohort is not None and previous_cohort.id == cohort.id:
+            results.append(
+                CohortAssignment(username_or_email, cohort, CohortAssignmentStatus.ALREADY_PRESENT, None, None)
+            )
+            continue
+        cohorts[key] = cohort
+        results.append(CohortAssignment(
+            username_or_email, cohort, CohortAssignmentStatus.ADDED, user, getattr(previous_cohort, 'name', None)
+        ))
+
+    # Move the users whose cohort changed, keeping CourseUserGroup.users in sync with their memberships.
+    moved_from, moved_to, updated_memberships, new_memberships = {}, {}, {}, []
+    for (user_id, course_id), cohort in cohorts.iteritems():
+        membership = memberships.get((user_id, course_id))
+        if membership is None:
+            new_memberships.append(
+                CohortMembership(user_id=user_id, course_id=course_id, course_user_group_id=cohort.id)
+            )
+        elif membership.course_user_group_id != cohort.id:
+            moved_from.setdefault(membership.course_user_group_id, []).append(user_id)
+            updated_memberships.setdefault(cohort.id, []).append(membership.id)
+        else:
+            continue
+        moved_to.setdefault(cohort.id, []).append(user_id)
+
+    group_users = CourseUserGroup.users.through
+    for cohort_id, moved_user_ids in moved_from.iteritems():
+        group_users.objects.filter(courseusergroup_id=cohort_id, user_id__in=moved_user_ids).delete()
+    for cohort_id, membership_ids in updated_memberships.iteritems():
+        CohortMembership.objects.filter(id__in=membership_ids).update(course_user_group=cohort_id)
+    CohortMembership.objects.bulk_create(new_memberships)
+    for cohort_id, moved_user_ids in moved_to.iteritems():
+        group_users.objects.filter(courseusergroup_id=cohort_id, user_id__in=moved_user_ids).delete()
+    group_users.objects.bulk_create([
+        group_users(courseusergroup_id=cohort_id, user_id=user_id)
+        for cohort_id, moved_user_ids in moved_to.iteritems()
+        for user_id in moved_user_ids
+    ])
+
+    # Preassign the unknown email addresses, for when they enroll.
+    for course_id in set(course_id for __, course_id in preassignments):
+        existing = UnregisteredLearnerCohortAssignments.objects.filter(
+            course_id=course_id,
+            email__in=[email for email, assignment_course_id in preassignments if assignment_course_id == course_id],
+        )
+        updated_assignments = {}
+        for assignment in existing:
+            cohort = preassignments.pop((assignment.email, course_id), None)
+            if cohort is not None and assignment.course_user_group_id != cohort.id:
+                updated_assignments.setdefault(cohort.id, []).append(assignment.id)
+        for cohort_id, assignment_ids in updated_assignments.iteritems():
+            UnregisteredLearnerCohortAssignments.objects.filter(id__in=assignment_ids).update(
+                course_user_group=cohort_id
+            )
+    UnregisteredLearnerCohortAssignments.objects.bulk_create([
+        UnregisteredLearnerCohortAssignments(course_user_group=cohort, email=email, course_id=course_id)
+        for (email, course_id), cohort in preassignments.iteritems()
+    ])
+
+    return results, previous_cohorts
+
+
+def _emit_cohort_assignment_events(results, previous_cohorts):
+    """
+    Emits the tracking events and signals that `add_user_to_cohort` would
+    have, for the given outcomes of `add_users_to_cohorts`.
+    """
+    for result, previous_cohort in zip(results, previous_cohorts):
+        cohort = result.cohort
+        if result.status == CohortAssignmentStatus.PREASSIGNED:
+            tracker.emit(
+                "edx.cohort.email_address_preassigned",
+                {"user_email": result.username_or_email, "cohort_id": cohort.id, "cohort_name": cohort.name}
+            )
+        elif result.status == CohortAssignmentStatus.ADDED:
+            user = result.user
+            if previous_cohort is not None:
+                tracker.emit(
+                    "edx.cohort.user_removed",
+                    {"cohort_id": previous_cohort.id, "cohort_name": previous_cohort.name, "user_id": user.id}
+                )
+            tracker.emit(
+                "edx.cohort.user_added",
+                {"cohort_id": cohort.id, "cohort_name": cohort.name, "user_id": user.id}
+            )
+            tracker.emit(
+                "edx.cohort.user_add_requested",
+                {
+                    "user_id": user.id,
+                    "cohort_id": cohort.id,
+                    "cohort_name": cohort.name,
+                    "previous_cohort_id": previous_cohort.id if previous_cohort else None,
+                    "previous_cohort_name": previous_cohort.name if previous_cohort else None,
+                }
+            )
+            COURSE_COHORT_ADD.send(
+                sender=None, group_name=cohort.name, course_id=cohort.course_id, username=user.username
+            )
+
+
 def get_group_info_for_cohort(cohort, use_cached=False):
     """
     Get the ids of the group and partition to which this cohort has been linked
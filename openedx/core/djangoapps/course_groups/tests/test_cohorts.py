@@ -19,7 +19,13 @@ from xmodule.modulestore.tests.django_utils import TEST_DATA_MIXED_MODULESTORE,
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
 from .. import cohorts
-from ..models import CourseCohort, CourseUserGroup, CourseUserGroupPartitionGroup
+from ..models import (
+    CohortMembership,
+    CourseCohort,
+    CourseUserGroup,
+    CourseUserGroupPartitionGroup,
+    UnregisteredLearnerCohortAssignments
+)
 from ..tests.helpers import CohortFactory, CourseCohortFactory, config_course_cohorts, config_course_cohorts_legacy
 
 
@@ -662,6 +668,74 @@ class TestCohorts(ModuleStoreTestCase):
             lambda: cohorts.add_user_to_cohort(first_cohort, "non_existent_username")
         )
 
+    @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
+    def test_add_users_to_cohorts(self, mock_tracker):
+        """
+        Make sure cohorts.add_users_to_cohorts() has the same outcome as
+        calling cohorts.add_user_to_cohort() for each assignment.
+        """
+        first_user = UserFactory(username="Username", email="a@b.com")
+        second_user = UserFactory(username="OtherUsername", email="b@b.com")
+        first_cohort = CohortFactory(course_id=self.toy_course_key, name="FirstCohort")
+        second_cohort = CohortFactory(course_id=self.toy_course_key, name="SecondCohort")
+        cohorts.add_user_to_cohort(first_cohort, "OtherUsername")
+
+        assignments = [
+            ("Username", first_cohort),
+            ("b@b.com", second_cohort),
+            ("Username", second_cohort),
+            ("Username", second_cohort),
+            ("new_email@example.com", first_cohort),
+            ("non_existent_username", first_cohort),
+            ("invalid@", first_cohort),
+        ]
+        results = list(cohorts.add_users_to_cohorts(assignments, chunk_size=3))
+        Status = cohorts.CohortAssignmentStatus  # pylint: disable=invalid-name
+        self.assertEqual(
+            [(result.status, result.user, result.previous_cohort_name) for result in results],
+            [
+                (Status.ADDED, first_user, None),
+                (Status.ADDED, second_user, "FirstCohort"),
+                (Status.ADDED, first_user, "FirstCohort"),
+                (Status.ALREADY_PRESENT, None, None),
+                (Status.PREASSIGNED, None, None),
+                (Status.NOT_FOUND, None, None),
+                (Status.INVALID_EMAIL, None, None),
+            ]
+        )
+
+        # Memberships and the cohorts' users are in sync.
+        self.assertEqual(
+            set(CohortMembership.objects.filter(
+                course_id=self.toy_course_key
+            ).values_list('user_id', 'course_user_group_id')),
+            {(first_user.id, second_cohort.id), (second_user.id, second_cohort.id)}
+        )
+        self.assertEqual(list(first_cohort.users.all()), [])
+        self.assertEqual(set(second_cohort.users.all()), {first_user, second_user})
+        self.assertTrue(UnregisteredLearnerCohortAssignments.objects.filter(
+            email="new_email@example.com", course_user_group=first_cohort
+        ).exists())
+
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_add_requested",
+            {
+                "user_id": first_user.id,
+                "cohort_id": second_cohort.id,
+                "cohort_name": second_cohort.name,
+                "previous_cohort_id": first_cohort.id,
+                "previous_cohort_name": first_cohort.name,
+            }
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.user_removed",
+            {"cohort_id": first_cohort.id, "cohort_name": first_cohort.name, "user_id": second_user.id}
+        )
+        mock_tracker.emit.assert_any_call(
+            "edx.cohort.email_address_preassigned",
+            {"user_email": "new_email@example.com", "cohort_id": first_cohort.id, "cohort_name": first_cohort.name}
+        )
+
     @patch("openedx.core.djangoapps.course_groups.cohorts.tracker")
     def add_user_to_cohorts_race_condition(self, mock_tracker):
         """
@@ -6,6 +6,8 @@ This API is exposed via the middleware(emabargo/middileware.py) layer but may be
 
 """
 import logging
+import threading
+from collections import OrderedDict
 
 from django.conf import settings
 from django.core.cache import cache
@@ -20,6 +22,16 @@ from .models import CountryAccessRule, RestrictedCourse
 
 log = logging.getLogger(__name__)
 
+# The number of IP addresses whose country code is remembered by each process.
+COUNTRY_CODE_CACHE_SIZE = 10000
+
+# The most recently looked up country codes by IP address, least recent first.
+_country_code_cache = OrderedDict()
+_country_code_cache_lock = threading.Lock()
+
+# The GeoIP databases opened by this process, by path.
+_geoip_databases = {}
+
 
 def redirect_if_blocked(course_key, access_point='enrollment', **kwargs):
     """Redirect if the user does not have access to the course. In case of blocked if access_point
@@ -163,6 +175,10 @@ def _country_code_from_ip(ip_addr):
     Return the country code associated with an IP address.
     Handles both IPv4 and IPv6 addresses.
 
+    The country codes of the most recently looked up IP addresses are kept
+    in a bounded per-process cache, since the GeoIP data only changes with
+    a deployment.
+
     Args:
         ip_addr (str): The IP address to look up.
 
@@ -170,10 +186,43 @@ def _country_code_from_ip(ip_addr):
         str: A 2-letter country code.
 
     """
+    with _country_code_cache_lock:
+        try:
+            country_code = _country_code_cache.pop(ip_addr)
+        except KeyError:
+            pass
+        else:
+            _country_code_cache[ip_addr] = country_code
+            return country_code
+
     if ip_addr.find(':') >= 0:
-        return pygeoip.GeoIP(settings.GEOIPV6_PATH).country_code_by_addr(ip_addr)
+        country_code = _geoip_database(settings.GEOIPV6_PATH).country_code_by_addr(ip_addr)
     else:
-        return pygeoip.GeoIP(settings.GEOIP_PATH).country_code_by_addr(ip_addr)
+        country_code = _geoip_database(settings.GEOIP_PATH).country_code_by_addr(ip_addr)
+
+    with _country_code_cache_lock:
+        _country_code_cache[ip_addr] = country_code
+        if len(_country_code_cache) > COUNTRY_CODE_CACHE_SIZE:
+            _country_code_cache.popitem(last=False)
+    return country_code
+
+
+def _geoip_database(path):
+    """
+    Return the GeoIP database at the given path, loaded in memory once per process.
+    """
+    database = _geoip_databases.get(path)
+    if database is None:
+        database = _geoip_databases[path] = pygeoip.GeoIP(path, pygeoip.MEMORY_CACHE)
+    return database
+
+
+def clear_country_code_cache():
+    """
+    Forget the country codes of all IP addresses looked up so far.
+    """
+    with _country_code_cache_lock:
+        _country_code_cache.clear()
 
 
 def get_embargo_response(request, course_id, user):
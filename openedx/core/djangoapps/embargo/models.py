@@ -13,6 +13,8 @@ file and check it in at the same time as your model changes. To do that,
 
 import json
 import logging
+import socket
+import struct
 
 import ipaddr
 from config_models.models import ConfigurationModel
@@ -32,6 +34,25 @@ from .messages import COURSEWARE_MESSAGES, ENROLL_MESSAGES
 
 log = logging.getLogger(__name__)
 
+# Compiled IPFilter.IPFilterList instances, by the comma-separated text they
+# were compiled from, so that they're only rebuilt when the IPFilter changes.
+IP_FILTER_LIST_CACHE = {}
+IP_FILTER_LIST_CACHE_SIZE = 16
+
+
+def _parse_ip(ip_addr):
+    """
+    Returns the IP version and integer value of the given IP address string,
+    or None if it isn't a valid IPv4 or IPv6 address.
+    """
+    try:
+        if ':' in ip_addr:
+            high, low = struct.unpack('!QQ', socket.inet_pton(socket.AF_INET6, ip_addr))
+            return 6, high << 64 | low
+        return 4, struct.unpack('!I', socket.inet_pton(socket.AF_INET, ip_addr))[0]
+    except (socket.error, TypeError, ValueError):
+        return None
+
 
 class EmbargoedCourse(models.Model):
     """
@@ -678,27 +699,54 @@ class IPFilter(ConfigurationModel):
     class IPFilterList(object):
         """
         Represent a list of IP addresses with support of networks.
+
+        The networks are compiled into a table of their prefixes, by IP
+        version and prefix length, so that checking whether an address is in
+        the list takes one set lookup per distinct prefix length, rather than
+        one comparison per network.
         """
 
         def __init__(self, ips):
             self.networks = [ipaddr.IPNetwork(ip) for ip in ips]
+            prefixes = {4: {}, 6: {}}
+            for network in self.networks:
+                shift = network.max_prefixlen - network.prefixlen
+                prefixes[network.version].setdefault(shift, set()).add(int(network.network) >> shift)
+            self._prefixes = {
+                version: sorted((shift, frozenset(values)) for shift, values in by_shift.iteritems())
+                for version, by_shift in prefixes.iteritems()
+            }
 
         def __iter__(self):
             for network in self.networks:
                 yield network
 
         def __contains__(self, ip_addr):
-            try:
-                ip_addr = ipaddr.IPAddress(ip_addr)
-            except ValueError:
+            parsed = _parse_ip(ip_addr)
+            if parsed is None:
                 return False
 
-            for network in self.networks:
-                if network.Contains(ip_addr):
+            version, value = parsed
+            for shift, values in self._prefixes[version]:
+                if value >> shift in values:
                     return True
 
             return False
 
+    @classmethod
+    def _ip_filter_list(cls, ips):
+        """
+        Return the IPFilterList for the given comma-separated list of IP
+        addresses, compiling it only if it isn't cached yet.
+        """
+        ip_filter_list = IP_FILTER_LIST_CACHE.get(ips)
+        if ip_filter_list is None:
+            ip_filter_list = cls.IPFilterList([addr.strip() for addr in ips.split(',')])
+            if len(IP_FILTER_LIST_CACHE) >= IP_FILTER_LIST_CACHE_SIZE:
+                IP_FILTER_LIST_CACHE.clear()
+            IP_FILTER_LIST_CACHE[ips] = ip_filter_list
+        return ip_filter_list
+
     @property
     def whitelist_ips(self):
         """
@@ -706,7 +754,7 @@ class IPFilter(ConfigurationModel):
         """
         if self.whitelist == '':
             return []
-        return self.IPFilterList([addr.strip() for addr in self.whitelist.split(',')])
+        return self._ip_filter_list(self.whitelist)
 
     @property
     def blacklist_ips(self):
@@ -715,7 +763,7 @@ class IPFilter(ConfigurationModel):
         """
         if self.blacklist == '':
             return []
-        return self.IPFilterList([addr.strip() for addr in self.blacklist.split(',')])
+        return self._ip_filter_list(self.blacklist)
 
     def __unicode__(self):
         return "Whitelist: {} - Blacklist: {}".format(self.whitelist_ips, self.blacklist_ips)
@@ -7,6 +7,7 @@ from django.core.urlresolvers import reverse
 
 import pygeoip
 
+from .api import clear_country_code_cache
 from .models import Country, CountryAccessRule, RestrictedCourse
 
 
@@ -44,6 +45,7 @@ def restrict_course(course_key, access_point="enrollment", disable_access_check=
     # Clear the cache to ensure that previous tests don't interfere
     # with this test.
     cache.clear()
+    clear_country_code_cache()
 
     with mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_ip:
 
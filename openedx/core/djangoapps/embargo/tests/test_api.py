@@ -178,6 +178,21 @@ class EmbargoCheckAccessApiTests(ModuleStoreTestCase):
             with self.assertNumQueries(0):
                 embargo_api.check_course_access(self.course.id, user=self.user, ip_address='0.0.0.0')
 
+    def test_country_code_cache(self):
+        with self._mock_geoip('US'):
+            self.assertEqual(embargo_api._country_code_from_ip('1.2.3.4'), 'US')  # pylint: disable=protected-access
+            with mock.patch.object(embargo_api, 'COUNTRY_CODE_CACHE_SIZE', 2):
+                with self._mock_geoip('IR') as mock_ip:
+                    for ip_address in ['1.2.3.4', '5.6.7.8', '1.2.3.4', '9.10.11.12', '5.6.7.8', '1.2.3.4']:
+                        embargo_api._country_code_from_ip(ip_address)  # pylint: disable=protected-access
+
+        # The cache was cleared when mocking again; after that, 5.6.7.8 was evicted
+        # by 9.10.11.12, and then 1.2.3.4 by 5.6.7.8.
+        self.assertEqual(
+            [call[0][0] for call in mock_ip.call_args_list],
+            ['1.2.3.4', '5.6.7.8', '9.10.11.12', '5.6.7.8', '1.2.3.4']
+        )
+
     def test_caching_no_restricted_courses(self):
         RestrictedCourse.objects.all().delete()
         cache.clear()
@@ -232,9 +247,10 @@ class EmbargoCheckAccessApiTests(ModuleStoreTestCase):
         """
         Mock for the GeoIP module.
         """
+        embargo_api.clear_country_code_cache()
         with mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_ip:
             mock_ip.return_value = country_code
-            yield
+            yield mock_ip
 
 
 @ddt.ddt
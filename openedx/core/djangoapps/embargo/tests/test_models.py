@@ -105,6 +105,24 @@ class EmbargoModelsTest(CacheIsolationTestCase):
         self.assertIn('1.1.1.0', cblacklist)
         self.assertNotIn('1.2.0.0', cblacklist)
 
+    def test_ip_network_blocking_many_networks(self):
+        networks = ['10.{}.{}.0/24'.format(i / 256, i % 256) for i in range(0, 20000, 2)]
+        networks.extend(['172.16.0.0/12', '192.168.1.1', '2001:db8::/32', '2002:c0a8:101::42'])
+        IPFilter(blacklist=', '.join(networks)).save()
+
+        cblacklist = IPFilter.current().blacklist_ips
+        for addr in ['10.0.0.1', '10.78.30.255', '172.31.255.255', '192.168.1.1', '2001:db8::1', '2002:c0a8:101::42']:
+            self.assertIn(addr, cblacklist)
+        for addr in ['10.0.1.1', '10.78.31.0', '172.32.0.0', '192.168.1.2', '2001:db9::1', '::1', 'not an ip']:
+            self.assertNotIn(addr, cblacklist)
+
+    def test_ip_filter_list_compiled_once(self):
+        IPFilter(whitelist='1.0.0.0/24').save()
+        self.assertIs(IPFilter.current().whitelist_ips, IPFilter.current().whitelist_ips)
+
+        IPFilter(whitelist='1.0.0.0/16').save()
+        self.assertIn('1.0.1.0', IPFilter.current().whitelist_ips)
+
 
 class RestrictedCourseTest(CacheIsolationTestCase):
     """Test RestrictedCourse model. """
@@ -121,6 +121,20 @@ class CacheIsolationMixin(object):
         # Clear that.
         sites.models.SITE_CACHE.clear()
 
+        # So does the CourseOverview process-level cache. Imported here since
+        # course_overviews depends on much of the platform.
+        from openedx.core.djangoapps.content.course_overviews.models import OVERVIEW_PROCESS_CACHE
+        OVERVIEW_PROCESS_CACHE.clear()
+
+        # And so does the embargo app for the countries of IP addresses.
+        from openedx.core.djangoapps.embargo.api import clear_country_code_cache
+        clear_country_code_cache()
+
+        # And the LMS courseware app for course score snapshots.
+        if 'courseware' in settings.INSTALLED_APPS:
+            from courseware.score_snapshot import SCORE_SNAPSHOT_PROCESS_CACHE
+            SCORE_SNAPSHOT_PROCESS_CACHE.clear()
+
         RequestCache.clear_request_cache()
 
 
@@ -9,6 +9,7 @@ from opaque_keys.edx.keys import UsageKey
 
 from lms.djangoapps.courseware.access import _has_access_to_course
 from openedx.core.lib.gating.exceptions import GatingValidationError
+from util.milestones_helpers import clear_milestones_snapshots, get_milestones_snapshot
 from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger(__name__)
@@ -202,6 +203,7 @@ def remove_prerequisite(prereq_content_key):
     ))
     for milestone in milestones:
         milestones_api.remove_milestone(milestone.get('id'))
+    clear_milestones_snapshots()
 
 
 def is_prerequisite(course_key, prereq_content_key):
@@ -251,6 +253,7 @@ def set_required_content(course_key, gated_content_key, prereq_content_key, min_
         if not milestone:
             milestone = _get_prerequisite_milestone(prereq_content_key)
         milestones_api.add_course_content_milestone(course_key, gated_content_key, 'requires', milestone, requirements)
+    clear_milestones_snapshots()
 
 
 def get_required_content(course_key, gated_content_key):
@@ -292,10 +295,6 @@ def get_gated_content(course, user):
     else:
         # Get the unfulfilled gating milestones for this course, for this user
         return [
-            m['content_id'] for m in find_gating_milestones(
-                course.id,
-                None,
-                'requires',
-                {'id': user.id}
-            )
+            m['content_id'] for m in get_milestones_snapshot(course.id, user.id).get_content_milestones('requires')
+            if GATING_NAMESPACE_QUALIFIER in m.get('namespace')
         ]
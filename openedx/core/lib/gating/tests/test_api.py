@@ -11,6 +11,7 @@ from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase, TEST_DAT
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from openedx.core.lib.gating import api as gating_api
 from openedx.core.lib.gating.exceptions import GatingValidationError
+from request_cache.middleware import RequestCache
 from student.tests.factories import UserFactory
 
 
@@ -173,5 +174,7 @@ class TestGatingApi(ModuleStoreTestCase, MilestonesTestCaseMixin):
         self.assertEqual(gating_api.get_gated_content(self.course, student), [unicode(self.seq2.location)])
 
         milestones_api.add_user_milestone({'id': student.id}, milestone)  # pylint: disable=no-member
+        # Milestones are loaded once per request
+        RequestCache.clear_request_cache()
 
         self.assertEqual(gating_api.get_gated_content(self.course, student), [])
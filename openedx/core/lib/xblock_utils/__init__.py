@@ -251,14 +251,23 @@ def replace_static_urls(data_dir, block, view, frag, context, course_id=None, st
     ))
 
 
-def grade_histogram(module_id):
+def grade_histogram(module_id, get_cached_histogram=None):
     '''
     Print out a histogram of grades on a given problem in staff member debug info.
 
     Warning: If a student has just looked at an xmodule and not attempted
     it, their grade is None. Since there will always be at least one such student
     this function almost always returns [].
+
+    `get_cached_histogram`, if given, is called with module_id and returns the
+    histogram from a cache, or None to query it.
     '''
+    grades = get_cached_histogram(module_id) if get_cached_histogram else None
+    if grades is not None:
+        if len(grades) >= 1 and grades[0][0] is None:
+            return []
+        return grades
+
     from django.db import connection
     cursor = connection.cursor()
 
@@ -287,7 +296,9 @@ def sanitize_html_id(html_id):
 
 
 @contract(user=User, has_instructor_access=bool, block=XBlock, view=basestring, frag=Fragment, context="dict|None")
-def add_staff_markup(user, has_instructor_access, disable_staff_debug_info, block, view, frag, context):  # pylint: disable=unused-argument
+def add_staff_markup(  # pylint: disable=unused-argument
+        user, has_instructor_access, disable_staff_debug_info, block, view, frag, context, get_cached_histogram=None,
+):
     """
     Updates the supplied module with a new get_html function that wraps
     the output of the old get_html function with additional information
@@ -296,6 +307,8 @@ def add_staff_markup(user, has_instructor_access, disable_staff_debug_info, bloc
     if it is a Studio edited, mongo stored course.
 
     Does nothing if module is a SequenceModule.
+
+    `get_cached_histogram` is passed on to grade_histogram.
     """
     # TODO: make this more general, eg use an XModule attribute instead
     if isinstance(block, VerticalBlock) and (not context or not context.get('child_of_vertical', False)):
@@ -322,7 +335,7 @@ def add_staff_markup(user, has_instructor_access, disable_staff_debug_info, bloc
 
     block_id = block.location
     if block.has_score and settings.FEATURES.get('DISPLAY_HISTOGRAMS_TO_STAFF'):
-        histogram = grade_histogram(block_id)
+        histogram = grade_histogram(block_id, get_cached_histogram)
         render_histogram = len(histogram) > 0
     else:
         histogram = None
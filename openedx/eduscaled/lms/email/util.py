@@ -9,6 +9,13 @@ User = get_user_model()
 
 
 def eduscaled_email(html_msg, plaintext_msg, email, course_email, course_title, course_url):
+    course_footer = eduscaled_course_footer(course_title, course_url)
+    html_msg, plaintext_msg = eduscaled_append_course_footer(html_msg, plaintext_msg, course_footer)
+    username = User.objects.filter(email=email)[0].username
+    return eduscaled_unsubscribe(html_msg, plaintext_msg, username, course_email)
+
+
+def eduscaled_course_footer(course_title, course_url):
     to_course_html_msg = _('''<br/><p>You received this email because you are enrolled in the course "{course_title}"
     on the platform "{platform_name}". If you want to continue learning
     follow <a href="{course_url}courseware">this link.</a></p>''').format(
@@ -23,13 +30,21 @@ def eduscaled_email(html_msg, plaintext_msg, email, course_email, course_title,
         platform_name=settings.PLATFORM_NAME,
         course_url=course_url,
     )
+    return to_course_html_msg, to_course_plaintext_msg
+
+
+def eduscaled_append_course_footer(html_msg, plaintext_msg, course_footer):
+    to_course_html_msg, to_course_plaintext_msg = course_footer
     html_msg = _('{html_msg} {to_course_html_msg}').format(html_msg=html_msg, to_course_html_msg=to_course_html_msg)
     plaintext_msg = _('{plaintext_msg} {to_course_plaintext_msg}').format(
         plaintext_msg=plaintext_msg,
         to_course_plaintext_msg=to_course_plaintext_msg,
     )
+    return html_msg, plaintext_msg
+
+
+def eduscaled_unsubscribe(html_msg, plaintext_msg, username, course_email):
     unsubscribe_headers = dict()
-    username = User.objects.filter(email=email)[0].username
     unsubscribe_hash = base64.b64encode("{username}+{course_id}".format(
         username=username, course_id=course_email.course_id.html_id())
     )